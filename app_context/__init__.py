@@ -0,0 +1,104 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from functools import cached_property
+from typing import TYPE_CHECKING
+
+# Third-party library imports
+from discord.ext import commands
+
+if TYPE_CHECKING:
+    from logger import Logger
+    from config_manager import ConfigManager
+    from scheduler import Scheduler
+    from jobs import JobManager
+    from cogs.verification import VerificationManager
+    from cogs.twitch import TwitchApp
+    from cogs.welcome import WelcomeTracker
+    from local_server import LocalServer
+    from cogs.diagnostics.rest_stats import RestStats
+    from cogs.diagnostics.sampling_profiler import SamplingProfiler
+
+# ============================= App Context class =============================
+class AppContext():
+    """
+    Container of the services shared by the whole bot.
+
+    Each service is built on first access and then reused, so the database
+    setup, the configuration file check and the data files of the services
+    are read once per process, and every cog shares the same caches. The
+    imports are deferred too, a service never used is never imported.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the AppContext.
+
+        Args:
+            bot (commands.Bot): Discord bot instance the services belong to
+        """
+        self.bot: commands.Bot = bot
+
+    def loaded(self, name: str) -> bool:
+        """
+        Check whether a service has already been built.
+
+        Args:
+            name (str): Name of the service (e.g. 'profiler')
+
+        Returns:
+            bool: True if the service exists
+        """
+        return name in self.__dict__
+
+    # ============================= Core Services =============================
+    @cached_property
+    def log(self) -> 'Logger':
+        from logger import Logger
+        return Logger()
+
+    @cached_property
+    def config(self) -> 'ConfigManager':
+        from config_manager import ConfigManager
+        return ConfigManager()
+
+    @cached_property
+    def scheduler(self) -> 'Scheduler':
+        from scheduler import Scheduler
+        return Scheduler(self.bot)
+
+    @cached_property
+    def jobs(self) -> 'JobManager':
+        from jobs import JobManager
+        return JobManager(self.bot)
+
+    # ============================= Features =============================
+    @cached_property
+    def verification(self) -> 'VerificationManager':
+        from cogs.verification import VerificationManager
+        return VerificationManager(self.bot, self.log, self.config)
+
+    @cached_property
+    def twitch_app(self) -> 'TwitchApp':
+        from cogs.twitch import TwitchApp
+        return TwitchApp(self.bot, self.log, self.config)
+
+    @cached_property
+    def welcome_tracker(self) -> 'WelcomeTracker':
+        from cogs.welcome import WelcomeTracker
+        return WelcomeTracker(self.log)
+
+    # ============================= Diagnostics =============================
+    @cached_property
+    def local_server(self) -> 'LocalServer':
+        from local_server import LocalServer
+        return LocalServer(self.bot)
+
+    @cached_property
+    def rest_stats(self) -> 'RestStats':
+        from cogs.diagnostics.rest_stats import RestStats
+        return RestStats()
+
+    @cached_property
+    def profiler(self) -> 'SamplingProfiler':
+        from cogs.diagnostics.sampling_profiler import SamplingProfiler
+        return SamplingProfiler()
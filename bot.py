@@ -1,7 +1,9 @@
 
 # ----------------------------- Imported Libraries -----------------------------
 # Standard library imports
+import time
 from os import getenv
+from typing import TYPE_CHECKING
 
 # Third-party library imports
 import discord
@@ -12,6 +14,19 @@ from discord import app_commands
 from cogs.commands import add_commands
 from cogs.events import add_events
 from cogs.tasks import setup_all_tasks
+from app_context import AppContext
+
+if TYPE_CHECKING:
+    from logger import Logger
+    from config_manager import ConfigManager
+    from scheduler import Scheduler
+    from jobs import JobManager
+    from cogs.verification import VerificationManager
+    from cogs.twitch import TwitchApp
+    from cogs.welcome import WelcomeTracker
+    from local_server import LocalServer
+    from cogs.diagnostics.rest_stats import RestStats
+    from cogs.diagnostics.sampling_profiler import SamplingProfiler
 
 # ============================= BOT SETUP HOOK =============================
 class WishBot(commands.Bot):
@@ -26,21 +41,66 @@ class WishBot(commands.Bot):
         """
         Initialize the WishBot with all necessary components.
         
-        Sets up logger, config manager, verification system, and Twitch app.
+        Creates the application context: the logger, config manager, verification
+        system, Twitch app and the other services are built by it on first use
+        and shared by every cog.
         """
         super().__init__(*args, **kwargs)
-        from logger import Logger
-        from config_manager import ConfigManager
-        from cogs.verification import VerificationManager
-        from cogs.twitch import TwitchApp
 
         # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Instance Variables ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
         self.color: str = '0xA6BBF0'
 
-        self.log: Logger = Logger()
-        self.config: ConfigManager = ConfigManager()
-        self.verification: VerificationManager = VerificationManager(self, self.log, self.config)
-        self.twitch_app: TwitchApp = TwitchApp(self, self.log, self.config)
+        self.context: AppContext = AppContext(self)
+        # Time of the last gateway event received (exposed by the health endpoint)
+        self.last_event_at: float | None = None
+
+    # ============================= Services =============================
+    @property
+    def log(self) -> 'Logger':
+        return self.context.log
+
+    @property
+    def config(self) -> 'ConfigManager':
+        return self.context.config
+
+    @property
+    def scheduler(self) -> 'Scheduler':
+        return self.context.scheduler
+
+    @property
+    def jobs(self) -> 'JobManager':
+        return self.context.jobs
+
+    @property
+    def verification(self) -> 'VerificationManager':
+        return self.context.verification
+
+    @property
+    def twitch_app(self) -> 'TwitchApp':
+        return self.context.twitch_app
+
+    @property
+    def welcome_tracker(self) -> 'WelcomeTracker':
+        return self.context.welcome_tracker
+
+    @property
+    def local_server(self) -> 'LocalServer':
+        return self.context.local_server
+
+    @property
+    def rest_stats(self) -> 'RestStats':
+        return self.context.rest_stats
+
+    @property
+    def profiler(self) -> 'SamplingProfiler':
+        return self.context.profiler
+
+    def dispatch(self, event_name: str, /, *args, **kwargs) -> None:
+        """
+        Record the time of every dispatched event before handling it.
+        """
+        self.last_event_at = time.time()
+        super().dispatch(event_name, *args, **kwargs)
 
     async def setup_hook(self) -> None:
         """
@@ -49,12 +109,21 @@ class WishBot(commands.Bot):
         Loads all commands, events, and tasks. Handles command synchronization
         for both debug and production modes.
         """
+        # REST CALL ACCOUNTING
+        self.rest_stats.install(self.http)
+        # CONTINUOUS PROFILING (opt-in)
+        if getenv('PROFILER_ENABLED') == '1':
+            self.profiler.start()
         # COMMANDS
         await add_commands(self, self.log, self.config, self.verification, self.twitch_app)
         # EVENTS
         await add_events(self, self.log, self.config, self.verification, self.twitch_app)
         # TASKS
         await setup_all_tasks(self, self.log, self.config, self.twitch_app)
+        # BACKGROUND JOBS (resumes the jobs interrupted by the last shutdown)
+        self.jobs.start()
+        # LOCAL SERVER
+        await self.local_server.start()
         
         # Register a centralized error handler for app (slash) commands
         @self.tree.error
@@ -108,4 +177,22 @@ class WishBot(commands.Bot):
             await self.log.event(f"Nomi dei comandi: {commands_names}", "setup")
         else:
             synced = await self.tree.sync()
-            await self.log.event(f"Comandi globali sincronizzati: {len(synced)}", "setup")
\ No newline at end of file
+            await self.log.event(f"Comandi globali sincronizzati: {len(synced)}", "setup")
+
+    async def close(self) -> None:
+        """
+        Stop the local server, the profiler, the task scheduler, the background jobs and the verification scheduler before closing the bot connection.
+        
+        Services never used are not built just to be stopped.
+        """
+        if self.context.loaded('profiler'):
+            self.profiler.stop()
+        if self.context.loaded('scheduler'):
+            await self.scheduler.stop()
+        if self.context.loaded('jobs'):
+            await self.jobs.stop()
+        if self.context.loaded('verification'):
+            self.verification.stop_scheduler()
+        if self.context.loaded('local_server'):
+            await self.local_server.stop()
+        await super().close()
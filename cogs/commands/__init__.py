@@ -14,6 +14,7 @@ from .cmd_utility import CmdUtility
 from .cmd_verification import CmdVerification
 from .cmd_info_embed import CmdInfoEmbed
 from .cmd_info import CmdInfo
+from .cmd_diagnostics import CmdDiagnostics
 
 # ============================= Add Commands =============================
 async def add_commands(bot: commands.Bot, log: Logger, config: ConfigManager, verification: VerificationManager, twitch_app: TwitchApp) -> None:
@@ -23,4 +24,5 @@ async def add_commands(bot: commands.Bot, log: Logger, config: ConfigManager, ve
     await bot.add_cog(CmdUtility(bot, log, config))
     await bot.add_cog(CmdVerification(bot, log, config, verification))
     await bot.add_cog(CmdInfoEmbed(bot, log, config, verification))
-    await bot.add_cog(CmdInfo(bot, log, config))
\ No newline at end of file
+    await bot.add_cog(CmdInfo(bot, log, config))
+    await bot.add_cog(CmdDiagnostics(bot, log, config))
\ No newline at end of file
@@ -1,7 +1,7 @@
 
 # ----------------------------- Imported Libraries -----------------------------
 # Standard library imports
-import asyncio
+import json
 from datetime import datetime, timedelta, timezone
 from os import getenv
 
@@ -14,6 +14,12 @@ from discord.ext import commands
 from logger import Logger
 from config_manager import ConfigManager
 from utils.printing import safe_send_message, create_embed, load_single_embed_text, create_embed_from_dict
+from cogs.diagnostics.rest_stats import rest_feature
+from utils.members import resolve_member
+from utils.purge import CLONEABLE_CHANNELS, clone_channel, estimate_channel_purge, purge_channels
+
+# Estimated wipes longer than this suggest the clone mode
+CLONE_SUGGESTION_SECONDS: int = 600
 
 class CmdAdmin(commands.GroupCog, name="admin"):
     """Admin commands for maintenance, logging, and utilities."""
@@ -27,16 +33,22 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         
         # Dictionary containing all commands and their descriptions
         self.commands_info = {
-            "clear": "Cancella tutti i messaggi in questo canale",
+            "clear": "Cancella tutti i messaggi in questo canale (modalità clone: ricrea il canale vuoto)",
             "clear-user": "Cancella tutti i messaggi di un utente specifico in questo canale",
-            "clear-channel": "Cancella tutti i messaggi nel canale indicato",
+            "clear-channel": "Cancella tutti i messaggi nel canale indicato (modalità clone: ricrea il canale vuoto)",
             "clear-channel-user": "Cancella tutti i messaggi di un utente specifico nel canale indicato",
-            "clear-server-user": "Cancella tutti i messaggi di un utente in tutto il server",
+            "clear-server-user": "Cancella tutti i messaggi di un utente in tutto il server, thread archiviati inclusi (con use_log usa il log dei messaggi e scansiona solo lo storico non registrato)",
             "update-welcome-db": "Aggiorna la tabella welcome del database",
             "database-cleanup": "Esegue manualmente la pulizia del database rimuovendo i record vecchi",
             "force-welcome": "Forza l'esecuzione manuale della task di benvenuto",
             "send-weekly-report": "Invia manualmente il report settimanale degli eventi Discord",
-            "dm-welcome": "Invia un DM di benvenuto (scegli tra singolo utente o tutti i 'not_verified')"
+            "scheduler": "Mostra lo stato delle task pianificate (prossima esecuzione, ultima esecuzione, errori)",
+            "jobs": "Mostra i job in background (pulizie, assegnazioni di massa, DM) e il loro avanzamento",
+            "job-cancel": "Annulla un job in background in coda o in esecuzione",
+            "dm-welcome": "Invia un DM di benvenuto (scegli tra singolo utente o tutti i 'not_verified')",
+            "recent-logs": "Mostra gli ultimi record registrati in memoria, con pagine e filtro",
+            "message-history": "Mostra le versioni registrate di un messaggio (modifiche ed eliminazione)",
+            "message-storage": "Mostra lo spazio risparmiato dall'archiviazione compatta dei messaggi, addestra il dizionario o compatta i messaggi esistenti"
         }
     
     # ============================= Help Command =============================
@@ -93,116 +105,70 @@ class CmdAdmin(commands.GroupCog, name="admin"):
     # ============================= Helper Methods =============================
     async def delete_messages(self, channel: discord.abc.GuildChannel) -> int:
         """
-        Delete all messages in a channel using an iterative approach.
+        Delete all messages in a channel (in every thread of a forum channel).
         
         Returns the total number of deleted messages.
         """
-        total_deleted = 0
-        
-        while True:
-            # Get a batch of messages (up to 100)
-            messages = []
-            async for msg in channel.history(limit=100, oldest_first=False):
-                messages.append(msg)
-            
-            # If no messages found, we're done
-            if not messages:
-                break
-            
-            # Divide messages by age
-            recent = []
-            old = []
-            for msg in messages:
-                age = datetime.now(timezone.utc) - msg.created_at
-                if age < timedelta(days=14):
-                    recent.append(msg)
-                else:
-                    old.append(msg)
-            
-            # Delete recent messages in batch
-            if recent:
-                try:
-                    deleted = await channel.purge(check=lambda m: m.id in [x.id for x in recent])
-                    total_deleted += len(deleted)
-                except discord.HTTPException:
-                    pass
-            
-            # Delete old messages one by one
-            for msg in old:
-                try:
-                    await msg.delete()
-                    total_deleted += 1
-                    await asyncio.sleep(1)  # Rate limiting
-                except discord.HTTPException:
-                    pass
-            
-            # If we got less than 100 messages, we've reached the end
-            if len(messages) < 100:
-                break
-        
-        return total_deleted
+        channels: list = list(channel.threads) if isinstance(channel, discord.ForumChannel) else [channel]
+        with rest_feature('delete-messages'):
+            return await purge_channels(channels, lambda message: True)
 
     async def delete_user_messages(self, channel: discord.abc.GuildChannel, user: discord.Member) -> int:
         """
-        Delete all messages from a specific user in a channel using an iterative approach.
+        Delete all messages from a specific user in a channel (in every thread of a forum channel).
         
         Returns the total number of deleted messages.
         """
-        total_deleted = 0
-        
-        while True:
-            # Get a batch of messages (up to 100)
-            messages = []
-            async for msg in channel.history(limit=100, oldest_first=False):
-                messages.append(msg)
-            
-            # If no messages found, we're done
-            if not messages:
-                break
-            
-            # Filter messages by user
-            user_messages = [msg for msg in messages if msg.author.id == user.id]
-            
-            # Divide messages by age
-            recent = []
-            old = []
-            for msg in user_messages:
-                age = datetime.now(timezone.utc) - msg.created_at
-                if age < timedelta(days=14):
-                    recent.append(msg)
-                else:
-                    old.append(msg)
-            
-            # Delete recent messages in batch
-            if recent:
-                try:
-                    deleted = await channel.purge(check=lambda m: m.id in [x.id for x in recent])
-                    total_deleted += len(deleted)
-                except discord.HTTPException:
-                    pass
-            
-            # Delete old messages one by one
-            for msg in old:
-                try:
-                    await msg.delete()
-                    total_deleted += 1
-                    await asyncio.sleep(1)  # Rate limiting
-                except discord.HTTPException:
-                    pass
-            
-            # If we got less than 100 messages, we've reached the end
-            if len(messages) < 100:
-                break
+        channels: list = list(channel.threads) if isinstance(channel, discord.ForumChannel) else [channel]
+        with rest_feature('delete-messages'):
+            return await purge_channels(channels, lambda message: message.author.id == user.id)
         
-        return total_deleted
+    async def send_purge_estimate(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel) -> None:
+        """
+        Show the estimated number of messages and end time of the wipe of a channel, suggesting the clone mode for the long ones.
+        """
+        if isinstance(channel, discord.ForumChannel):
+            # No history of its own, the posts are wiped one by one
+            return
+        estimate = await estimate_channel_purge(channel)
+        end: str = discord.utils.format_dt(datetime.now(timezone.utc) + timedelta(seconds=estimate.seconds), 'R')
+        content: str = (
+            f"Avvio la pulizia di {channel.mention}: {'' if estimate.exact else '~'}{estimate.messages} messaggi "
+            f"({estimate.old} più vecchi di 14 giorni, cancellati uno alla volta), fine prevista {end}"
+        )
+        if estimate.seconds > CLONE_SUGGESTION_SECONDS and isinstance(channel, CLONEABLE_CHANNELS):
+            content += "\nPer un canale così grande è più rapida la modalità `clone`, che ricrea il canale vuoto."
+        await interaction.edit_original_response(content=content)
+
+    async def clone_for_wipe(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel) -> discord.abc.GuildChannel | None:
+        """
+        Replace a channel with an empty clone, unless the channel cannot be cloned, the user cannot
+        manage channels or the bot configuration refers to the channel (the clone has a new ID).
         
+        Returns the new channel, or None if the clone was refused (the reason is sent to the user).
+        """
+        if not isinstance(channel, CLONEABLE_CHANNELS):
+            await safe_send_message(interaction, "❌ Questo tipo di canale non può essere clonato.")
+            return None
+        if not interaction.user.guild_permissions.manage_channels:
+            await safe_send_message(interaction, "❌ La modalità clone richiede il permesso di gestire i canali.")
+            return None
+        if str(channel.id) in json.dumps(self.config.get_full_config()):
+            await safe_send_message(interaction, "❌ Il canale è usato nella configurazione del bot e il clone avrebbe un ID diverso: usa la modalità normale.")
+            return None
+        return await clone_channel(channel, f'Pulizia canale richiesta da {interaction.user} ({interaction.user.id})')
+
     # ============================= Channel Management =============================
     @app_commands.command(name="clear", description="Cancella tutti i messaggi in questo canale")
     @app_commands.checks.has_permissions(manage_messages=True)
     @app_commands.checks.cooldown(1, 10)
-    async def clear(self, interaction: discord.Interaction) -> None:
+    @app_commands.choices(mode=[
+        app_commands.Choice(name='Cancella i messaggi', value='delete'),
+        app_commands.Choice(name='Ricrea il canale vuoto (clone)', value='clone')
+    ])
+    async def clear(self, interaction: discord.Interaction, mode: app_commands.Choice[str] | None = None) -> None:
         """
-        Delete all messages in the current channel.
+        Delete all messages in the current channel, or replace it with an empty clone.
         """
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
@@ -212,6 +178,14 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         await interaction.response.send_message('Avvio la pulizia di questo canale', ephemeral=True)
         
         try:
+            if mode is not None and mode.value == 'clone':
+                new_channel = await self.clone_for_wipe(interaction, channel)
+                if new_channel is not None:
+                    await new_channel.send(f'Il canale è stato ricreato vuoto da {interaction.user.mention}', delete_after=30)
+                    await self.log.command(f'Canale {channel} ({channel.id}) ricreato vuoto con ID {new_channel.id}', 'admin', 'CLEAR')
+                return
+            
+            await self.send_purge_estimate(interaction, channel)
             deleted: int = await self.delete_messages(channel)
             await interaction.channel.send(f'Sono stati cancellati **{deleted} messaggi**', delete_after=30)
             await self.log.command(f'Cancellati {deleted} messaggi dal seguente canale: {channel} ({channel.id})', 'admin', 'CLEAR')
@@ -282,9 +256,13 @@ class CmdAdmin(commands.GroupCog, name="admin"):
     @app_commands.command(name="clear-channel", description="Cancella tutti i messaggi nel canale indicato")
     @app_commands.checks.has_permissions(manage_messages=True)
     @app_commands.checks.cooldown(1, 10)
-    async def clear_channel(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel) -> None:
+    @app_commands.choices(mode=[
+        app_commands.Choice(name='Cancella i messaggi', value='delete'),
+        app_commands.Choice(name='Ricrea il canale vuoto (clone)', value='clone')
+    ])
+    async def clear_channel(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel, mode: app_commands.Choice[str] | None = None) -> None:
         """
-        Delete all messages in the specified channel.
+        Delete all messages in the specified channel, or replace it with an empty clone.
         """
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
@@ -298,6 +276,16 @@ class CmdAdmin(commands.GroupCog, name="admin"):
             return
         
         try:
+            if mode is not None and mode.value == 'clone':
+                new_channel = await self.clone_for_wipe(interaction, channel)
+                if new_channel is not None:
+                    await new_channel.send(f'Il canale è stato ricreato vuoto da {interaction.user.mention}', delete_after=30)
+                    if channel.id != interaction.channel.id:
+                        await interaction.edit_original_response(content=f'{new_channel.mention} è stato ricreato vuoto')
+                    await self.log.command(f'Canale {channel} ({channel.id}) ricreato vuoto con ID {new_channel.id}', 'admin', 'CLEAR-CHANNEL')
+                return
+            
+            await self.send_purge_estimate(interaction, channel)
             deleted: int = await self.delete_messages(channel)
             await interaction.delete_original_response()
             await interaction.channel.send(f'Sono stati cancellati **{deleted} messaggi**', delete_after=30)
@@ -374,58 +362,22 @@ class CmdAdmin(commands.GroupCog, name="admin"):
     @app_commands.command(name="clear-server-user", description="Cancella tutti i messaggi di un utente in tutto il server")
     @app_commands.checks.has_permissions(manage_messages=True)
     @app_commands.checks.cooldown(1, 30)
-    async def clear_server_user(self, interaction: discord.Interaction, user: discord.Member) -> None:
+    async def clear_server_user(self, interaction: discord.Interaction, user: discord.Member, use_log: bool = True) -> None:
         """
-        Delete all messages from a specific user across the entire server.
+        Delete all messages from a specific user across the entire server, as a background job.
+        
+        With use_log, the messages found in the message log are deleted by ID and only the
+        history not covered by the log is scanned.
         """
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
         
         await self.log.command(f'Pulizia messaggi dell\'utente {user} ({user.id}) in tutto il server', 'admin', 'CLEAR-SERVER-USER')
-        await interaction.response.send_message(f'Avvio la pulizia di tutti i messaggi di {user.mention} in tutto il server. Questa operazione potrebbe richiedere del tempo.', ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
         
         try:
-            total_deleted = 0
-            channels_processed = 0
-            
-            # Get all text channels, forum channels, stage channels, and voice channels
-            all_channels = [ch for ch in guild.channels if isinstance(ch, (discord.TextChannel, discord.ForumChannel, discord.StageChannel, discord.VoiceChannel))]
-            
-            for channel in all_channels:
-                try:
-                    # Check if bot has permissions to manage messages in this channel
-                    if not channel.permissions_for(guild.me).manage_messages:
-                        continue
-                    
-                    # Check if bot has permissions to read message history
-                    if not channel.permissions_for(guild.me).read_message_history:
-                        continue
-                    
-                    deleted = await self.delete_user_messages(channel, user)
-                    if deleted > 0:
-                        total_deleted += deleted
-                        channels_processed += 1
-                        
-                except discord.Forbidden:
-                    # Skip channels where bot doesn't have permissions
-                    continue
-                except Exception as e:
-                    # Log error but continue with other channels
-                    await self.log.error(f'Errore durante la pulizia del canale {channel.name} ({channel.id}): {e}', 'COMMAND - ADMIN - CLEAR-SERVER-USER')
-                    continue
-            
-            # Send final report
-            await interaction.delete_original_response()
-            await interaction.channel.send(
-                f'✅ **Pulizia completata!**\n'
-                f'**Utente:** {user.mention}\n'
-                f'**Messaggi cancellati:** {total_deleted}\n'
-                f'**Canali processati:** {channels_processed}\n'
-                f'**Canali totali:** {len(all_channels)}',
-                delete_after=60
-            )
-            
-            await self.log.command(f'Cancellati {total_deleted} messaggi dell\'utente {user} ({user.id}) da {channels_processed} canali su {len(all_channels)} totali', 'admin', 'CLEAR-SERVER-USER')
+            job_id: int = await self.bot.jobs.submit('clear-server-user', {'guild_id': guild.id, 'user_id': user.id, 'use_log': use_log, 'is_bot': user.bot}, interaction.user.id, interaction.channel)
+            await safe_send_message(interaction, f'Pulizia di tutti i messaggi di {user.mention} avviata in background (job #{job_id}). L\'avanzamento è mostrato nel messaggio di stato.')
             
         except discord.NotFound as e:
             error_message = f'Risorsa non trovata: {e}'
@@ -438,7 +390,7 @@ class CmdAdmin(commands.GroupCog, name="admin"):
             await safe_send_message(interaction, f"❌ {error_message}")
             
         except Exception as e:
-            error_message: str = f'Errore durante l\'eliminazione dei messaggi dell\'utente {user} ({user.id}) in tutto il server: {e}'
+            error_message: str = f'Errore durante l\'avvio della pulizia dei messaggi dell\'utente {user} ({user.id}) in tutto il server: {e}'
             await self.log.error(error_message, 'COMMAND - ADMIN - CLEAR-SERVER-USER')
             await safe_send_message(interaction, f"❌ {error_message}")
             
@@ -452,30 +404,15 @@ class CmdAdmin(commands.GroupCog, name="admin"):
     # ============================= Database Management =============================
     @app_commands.command(name="update-welcome-db", description="Aggiorna la tabella welcome del database")
     async def update_welcome_db(self, interaction: discord.Interaction) -> None:
-        """Aggiorna la tabella welcome del database con tutti i membri del server"""
+        """Aggiorna la tabella welcome del database con tutti i membri del server (job in background)"""
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
         await self.log.command('Aggiornamento del database delle benvenute', 'admin', 'UPDATE-WELCOME-DB')
-        await interaction.response.send_message('Avvio l\'aggiornamento del database delle benvenute', ephemeral=True)
+        await interaction.response.defer(ephemeral=True)
 
         try:
-            members: list[discord.Member] = guild.members
-            # Get all existing welcome records
-            existing_welcomes = self.log.db.get_welcome()
-            existing_user_ids = {entry['user_id'] for entry in existing_welcomes}
-
-            added = 0
-            for member in members:
-                if member.bot:
-                    continue  # Skip bots
-                if member.id not in existing_user_ids:
-                    # Insert into db (use current timestamp and full username)
-                    timestamp = datetime.now(timezone.utc).isoformat()
-                    self.log.db.insert_welcome(timestamp, str(member.id), str(member))
-                    added += 1
-
-            await safe_send_message(interaction, f'Sono stati aggiunti **{added} utenti** alla tabella delle benvenute.')
-            await self.log.command(f'Aggiunti {added} utenti alla tabella welcome.', 'admin', 'UPDATE-WELCOME-DB')
+            job_id: int = await self.bot.jobs.submit('update-welcome-db', {'guild_id': guild.id}, interaction.user.id, interaction.channel)
+            await safe_send_message(interaction, f'Aggiornamento del database delle benvenute avviato in background (job #{job_id}).')
             
         except discord.NotFound as e:
             error_message = f'Risorsa non trovata: {e}'
@@ -508,11 +445,10 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         await interaction.response.send_message('Avvio la pulizia manuale del database', ephemeral=True)
 
         try:
-            # Get the DatabaseCleanup cog from the bot
-            database_cleanup_cog = self.bot.get_cog('DatabaseCleanup')
-
-            # Execute the database cleanup task manually
-            await database_cleanup_cog.database_cleanup()
+            # Execute the database cleanup job manually
+            if not await self.bot.scheduler.run_now('database_cleanup'):
+                await safe_send_message(interaction, 'La pulizia del database è già in esecuzione.')
+                return
             
             await safe_send_message(interaction, 'Pulizia del database eseguita con successo.')
             await self.log.command('Pulizia del database eseguita manualmente con successo', 'admin', 'DATABASE-CLEANUP')
@@ -549,11 +485,10 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         await interaction.response.send_message('Avvio l\'esecuzione forzata della task di benvenuto', ephemeral=True)
 
         try:
-            # Get the Welcome cog from the bot
-            welcome_cog = self.bot.get_cog('Welcome')
-
-            # Execute the welcome task manually
-            await welcome_cog.execute_welcome_task()
+            # Execute the welcome job manually, checking every member
+            if not await self.bot.scheduler.run_now('welcome', full=True):
+                await safe_send_message(interaction, 'La task di benvenuto è già in esecuzione.')
+                return
             
             await safe_send_message(interaction, 'Task di benvenuto eseguita con successo.')
             await self.log.command('Task di benvenuto eseguita manualmente con successo', 'admin', 'FORCE-WELCOME')
@@ -589,11 +524,10 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         await interaction.response.send_message('Avvio l\'invio manuale del report settimanale', ephemeral=True)
 
         try:
-            # Get the WeeklyReport cog from the bot
-            weekly_report_cog = self.bot.get_cog('WeeklyReport')
-
-            # Execute the weekly report task manually
-            await weekly_report_cog.weekly_report()
+            # Execute the weekly report job manually
+            if not await self.bot.scheduler.run_now('weekly_report'):
+                await safe_send_message(interaction, 'Il report settimanale è già in esecuzione.')
+                return
             
             await safe_send_message(interaction, 'Report settimanale inviato con successo.')
             await self.log.command('Report settimanale inviato manualmente con successo', 'admin', 'SEND-WEEKLY-REPORT')
@@ -620,6 +554,314 @@ class CmdAdmin(commands.GroupCog, name="admin"):
                 except Exception as comm_error:
                     await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - SEND-WEEKLY-REPORT')
     
+    @app_commands.command(name="scheduler", description="Mostra lo stato delle task pianificate")
+    async def scheduler(self, interaction: discord.Interaction) -> None:
+        """
+        Show the cron expression, next and last run, counters and run time of every scheduled job.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            fields: list[dict] = []
+            for name, job in self.bot.scheduler.status().items():
+                next_run: str = discord.utils.format_dt(datetime.fromisoformat(job['next_run']), 'R') if job['next_run'] else '-'
+                last_run: str = discord.utils.format_dt(datetime.fromisoformat(job['last_run']), 'f') if job['last_run'] else '-'
+                duration: str = f" ({job['last_duration']} s)" if job['last_duration'] is not None else ''
+                value: str = (
+                    f"`{job['cron']}`{' (in esecuzione)' if job['running'] else ''}\n"
+                    f"Prossima: {next_run}\n"
+                    f"Ultima: {last_run}{duration}\n"
+                    f"Esecuzioni: {job['runs']} - Errori: {job['failures']} - Saltate: {job['skipped']}"
+                )
+                if job['last_error']:
+                    value += f"\nUltimo errore: {job['last_error'][:200]}"
+                fields.append({'name': name, 'value': value, 'inline': False})
+
+            embed = create_embed(
+                title="⏰ Task pianificate",
+                description="Orari in Europe/Rome",
+                color=self.bot.color,
+                fields=fields or [{'name': 'Task', 'value': 'Nessuna task registrata.', 'inline': False}]
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command('Stato delle task pianificate', 'admin', 'SCHEDULER')
+            
+        except Exception as e:
+            error_message: str = f"Errore durante la lettura dello stato delle task: {e}"
+            await self.log.error(error_message, 'COMMAND - ADMIN - SCHEDULER')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - SCHEDULER', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - SCHEDULER')
+    
+    # ============================= Background Jobs =============================
+    @app_commands.command(name="jobs", description="Mostra i job in background in corso e gli ultimi completati")
+    async def jobs(self, interaction: discord.Interaction) -> None:
+        """
+        Show the active background jobs and the most recent finished ones, with their progress.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            from jobs import STATUS_LABELS
+            from jobs.handlers import HANDLERS
+            fields: list[dict] = []
+            for record in self.log.db.get_jobs(limit=10):
+                progress: dict = json.loads(record['progress'] or '{}')
+                value: str = '\n'.join([f"Stato: {STATUS_LABELS.get(record['status'], record['status'])}", f"Avviato da: <@{record['requested_by']}>"]
+                                       + [f'{label}: {count}' for label, count in progress.items()])
+                if record['error']:
+                    value += f"\nErrore: {record['error'][:200]}"
+                handler = HANDLERS.get(record['kind'])
+                fields.append({'name': f"#{record['job_id']} · {handler.title if handler else record['kind']}", 'value': value, 'inline': False})
+
+            embed = create_embed(
+                title="🧰 Job in background",
+                description="Ultimi 10 job (annulla con `/admin job-cancel`)",
+                color=self.bot.color,
+                fields=fields or [{'name': 'Job', 'value': 'Nessun job registrato.', 'inline': False}]
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command('Visualizzati i job in background', 'admin', 'JOBS')
+            
+        except Exception as e:
+            error_message: str = f"Errore durante la lettura dei job in background: {e}"
+            await self.log.error(error_message, 'COMMAND - ADMIN - JOBS')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - JOBS', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - JOBS')
+
+    @app_commands.command(name="job-cancel", description="Annulla un job in background")
+    async def job_cancel(self, interaction: discord.Interaction, job_id: int) -> None:
+        """
+        Cancel a queued or running background job; the work already done is kept.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            if await self.bot.jobs.cancel(job_id):
+                await interaction.response.send_message(f'Job #{job_id} annullato.', ephemeral=True)
+                await self.log.command(f'Job #{job_id} annullato', 'admin', 'JOB-CANCEL')
+            else:
+                await interaction.response.send_message(f'❌ Il job #{job_id} non esiste o è già terminato.', ephemeral=True)
+            
+        except Exception as e:
+            error_message: str = f"Errore durante l'annullamento del job #{job_id}: {e}"
+            await self.log.error(error_message, 'COMMAND - ADMIN - JOB-CANCEL')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - JOB-CANCEL', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - JOB-CANCEL')
+    
+    # ============================= Log Inspection =============================
+    @app_commands.command(name="recent-logs", description="Mostra gli ultimi record registrati in memoria, con pagine e filtro")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.choices(table=[
+        app_commands.Choice(name='Eventi', value='events'),
+        app_commands.Choice(name='Comandi', value='commands'),
+        app_commands.Choice(name='Messaggi', value='messages'),
+        app_commands.Choice(name='Errori', value='errors'),
+        app_commands.Choice(name='Verifiche', value='verification')
+    ])
+    async def recent_logs(self, interaction: discord.Interaction, table: app_commands.Choice[str], page: int = 1, search: str = '') -> None:
+        """
+        Show a page of the most recent log records kept in memory, without querying the database.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+        page_size: int = 10
+        page = max(1, page)
+
+        try:
+            records: list[dict] = self.log.get_recent(table.value, text_filter=search, offset=(page - 1) * page_size, limit=page_size)
+            
+            # Create embed with one field per record
+            embed = create_embed(
+                title=f"🧾 Ultimi record: {table.name}",
+                description=f"Pagina {page}" + (f" - filtro: `{search}`" if search else ''),
+                color=self.bot.color,
+                fields=[]
+            )
+            for record in records:
+                values: list[str] = [str(value) for key, value in record.items() if key != 'timestamp']
+                embed.add_field(
+                    name=record['timestamp'],
+                    value=' | '.join(values)[:1000] or '-',
+                    inline=False
+                )
+            if not records:
+                embed.add_field(name='Nessun record', value='Non ci sono record per questa pagina.', inline=False)
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command(f'Visualizzati record recenti della tabella {table.value} (pagina {page})', 'admin', 'RECENT-LOGS')
+            
+        except discord.NotFound as e:
+            error_message = f'Risorsa non trovata: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - RECENT-LOGS')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except discord.Forbidden as e:
+            error_message = f'Permessi insufficienti: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - RECENT-LOGS')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except Exception as e:
+            error_message: str = f'Errore durante la visualizzazione dei record recenti: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - RECENT-LOGS')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - RECENT-LOGS', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - RECENT-LOGS')
+    
+    @app_commands.command(name="message-history", description="Mostra le versioni registrate di un messaggio (modifiche ed eliminazione)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def message_history(self, interaction: discord.Interaction, message_id: str) -> None:
+        """
+        Show every logged version of a message, rebuilt from its edit deltas, and its deletion.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            versions: list[tuple[str, str | None]] = self.log.message_history(message_id.strip())
+            media: list[tuple] = self.log.db.get_message_media(message_id.strip())
+            
+            # Create embed with one field per version
+            embed = create_embed(
+                title="🕓 Storico del messaggio",
+                description=f"ID messaggio: `{message_id.strip()}`",
+                color=self.bot.color,
+                fields=[]
+            )
+            # Keep one field free for the media
+            for index, (timestamp, content) in enumerate(versions[-24:]):
+                if content is None:
+                    embed.add_field(name=f'{timestamp} - eliminato', value='🗑️', inline=False)
+                else:
+                    label: str = 'originale' if index == 0 and len(versions) <= 24 else 'modifica'
+                    embed.add_field(name=f'{timestamp} - {label}', value=content[:1000] or '-', inline=False)
+            if media:
+                lines: list[str] = [
+                    f'{kind}: {filename or summary or url} ({content_type}{f", {size} B" if size else ""})'
+                    for kind, url, filename, size, content_type, summary in media
+                ]
+                embed.add_field(name='Allegati, sticker ed embed', value='\n'.join(lines)[:1000], inline=False)
+            if not versions:
+                embed.add_field(name='Nessun record', value='Il messaggio non è presente nel registro.', inline=False)
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command(f'Visualizzato lo storico del messaggio {message_id.strip()}', 'admin', 'MESSAGE-HISTORY')
+            
+        except discord.NotFound as e:
+            error_message = f'Risorsa non trovata: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-HISTORY')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except discord.Forbidden as e:
+            error_message = f'Permessi insufficienti: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-HISTORY')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except Exception as e:
+            error_message: str = f'Errore durante la visualizzazione dello storico del messaggio: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-HISTORY')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - MESSAGE-HISTORY', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - MESSAGE-HISTORY')
+    
+    # ============================= Message Storage =============================
+    @app_commands.command(name="message-storage", description="Report, dizionario e compattazione dell'archivio dei messaggi")
+    @app_commands.checks.has_permissions(administrator=True)
+    @app_commands.choices(action=[
+        app_commands.Choice(name='Report', value='report'),
+        app_commands.Choice(name='Addestra dizionario', value='train'),
+        app_commands.Choice(name='Compatta messaggi esistenti', value='compact')
+    ])
+    async def message_storage(self, interaction: discord.Interaction, action: app_commands.Choice[str]) -> None:
+        """
+        Show the bytes saved by the compact message storage, train a new compression dictionary
+        or convert the messages stored in plain form.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            await interaction.response.defer(ephemeral=True)
+            notes: list[str] = []
+            if action.value == 'train':
+                dictionary_id: int | None = await self.log.train_message_dictionary()
+                notes.append(f'Nuovo dizionario: #{dictionary_id}' if dictionary_id is not None else 'Nessuna ripetizione da cui addestrare un dizionario.')
+            elif action.value == 'compact':
+                converted: int = await self.log.compact_messages()
+                notes.append(f'Messaggi compattati: {converted}')
+            
+            report: dict = self.log.db.get_message_storage_report()
+            saved_ratio: float = report['saved_bytes'] / report['logical_bytes'] * 100 if report['logical_bytes'] else 0
+            embed = create_embed(
+                title="🗜️ Archivio messaggi",
+                description='\n'.join(notes) or f"Modalità: {'compatta' if self.log.db.compact else 'normale'}",
+                color=self.bot.color,
+                fields=[
+                    {'name': 'Messaggi normali', 'value': str(report['plain_rows']), 'inline': True},
+                    {'name': 'Messaggi compatti', 'value': str(report['compact_rows']), 'inline': True},
+                    {'name': 'Testi distinti', 'value': str(report['distinct_bodies']), 'inline': True},
+                    {'name': 'Dimensione originale', 'value': f"{report['logical_bytes']} B", 'inline': True},
+                    {'name': 'Dimensione salvata', 'value': f"{report['stored_bytes']} B", 'inline': True},
+                    {'name': 'Risparmio', 'value': f"{report['saved_bytes']} B ({saved_ratio:.1f}%)", 'inline': True},
+                    {'name': 'Dizionario attivo', 'value': f"#{report['dictionary_id']}" if report['dictionary_id'] is not None else '-', 'inline': True}
+                ]
+            )
+            
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            await self.log.command(f'Archivio messaggi: {action.value}', 'admin', 'MESSAGE-STORAGE')
+            
+        except discord.NotFound as e:
+            error_message = f'Risorsa non trovata: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-STORAGE')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except discord.Forbidden as e:
+            error_message = f'Permessi insufficienti: {e}'
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-STORAGE')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+        except Exception as e:
+            error_message: str = f"Errore durante la gestione dell'archivio dei messaggi: {e}"
+            await self.log.error(error_message, 'COMMAND - ADMIN - MESSAGE-STORAGE')
+            await safe_send_message(interaction, f"❌ {error_message}")
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - ADMIN - MESSAGE-STORAGE', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - ADMIN - MESSAGE-STORAGE')
+    
     # ============================= Send Messages =============================
     @app_commands.command(name="dm-welcome", description="Invia un DM di benvenuto: scegli tra singolo utente o tutti i 'not_verified'")
     async def dm_welcome(self, interaction: discord.Interaction) -> None:
@@ -652,7 +894,7 @@ class CmdAdmin(commands.GroupCog, name="admin"):
                 await safe_send_message(interaction, "Selezione utente non confermata o nessun utente selezionato.")
                 return
 
-            user = guild.get_member(user_view.selected_user_id) or await self.bot.fetch_user(user_view.selected_user_id)
+            user = await resolve_member(guild, user_view.selected_user_id) or await self.bot.fetch_user(user_view.selected_user_id)
             if user is None:
                 await safe_send_message(interaction, "❌ Utente non trovato.")
                 return
@@ -698,28 +940,8 @@ class CmdAdmin(commands.GroupCog, name="admin"):
         if mode_view.selected_mode == "bulk":
             await self.log.command('Invio manuale del DM di benvenuto a tutti i membri che hanno il ruolo "not_verified"', 'admin', 'DM-WELCOME-BULK')
             try:
-                not_verified_role_id = self.config.load_admin('roles', 'not_verified')
-                if not_verified_role_id and not_verified_role_id != '':
-                    not_verified_role = guild.get_role(int(not_verified_role_id))
-                    if not_verified_role:
-                        members = [member for member in guild.members if not_verified_role in member.roles]
-                        for member in members:
-                            try:
-                                message_content: dict = await load_single_embed_text(guild, 'welcome-user', self.config)
-                                message: discord.Embed = create_embed_from_dict(message_content)
-                                await member.send(embed=message)
-                                await self.log.command(f'DM di benvenuto inviato a {member.name} ({member.id})', 'admin', 'DM-WELCOME-BULK')
-                            except discord.Forbidden:
-                                error_message: str = ("Errore durante l'invio del DM di benvenuto. "
-                                                      f"\nUtente: {member.name} ({member.id}) \nL'utente ha disabilitato i messaggi privati.")
-                                await self.log.error(error_message, 'COMMAND - ADMIN - DM-WELCOME-BULK')
-                            except Exception as e:
-                                error_message: str = ("Errore durante l'invio del DM di benvenuto. "
-                                                      f"\nUtente: {member.name} ({member.id}) \n{e}")
-                                await self.log.error(error_message, 'COMMAND - ADMIN - DM-WELCOME-BULK')
-
-                await safe_send_message(interaction, 'DM di benvenuto inviati con successo.')
-                await self.log.command('DM di benvenuto inviati manualmente con successo', 'admin', 'DM-WELCOME-BULK')
+                job_id: int = await self.bot.jobs.submit('dm-welcome', {'guild_id': guild.id}, interaction.user.id, interaction.channel)
+                await safe_send_message(interaction, f'Invio dei DM di benvenuto avviato in background (job #{job_id}).')
 
             except discord.NotFound as e:
                 error_message = f'Risorsa non trovata: {e}'
@@ -732,7 +954,7 @@ class CmdAdmin(commands.GroupCog, name="admin"):
                 await safe_send_message(interaction, f"❌ {error_message}")
 
             except Exception as e:
-                error_message: str = ("Errore durante l'invio manuale del DM di benvenuto a tutti i membri che hanno il ruolo \"not_verified\": "
+                error_message: str = ("Errore durante l'avvio dell'invio del DM di benvenuto a tutti i membri che hanno il ruolo \"not_verified\": "
                                        f"{e}")
                 await self.log.error(error_message, 'COMMAND - ADMIN - DM-WELCOME-BULK')
                 await safe_send_message(interaction, f"❌ {error_message}")
@@ -44,6 +44,7 @@ class CmdConfig(commands.GroupCog, name="config"):
             "standard": "Configura i canali principali del bot",
             "retention": "Configura il periodo di conservazione dei log",
             "message-logging": "Configura la registrazione dei messaggi",
+            "anti-flood": "Configura il rilevamento del flood di messaggi e le azioni da applicare",
             "set-not-verified-role": "Configura il ruolo 'not_verified'",
             "set-booster-role": "Configura il ruolo booster del server",
             "verification-setup": "Configura il sistema di verifica",
@@ -246,6 +247,57 @@ class CmdConfig(commands.GroupCog, name="config"):
                     # If we can't send to communication channel, just log it
                     await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - CONFIG - MESSAGE-LOGGING')
     
+    @app_commands.command(name="anti-flood", description="Configura il rilevamento del flood di messaggi e le azioni da applicare")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    @app_commands.checks.cooldown(1, 10)
+    async def anti_flood(self, interaction: discord.Interaction, enabled: bool,
+                         max_messages: app_commands.Range[int, 2, 50] = 6,
+                         window_seconds: app_commands.Range[int, 1, 300] = 8,
+                         timeout_minutes: app_commands.Range[int, 0, 10080] = 0,
+                         role: discord.Role | None = None) -> None:
+        """Configura l'anti-flood: più di max_messages messaggi in window_seconds secondi nello stesso canale
+        vengono registrati e, se configurati, puniti con un timeout e/o un ruolo"""
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+        
+        try:
+            self.config.update_anti_flood({
+                'enabled': enabled,
+                'max_messages': max_messages,
+                'window_seconds': window_seconds,
+                'timeout_minutes': timeout_minutes,
+                'role_id': role.id if role else 0
+            })
+            summary: str = (
+                f"Anti-flood {'attivo' if enabled else 'disattivato'}: max {max_messages} messaggi in {window_seconds} secondi"
+                + (f', timeout di {timeout_minutes} minuti' if timeout_minutes else '')
+                + (f', ruolo {role.name}' if role else '')
+            )
+            await interaction.response.send_message(f'✅ {summary}.', ephemeral=True)
+            await self.log.command(summary, 'config', 'ANTI-FLOOD')
+            
+        except discord.NotFound as e:
+            error_message = f'Risorsa non trovata: {e}'
+            await self.log.error(error_message, 'COMMAND - CONFIG - ANTI-FLOOD')
+            await safe_send_message(interaction, f"❌ {error_message}", logger=self.log, log_command='COMMAND - CONFIG - ANTI-FLOOD')
+            
+        except discord.Forbidden as e:
+            error_message = f'Permessi insufficienti: {e}'
+            await self.log.error(error_message, 'COMMAND - CONFIG - ANTI-FLOOD')
+            await safe_send_message(interaction, f"❌ {error_message}", logger=self.log, log_command='COMMAND - CONFIG - ANTI-FLOOD')
+            
+        except Exception as e:
+            error_message = f'Errore durante la configurazione dell\'anti-flood: {e}'
+            await self.log.error(error_message, 'COMMAND - CONFIG - ANTI-FLOOD')
+            await safe_send_message(interaction, f"❌ {error_message}", logger=self.log, log_command='COMMAND - CONFIG - ANTI-FLOOD')
+            
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - CONFIG - ANTI-FLOOD', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - CONFIG - ANTI-FLOOD')
+    
     # ============================= Role Management =============================
     @app_commands.command(name="set-not-verified-role", description="Configura il ruolo 'not_verified'")
     @app_commands.checks.has_permissions(manage_roles=True)
@@ -0,0 +1,295 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+from os import path
+
+# Third-party library imports
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+# ----------------------------- Custom Libraries -----------------------------
+from logger import Logger
+from config_manager import ConfigManager
+from cogs.diagnostics import MemoryProfiler
+from utils.printing import safe_send_message, create_embed
+
+class CmdDiagnostics(commands.GroupCog, name="diagnostics"):
+    """
+    Admin-only diagnostics commands for memory and CPU profiling, cache and REST accounting.
+    """
+    description: str = "Strumenti di diagnostica (memoria, cache, REST e profiling)."
+
+    def __init__(self, bot: commands.Bot, log: Logger, config: ConfigManager) -> None:
+        super().__init__()
+        self.bot: commands.Bot = bot
+        self.log: Logger = log
+        self.config: ConfigManager = config
+        self.memory_profiler: MemoryProfiler = MemoryProfiler(bot)
+
+        # Dictionary containing all commands and their descriptions
+        self.commands_info = {
+            "memory-start": "Avvia il tracciamento delle allocazioni di memoria (tracemalloc)",
+            "memory-snapshot": "Confronta la memoria con lo snapshot precedente e mostra le allocazioni principali",
+            "memory-stop": "Ferma il tracciamento delle allocazioni di memoria",
+            "cache-sizes": "Mostra la dimensione delle cache del bot",
+            "rest-stats": "Mostra le chiamate REST a Discord per route e funzionalità, con i rate limit subiti",
+            "profiler-start": "Avvia il profiler a campionamento continuo",
+            "profiler-stop": "Ferma il profiler a campionamento",
+            "profiler-dump": "Esporta gli stack campionati come file per flamegraph"
+        }
+
+    # ============================= Help Command =============================
+    @app_commands.command(name="help", description="Mostra l'elenco dei comandi diagnostics disponibili")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def help(self, interaction: discord.Interaction) -> None:
+        """
+        Show an embed with all diagnostics commands and their descriptions.
+        """
+        guild: discord.Guild = interaction.guild
+        communication_channel = guild.get_channel(self.config.communication_channel) if self.config.communication_channel else None
+
+        try:
+            # Create embed with commands info
+            embed = create_embed(
+                title="🩺 Comandi Diagnostics",
+                description="Elenco di tutti i comandi di diagnostica disponibili",
+                color=self.bot.color,
+                fields=[]
+            )
+
+            # Add each command to the embed
+            for command_name, description in self.commands_info.items():
+                embed.add_field(
+                    name=f"`/diagnostics {command_name}`",
+                    value=description,
+                    inline=False
+                )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command('Visualizzato help comandi diagnostics', 'diagnostics', 'HELP')
+
+        except Exception as e:
+            error_message: str = f'Errore durante la visualizzazione dell\'help: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - HELP')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+            # Try to send error to communication channel if available
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='COMMAND - DIAGNOSTICS - HELP', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'COMMAND - DIAGNOSTICS - HELP')
+
+    # ============================= Memory Profiling =============================
+    @app_commands.command(name="memory-start", description="Avvia il tracciamento delle allocazioni di memoria (tracemalloc)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def memory_start(self, interaction: discord.Interaction, frames: app_commands.Range[int, 1, 25] = 5) -> None:
+        """
+        Start tracemalloc and take the baseline snapshot.
+        """
+        try:
+            if self.memory_profiler.running:
+                await interaction.response.send_message('ℹ️ Il tracciamento della memoria è già attivo. Lo snapshot di riferimento è stato aggiornato.', ephemeral=True)
+            else:
+                await interaction.response.send_message(f'✅ Tracciamento della memoria avviato ({frames} frame per allocazione).', ephemeral=True)
+            self.memory_profiler.start(frames)
+            await self.log.command(f'Tracciamento della memoria avviato ({frames} frame)', 'diagnostics', 'MEMORY-START')
+
+        except Exception as e:
+            error_message: str = f'Errore durante l\'avvio del tracciamento della memoria: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - MEMORY-START')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    @app_commands.command(name="memory-snapshot", description="Confronta la memoria con lo snapshot precedente e mostra le allocazioni principali")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def memory_snapshot(self, interaction: discord.Interaction, limit: app_commands.Range[int, 1, 25] = 10) -> None:
+        """
+        Diff the current memory against the previous snapshot and report the top allocation sites.
+        """
+        if not self.memory_profiler.running:
+            await interaction.response.send_message('❌ Il tracciamento della memoria non è attivo. Usa `/diagnostics memory-start`.', ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            lines: list[str] = self.memory_profiler.snapshot_diff(limit)
+            current, peak = self.memory_profiler.traced_memory()
+            embed = create_embed(
+                title="🧠 Differenza di memoria",
+                description=(
+                    f"Memoria tracciata: {current / 1024 / 1024:.2f} MiB (picco {peak / 1024 / 1024:.2f} MiB)\n"
+                    f"Tracciamento attivo dal {self.memory_profiler.started_at.strftime('%d/%m/%Y %H:%M:%S')}"
+                ),
+                color=self.bot.color,
+                fields=[]
+            )
+            for index, line in enumerate(lines, start=1):
+                embed.add_field(name=f'#{index}', value=f'`{line[-1000:]}`', inline=False)
+            if not lines:
+                embed.add_field(name='Nessuna differenza', value='Nessuna allocazione rilevata dallo snapshot precedente.', inline=False)
+
+            await safe_send_message(interaction, embed=embed)
+            await self.log.command('Snapshot della memoria confrontato con il precedente', 'diagnostics', 'MEMORY-SNAPSHOT')
+
+        except Exception as e:
+            error_message: str = f'Errore durante il confronto degli snapshot di memoria: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - MEMORY-SNAPSHOT')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    @app_commands.command(name="memory-stop", description="Ferma il tracciamento delle allocazioni di memoria")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def memory_stop(self, interaction: discord.Interaction) -> None:
+        """
+        Stop tracemalloc and release the stored snapshot.
+        """
+        try:
+            if not self.memory_profiler.running:
+                await interaction.response.send_message('ℹ️ Il tracciamento della memoria non è attivo.', ephemeral=True)
+                return
+            self.memory_profiler.stop()
+            await interaction.response.send_message('✅ Tracciamento della memoria fermato.', ephemeral=True)
+            await self.log.command('Tracciamento della memoria fermato', 'diagnostics', 'MEMORY-STOP')
+
+        except Exception as e:
+            error_message: str = f'Errore durante l\'arresto del tracciamento della memoria: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - MEMORY-STOP')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    # ============================= Cache Accounting =============================
+    @app_commands.command(name="cache-sizes", description="Mostra la dimensione delle cache del bot")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def cache_sizes(self, interaction: discord.Interaction) -> None:
+        """
+        Show the size of discord.py caches and of the bot's own structures.
+        """
+        try:
+            embed = create_embed(
+                title="📦 Dimensione delle cache",
+                description="Cache di discord.py e strutture interne del bot",
+                color=self.bot.color,
+                fields=[]
+            )
+            for name, value in self.memory_profiler.cache_sizes().items():
+                embed.add_field(name=name, value=value, inline=True)
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command('Visualizzata la dimensione delle cache', 'diagnostics', 'CACHE-SIZES')
+
+        except Exception as e:
+            error_message: str = f'Errore durante il calcolo della dimensione delle cache: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - CACHE-SIZES')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    # ============================= REST Accounting =============================
+    @app_commands.command(name="rest-stats", description="Mostra le chiamate REST a Discord per route e funzionalità, con i rate limit subiti")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def rest_stats(self, interaction: discord.Interaction, reset: bool = False) -> None:
+        """
+        Show the REST calls made by the bot grouped by feature and route, with 429s and rate limit waits.
+        """
+        def format_stats(stats: dict) -> str:
+            return (
+                f"{int(stats['calls'])} chiamate, {int(stats['errors'])} errori, {stats['time']:.1f}s\n"
+                f"429: {int(stats['rate_limited'])} (globali {int(stats['global_rate_limited'])}, attesa {stats['retry_after']:.1f}s), attesa bucket {stats['bucket_wait']:.1f}s"
+            )
+
+        try:
+            rest_stats = self.bot.rest_stats
+            totals: dict = rest_stats.totals()
+            embed = create_embed(
+                title="🌐 Chiamate REST",
+                description=(
+                    f"Ultimi {totals['uptime'] / 60:.0f} minuti, {int(totals['buckets'])} bucket usati\n"
+                    f"{format_stats(totals)}"
+                ),
+                color=self.bot.color,
+                fields=[]
+            )
+            for feature, stats in rest_stats.top_features(5):
+                embed.add_field(name=f'Funzionalità: {feature}', value=format_stats(stats), inline=False)
+            for route, stats in rest_stats.top_routes(10):
+                embed.add_field(name=route[:256], value=format_stats(stats), inline=False)
+
+            if reset:
+                rest_stats.reset()
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await self.log.command(f'Visualizzate le statistiche REST (reset: {reset})', 'diagnostics', 'REST-STATS')
+
+        except Exception as e:
+            error_message: str = f'Errore durante la visualizzazione delle statistiche REST: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - REST-STATS')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    # ============================= Continuous Profiling =============================
+    @app_commands.command(name="profiler-start", description="Avvia il profiler a campionamento continuo")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def profiler_start(self, interaction: discord.Interaction, frequency: app_commands.Range[int, 1, 200] = None) -> None:
+        """
+        Start the sampling profiler thread, optionally changing its frequency.
+        """
+        try:
+            profiler = self.bot.profiler
+            if profiler.running:
+                await interaction.response.send_message(f'ℹ️ Il profiler è già attivo ({profiler.frequency} campioni/s).', ephemeral=True)
+                return
+            profiler.start(frequency)
+            await interaction.response.send_message(f'✅ Profiler avviato ({profiler.frequency} campioni/s).', ephemeral=True)
+            await self.log.command(f'Profiler a campionamento avviato ({profiler.frequency} campioni/s)', 'diagnostics', 'PROFILER-START')
+
+        except Exception as e:
+            error_message: str = f'Errore durante l\'avvio del profiler: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - PROFILER-START')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    @app_commands.command(name="profiler-stop", description="Ferma il profiler a campionamento")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def profiler_stop(self, interaction: discord.Interaction) -> None:
+        """
+        Stop the sampling profiler thread, keeping the collected stacks.
+        """
+        try:
+            profiler = self.bot.profiler
+            if not profiler.running:
+                await interaction.response.send_message('ℹ️ Il profiler non è attivo.', ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True)
+            # Joining the thread can take up to one sampling interval
+            await asyncio.to_thread(profiler.stop)
+            await safe_send_message(interaction, f'✅ Profiler fermato. Campioni raccolti: {profiler.samples}.')
+            await self.log.command(f'Profiler a campionamento fermato ({profiler.samples} campioni)', 'diagnostics', 'PROFILER-STOP')
+
+        except Exception as e:
+            error_message: str = f'Errore durante l\'arresto del profiler: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - PROFILER-STOP')
+            await safe_send_message(interaction, f"❌ {error_message}")
+
+    @app_commands.command(name="profiler-dump", description="Esporta gli stack campionati come file per flamegraph")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def profiler_dump(self, interaction: discord.Interaction, reset: bool = False) -> None:
+        """
+        Write the collapsed stacks to DATA_PATH and attach the file to the reply.
+        """
+        await interaction.response.defer(ephemeral=True)
+        try:
+            profiler = self.bot.profiler
+            if profiler.samples == 0:
+                await safe_send_message(interaction, 'ℹ️ Nessun campione raccolto. Avvia il profiler con `/diagnostics profiler-start`.')
+                return
+
+            file_path: str = await asyncio.to_thread(profiler.dump)
+            await interaction.followup.send(
+                f'🔥 {profiler.samples} campioni, overhead {profiler.overhead * 100:.2f}%.\n'
+                f'File salvato in `{file_path}` (compatibile con flamegraph.pl e speedscope).',
+                file=discord.File(file_path, filename=path.basename(file_path)),
+                ephemeral=True
+            )
+            if reset:
+                profiler.reset()
+            await self.log.command(f'Profilo esportato in {file_path} (reset: {reset})', 'diagnostics', 'PROFILER-DUMP')
+
+        except Exception as e:
+            error_message: str = f'Errore durante l\'esportazione del profilo: {e}'
+            await self.log.error(error_message, 'COMMAND - DIAGNOSTICS - PROFILER-DUMP')
+            await safe_send_message(interaction, f"❌ {error_message}")
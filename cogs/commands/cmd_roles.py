@@ -31,9 +31,9 @@ class CmdRoles(commands.GroupCog, name="role"):
         self.commands_info = {
             "new": "Crea un nuovo messaggio per l'assegnazione automatica dei ruoli",
             "assign": "Assegna un ruolo ad un utente",
-            "assign-all": "Assegna un ruolo a tutti gli utenti",
+            "assign-all": "Assegna un ruolo a tutti gli utenti (con dry_run conta solo i membri da modificare)",
             "remove": "Rimuove un ruolo ad un utente",
-            "remove-all": "Rimuove un ruolo da tutti gli utenti"
+            "remove-all": "Rimuove un ruolo da tutti gli utenti (con dry_run conta solo i membri da modificare)"
         }
     
     # ============================= Help Command =============================
@@ -236,34 +236,17 @@ class CmdRoles(commands.GroupCog, name="role"):
     @app_commands.command(name="assign-all", description="Assegna un ruolo a tutti gli utenti")
     @app_commands.checks.has_permissions(manage_roles=True)
     @app_commands.checks.cooldown(1, 30)
-    async def assign_all(self, interaction: discord.Interaction, role: discord.Role) -> None:
-        """Assegna un ruolo a tutti gli utenti del server (escludendo quelli con ruoli di eccezione)"""
+    async def assign_all(self, interaction: discord.Interaction, role: discord.Role, dry_run: bool = False) -> None:
+        """Assegna un ruolo a tutti gli utenti del server (job in background, escludendo quelli con ruoli di eccezione; con dry_run conta solo i membri)"""
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
+        await interaction.response.defer(ephemeral=True)
         
-        # Get the member list
-        members: list[discord.Member] = interaction.guild.members
-        # Get the exception role list
-        except_roles: list = await self.config.load_exception('cmd-role')
-        
-        counter: int = 0
         try:
-            for member in members:
-                # Check if member has an exception role
-                for except_role in except_roles:
-                    if except_role in member.roles:
-                        return
-                
-                if role not in member.roles:
-                    await add_role(self.log, interaction.guild, role.id, member.id, self.config)
-                    # INFO Log that the role was assigned correctly
-                    await self.log.command(f'Ruolo {role.name} ({role.id}) assegnato correttamente a {member.name} ({member.id})', 'role', 'assign-all')
-                    counter += 1
-            
-            # Respond that how many roles were assigned
-            await safe_send_message(interaction, f'Ruolo {role.mention} assegnato a {counter} utenti!')
-            # INFO Log that the role was assigned correctly to all the members
-            await self.log.command(f'Ruolo {role.name} ({role.id}) assegnato correttamente a {counter} utenti.', 'role', 'assign-all')
+            job_id: int = await self.bot.jobs.submit('assign-all', {'guild_id': guild.id, 'role_id': role.id, 'dry_run': dry_run}, interaction.user.id, interaction.channel)
+            # Respond with the job, the status message shows the progress
+            await safe_send_message(interaction, f"{role.mention}: {'simulazione' if dry_run else 'operazione'} avviata in background (job #{job_id}).")
+            await self.log.command(f"Job #{job_id} avviato per il ruolo {role.name} ({role.id}){' (simulazione)' if dry_run else ''}", 'role', 'assign-all')
             
         except discord.NotFound as e:
             error_message = f'Risorsa non trovata: {e}'
@@ -277,7 +260,7 @@ class CmdRoles(commands.GroupCog, name="role"):
             
         except Exception as e:
             # EXCEPTION
-            error_message: str = f'Errore durante l\'assegnazione del ruolo: {e}'
+            error_message: str = f'Errore durante l\'avvio dell\'assegnazione del ruolo: {e}'
             await self.log.error(error_message, 'COMMAND - ROLE - ASSIGN-ALL')
             await safe_send_message(interaction, f"❌ {error_message}")
             
@@ -333,34 +316,17 @@ class CmdRoles(commands.GroupCog, name="role"):
     @app_commands.command(name="remove-all", description="Rimuove un ruolo da tutti gli utenti")
     @app_commands.checks.has_permissions(manage_roles=True)
     @app_commands.checks.cooldown(1, 30)
-    async def remove_all(self, interaction: discord.Interaction, role: discord.Role) -> None:
-        """Rimuove un ruolo da tutti gli utenti del server (escludendo quelli con ruoli di eccezione)"""
+    async def remove_all(self, interaction: discord.Interaction, role: discord.Role, dry_run: bool = False) -> None:
+        """Rimuove un ruolo da tutti gli utenti del server (job in background, escludendo quelli con ruoli di eccezione; con dry_run conta solo i membri)"""
         guild: discord.Guild = interaction.guild
         communication_channel = guild.get_channel(self.config.communication_channel)
+        await interaction.response.defer(ephemeral=True)
         
-        # Get the member list
-        members: list[discord.Member] = interaction.guild.members
-        # Get the exception role list
-        except_roles: list = await self.config.load_exception('cmd-role')
-        
-        counter: int = 0
         try:
-            for member in members:
-                # Check if member has an exception role
-                for except_role in except_roles:
-                    if except_role in member.roles:
-                        return
-                
-                if role in member.roles:
-                    await remove_role(self.log, interaction.guild, role.id, member.id, self.config)
-                    # INFO Log that the role was removed correctly
-                    await self.log.command(f'Ruolo {role.name} ({role.id}) rimosso correttamente da {member.name} ({member.id})', 'role', 'remove-all')
-                    counter += 1
-            
-            # Respond that how many roles were removed
-            await safe_send_message(interaction, f'Ruolo {role.mention} rimosso da {counter} utenti!')
-            # INFO Log that the role was removed correctly from all the members
-            await self.log.command(f'Ruolo {role.name} ({role.id}) rimosso correttamente da {counter} utenti.', 'role', 'remove-all')
+            job_id: int = await self.bot.jobs.submit('remove-all', {'guild_id': guild.id, 'role_id': role.id, 'dry_run': dry_run}, interaction.user.id, interaction.channel)
+            # Respond with the job, the status message shows the progress
+            await safe_send_message(interaction, f"{role.mention}: {'simulazione' if dry_run else 'operazione'} avviata in background (job #{job_id}).")
+            await self.log.command(f"Job #{job_id} avviato per il ruolo {role.name} ({role.id}){' (simulazione)' if dry_run else ''}", 'role', 'remove-all')
             
         except discord.NotFound as e:
             error_message = f'Risorsa non trovata: {e}'
@@ -374,7 +340,7 @@ class CmdRoles(commands.GroupCog, name="role"):
             
         except Exception as e:
             # EXCEPTION
-            error_message: str = f'Errore durante la rimozione del ruolo: {e}'
+            error_message: str = f'Errore durante l\'avvio della rimozione del ruolo: {e}'
             await self.log.error(error_message, 'COMMAND - ROLE - REMOVE-ALL')
             await safe_send_message(interaction, f"❌ {error_message}")
             
@@ -0,0 +1,171 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Any
+
+# Third-party library imports
+from discord.ext import commands
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Snapshot Filters ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Allocations made by the profiler itself are not interesting
+_SNAPSHOT_FILTERS: list[tracemalloc.Filter] = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+]
+
+# ============================= Deep Size =============================
+def deep_sizeof(obj: Any) -> int:
+    """
+    Compute the approximate memory used by a container and everything it references.
+
+    Only builtin containers (dict, list, tuple, set, frozenset) are traversed;
+    every object is counted once.
+
+    Args:
+        obj (Any): The object to measure
+
+    Returns:
+        int: Size in bytes
+    """
+    seen: set[int] = set()
+    stack: list[Any] = [obj]
+    total: int = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
+
+# ============================= Memory Profiler class =============================
+class MemoryProfiler():
+    """
+    Wraps tracemalloc to take and compare memory snapshots on demand,
+    and reports the size of the bot caches.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the MemoryProfiler.
+
+        Args:
+            bot (commands.Bot): Discord bot instance whose caches are measured
+        """
+        self.bot: commands.Bot = bot
+        self.started_at: datetime | None = None
+        self._last_snapshot: tracemalloc.Snapshot | None = None
+
+    # >>==============<< Running >>==============<<
+    @property
+    def running(self) -> bool:
+        """Whether tracemalloc is currently tracing allocations."""
+        return tracemalloc.is_tracing()
+
+    # >>==============<< Start >>==============<<
+    def start(self, frames: int = 5) -> None:
+        """
+        Start tracing allocations and take the baseline snapshot.
+
+        Args:
+            frames (int, optional): Number of frames stored for each allocation. Defaults to 5
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.started_at = datetime.now()
+        self._last_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+    # >>==============<< Stop >>==============<<
+    def stop(self) -> None:
+        """
+        Stop tracing allocations and release the stored snapshot.
+        """
+        self._last_snapshot = None
+        self.started_at = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # >>==============<< Snapshot Diff >>==============<<
+    def snapshot_diff(self, limit: int = 10) -> list[str]:
+        """
+        Take a new snapshot and compare it with the previous one.
+
+        The new snapshot becomes the reference for the next comparison.
+
+        Args:
+            limit (int, optional): Number of allocation sites to report. Defaults to 10
+
+        Returns:
+            list[str]: Top allocation sites by size difference
+
+        Raises:
+            RuntimeError: If tracing has not been started
+        """
+        if not tracemalloc.is_tracing() or self._last_snapshot is None:
+            raise RuntimeError('Il tracciamento della memoria non è attivo.')
+
+        snapshot: tracemalloc.Snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        stats = snapshot.compare_to(self._last_snapshot, 'lineno')
+        self._last_snapshot = snapshot
+
+        output: list[str] = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            output.append(
+                f'{frame.filename}:{frame.lineno} -> {stat.size_diff / 1024:+.1f} KiB '
+                f'(totale {stat.size / 1024:.1f} KiB, {stat.count_diff:+d} blocchi)'
+            )
+        return output
+
+    # >>==============<< Traced Memory >>==============<<
+    def traced_memory(self) -> tuple[int, int]:
+        """
+        Get the memory currently traced and its peak.
+
+        Returns:
+            tuple[int, int]: (current, peak) in bytes, (0, 0) if not tracing
+        """
+        if not tracemalloc.is_tracing():
+            return (0, 0)
+        return tracemalloc.get_traced_memory()
+
+    # >>==============<< Cache Sizes >>==============<<
+    def cache_sizes(self) -> dict[str, str]:
+        """
+        Report the size of discord.py caches and of the bot's own structures.
+
+        Returns:
+            dict[str, str]: Human readable size for every cache
+        """
+        bot = self.bot
+        members: int = sum(len(guild.members) for guild in bot.guilds)
+        output: dict[str, str] = {
+            'Server': str(len(bot.guilds)),
+            'Membri in cache': str(members),
+            'Utenti in cache': str(len(bot.users)),
+            'Messaggi in cache': f'{len(bot.cached_messages)} / {bot._connection.max_messages}',
+        }
+
+        verification = getattr(bot, 'verification', None)
+        if verification is not None:
+            output['Verifiche in attesa'] = f'{len(verification.waiting_users)} ({deep_sizeof(verification.waiting_users) / 1024:.1f} KiB)'
+
+        twitch_app = getattr(bot, 'twitch_app', None)
+        if twitch_app is not None:
+            output['Stato Twitch'] = f'{deep_sizeof(twitch_app.stream_info) / 1024:.1f} KiB'
+
+        log = getattr(bot, 'log', None)
+        if log is not None:
+            records: list = [list(buffer.newest_first()) for buffer in log.recent.values()]
+            output['Log in memoria'] = f'{sum(len(r) for r in records)} record ({deep_sizeof(records) / 1024:.1f} KiB)'
+
+        return output
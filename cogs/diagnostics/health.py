@@ -0,0 +1,96 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import math
+import time
+from datetime import datetime
+from os import getenv
+from typing import Any
+
+# Third-party library imports
+from discord.ext import commands
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Thresholds ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def max_event_age() -> int:
+    """
+    Seconds without gateway events after which the bot is reported as degraded (HEALTH_MAX_EVENT_AGE, default 300).
+
+    Read when called, not at import time, so the value from the .env file is seen.
+    """
+    value: str = getenv('HEALTH_MAX_EVENT_AGE') or ''
+    return int(value) if value.isdigit() else 300
+
+# ============================= Helpers =============================
+def _age(timestamp: float | None) -> float | None:
+    """Seconds elapsed since a time.time() timestamp, None if never set."""
+    return round(time.time() - timestamp, 1) if timestamp is not None else None
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+def _loaded_service(bot: commands.Bot, name: str) -> Any:
+    """A service of the application context if it was already built, None otherwise (a probe must not build services)."""
+    context = getattr(bot, 'context', None)
+    return getattr(context, name) if context is not None and context.loaded(name) else None
+
+# ============================= Health Report =============================
+def build_health_report(bot: commands.Bot) -> dict[str, Any]:
+    """
+    Build the health report of the bot from in-memory state only.
+
+    The bot is healthy when the gateway is connected and an event has been
+    received in the last HEALTH_MAX_EVENT_AGE seconds. The other sections are
+    informational, and only cover the services already built.
+
+    Args:
+        bot (commands.Bot): Discord bot instance
+
+    Returns:
+        dict[str, Any]: The report, with a top level 'status' ('ok' or 'degraded')
+    """
+    latency: float = bot.latency
+    last_event_age: float | None = _age(getattr(bot, 'last_event_at', None))
+    connected: bool = bot.is_ready() and not bot.is_closed() and not math.isinf(latency)
+    healthy: bool = connected and last_event_age is not None and last_event_age <= max_event_age()
+
+    report: dict[str, Any] = {
+        'status': 'ok' if healthy else 'degraded',
+        'gateway': {
+            'connected': connected,
+            'latency_ms': round(latency * 1000, 1) if not math.isinf(latency) else None,
+            'last_event_age': last_event_age
+        }
+    }
+
+    log = _loaded_service(bot, 'log')
+    if log is not None:
+        report['database'] = {
+            'last_write_age': _age(log.db.last_write),
+            'writes': log.db.write_count
+        }
+
+    twitch_app = _loaded_service(bot, 'twitch_app')
+    if twitch_app is not None:
+        report['twitch'] = {
+            'last_successful_check': _iso(twitch_app.last_successful_check),
+            'connection_errors': twitch_app.connection_error_count
+        }
+
+    verification = _loaded_service(bot, 'verification')
+    if verification is not None:
+        report['verification'] = {
+            'pending': len(verification.waiting_users),
+            'next_deadline_in': round(verification.deadlines[0][0] - time.time(), 1) if verification.deadlines else None
+        }
+
+    member_events = bot.get_cog('MemberEvents')
+    if member_events is not None:
+        report['join_pipeline'] = {
+            'queued': member_events.pipeline.queue.qsize(),
+            'waiting_welcome': member_events.pipeline.welcome_queue.qsize(),
+            'dropped': member_events.pipeline.dropped
+        }
+
+    scheduler = _loaded_service(bot, 'scheduler')
+    if scheduler is not None:
+        report['tasks'] = scheduler.status()
+    return report
@@ -0,0 +1,258 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+# Third-party library imports
+from discord import http as discord_http
+
+# ----------------------------- Custom Libraries -----------------------------
+from utils import metrics
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Context Variables ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Route of the REST call currently running in this task
+_current_route: ContextVar[str | None] = ContextVar('rest_current_route', default=None)
+# Bot feature issuing the REST calls in this task
+_current_feature: ContextVar[str] = ContextVar('rest_current_feature', default='other')
+
+# Waits on a bucket shorter than this are not counted as rate limit waits
+_MIN_WAIT: float = 0.001
+
+# Warnings of discord.http about the 429 responses (discord.py 2.5)
+_RETRY_WARNING: str = 'We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds.'
+_ERROR_WARNING: str = 'We are being rate limited. %s %s responded with 429. Timeout of %.2f was too long, erroring instead.'
+_GLOBAL_WARNING: str = 'Global rate limit has been hit. Retrying in %.2f seconds.'
+
+# ============================= Feature Tag =============================
+@contextmanager
+def rest_feature(name: str) -> Iterator[None]:
+    """
+    Attribute every REST call made inside the block (and by the tasks it creates) to a feature.
+
+    Args:
+        name (str): Name of the feature (e.g. 'assign-all')
+    """
+    token = _current_feature.set(name)
+    try:
+        yield
+    finally:
+        _current_feature.reset(token)
+
+# ============================= Route Stats =============================
+def _new_stats() -> dict[str, float]:
+    return {'calls': 0, 'errors': 0, 'time': 0.0, 'rate_limited': 0, 'global_rate_limited': 0, 'retry_after': 0.0, 'bucket_wait': 0.0}
+
+# ============================= Rate Limit Log Handler =============================
+class _RateLimitHandler(logging.Handler):
+    """
+    Logging handler catching the 429 warnings emitted by discord.http.
+
+    discord.py handles the 429 internally (sleeping for retry_after and retrying),
+    so its warning is the only place where the retry is visible.
+    """
+
+    def __init__(self, stats: 'RestStats') -> None:
+        super().__init__(level=logging.WARNING)
+        self.stats: 'RestStats' = stats
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.msg not in (_RETRY_WARNING, _ERROR_WARNING, _GLOBAL_WARNING) or not record.args:
+            return
+        retry_after: float = float(record.args[-1]) if isinstance(record.args[-1], (int, float)) else 0.0
+        if record.msg == _RETRY_WARNING:
+            self.stats.record_rate_limit(retry_after)
+        elif record.msg == _ERROR_WARNING:
+            # Raised as RateLimited instead of sleeping
+            self.stats.record_rate_limit(None)
+        else:
+            # Follows the retry warning of the same 429, which already recorded the sleep
+            self.stats.record_global_rate_limit()
+
+# ============================= Rest Stats class =============================
+class RestStats():
+    """
+    Accounts the Discord REST calls made by the bot.
+
+    Wraps the bot HTTP client to count calls and errors per route, bucket and
+    feature, records 429 responses with their retry-after sleeps and measures
+    the time spent waiting on the rate limit buckets.
+    """
+
+    def __init__(self) -> None:
+        self.routes: dict[str, dict[str, float]] = {}
+        self.buckets: dict[str, int] = {}
+        self.features: dict[str, dict[str, float]] = {}
+        self.started_at: float = time.monotonic()
+        self._http: discord_http.HTTPClient | None = None
+        self._original_acquire = None
+        self._handler: _RateLimitHandler = _RateLimitHandler(self)
+
+    # ============================= Install =============================
+    def install(self, http: discord_http.HTTPClient) -> None:
+        """
+        Start accounting the calls made through the given HTTP client.
+
+        Args:
+            http (discord_http.HTTPClient): The bot HTTP client (bot.http)
+        """
+        if self._http is not None:
+            return
+        self._http = http
+        original_request = http.request
+
+        async def request(route: discord_http.Route, **kwargs: Any) -> Any:
+            route_token = _current_route.set(route.key)
+            bucket_hash: str = http._bucket_hashes.get(route.key, route.key)
+            self._count_bucket(f'{bucket_hash}:{route.major_parameters}')
+            start: float = time.perf_counter()
+            failed: bool = False
+            try:
+                return await original_request(route, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._record_call(route.key, time.perf_counter() - start, failed)
+                _current_route.reset(route_token)
+
+        http.request = request
+
+        # Measure the time spent waiting for a bucket to have requests left
+        self._original_acquire = discord_http.Ratelimit.acquire
+        original_acquire = self._original_acquire
+        stats = self
+
+        async def acquire(ratelimit: discord_http.Ratelimit) -> None:
+            start: float = time.perf_counter()
+            await original_acquire(ratelimit)
+            waited: float = time.perf_counter() - start
+            if waited >= _MIN_WAIT:
+                stats.record_bucket_wait(waited)
+
+        discord_http.Ratelimit.acquire = acquire
+        logging.getLogger('discord.http').addHandler(self._handler)
+
+    # ============================= Uninstall =============================
+    def uninstall(self) -> None:
+        """
+        Stop accounting the calls and restore the original HTTP client behaviour.
+        """
+        if self._http is None:
+            return
+        # Removing the instance attribute exposes the original bound method again
+        self._http.__dict__.pop('request', None)
+        discord_http.Ratelimit.acquire = self._original_acquire
+        logging.getLogger('discord.http').removeHandler(self._handler)
+        self._http = None
+
+    # ============================= Recording =============================
+    def _route_stats(self) -> tuple[dict[str, float], dict[str, float]]:
+        route: str = _current_route.get() or 'unknown'
+        feature: str = _current_feature.get()
+        route_stats = self.routes.get(route)
+        if route_stats is None:
+            route_stats = self.routes[route] = _new_stats()
+        feature_stats = self.features.get(feature)
+        if feature_stats is None:
+            feature_stats = self.features[feature] = _new_stats()
+        return route_stats, feature_stats
+
+    def _count_bucket(self, bucket: str) -> None:
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def _record_call(self, route: str, elapsed: float, failed: bool) -> None:
+        for stats in self._route_stats():
+            stats['calls'] += 1
+            stats['time'] += elapsed
+            if failed:
+                stats['errors'] += 1
+        metrics.increment('rest.calls')
+        if failed:
+            metrics.increment('rest.errors')
+        metrics.observe('rest.call', elapsed)
+
+    def record_rate_limit(self, retry_after: float | None) -> None:
+        """
+        Record a 429 response and the retry-after sleep that follows it.
+
+        Args:
+            retry_after (float | None): Seconds discord.py will sleep before retrying, None if it raises instead
+        """
+        for stats in self._route_stats():
+            stats['rate_limited'] += 1
+            stats['retry_after'] += retry_after or 0.0
+        metrics.increment('rest.rate_limited')
+        if retry_after is not None:
+            metrics.observe('rest.retry_after', retry_after)
+
+    def record_global_rate_limit(self) -> None:
+        """
+        Record that a 429 response was a global rate limit (every route waits until it is over).
+        """
+        for stats in self._route_stats():
+            stats['global_rate_limited'] += 1
+        metrics.increment('rest.global_rate_limited')
+
+    def record_bucket_wait(self, waited: float) -> None:
+        """
+        Record the time a request waited for its rate limit bucket.
+
+        Args:
+            waited (float): Seconds spent waiting
+        """
+        for stats in self._route_stats():
+            stats['bucket_wait'] += waited
+        metrics.observe('rest.bucket_wait', waited)
+
+    # ============================= Reporting =============================
+    def top_routes(self, limit: int = 10) -> list[tuple[str, dict[str, float]]]:
+        """
+        Get the routes with the most calls.
+
+        Args:
+            limit (int, optional): Number of routes to return. Defaults to 10
+
+        Returns:
+            list[tuple[str, dict[str, float]]]: (route, stats) pairs sorted by calls
+        """
+        return sorted(self.routes.items(), key=lambda item: item[1]['calls'], reverse=True)[:limit]
+
+    def top_features(self, limit: int = 10) -> list[tuple[str, dict[str, float]]]:
+        """
+        Get the features with the most calls.
+
+        Args:
+            limit (int, optional): Number of features to return. Defaults to 10
+
+        Returns:
+            list[tuple[str, dict[str, float]]]: (feature, stats) pairs sorted by calls
+        """
+        return sorted(self.features.items(), key=lambda item: item[1]['calls'], reverse=True)[:limit]
+
+    def totals(self) -> dict[str, float]:
+        """
+        Get the totals over every route.
+
+        Returns:
+            dict[str, float]: Summed stats plus the number of buckets and the uptime in seconds
+        """
+        output: dict[str, float] = _new_stats()
+        for stats in self.routes.values():
+            for key, value in stats.items():
+                output[key] += value
+        output['buckets'] = len(self.buckets)
+        output['uptime'] = time.monotonic() - self.started_at
+        return output
+
+    def reset(self) -> None:
+        """
+        Clear every recorded stat.
+        """
+        self.routes.clear()
+        self.buckets.clear()
+        self.features.clear()
+        self.started_at = time.monotonic()
+        metrics.reset('rest.')
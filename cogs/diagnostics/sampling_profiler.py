@@ -0,0 +1,161 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import sys
+import threading
+import time
+from datetime import datetime
+from os import getenv, path
+from types import CodeType, FrameType
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Limits ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Deepest stack kept for a sample (the outermost frames are dropped)
+_MAX_DEPTH: int = 64
+# Distinct stacks kept in the table; further stacks are counted as truncated
+_MAX_STACKS: int = 20000
+_TRUNCATED: tuple[str, ...] = ('[truncated]',)
+
+# ============================= Sampling Profiler class =============================
+class SamplingProfiler():
+    """
+    Low-overhead statistical profiler running in a background thread.
+
+    At every tick the thread reads the current stack of every other thread
+    (sys._current_frames) and increments its count in an aggregated table of
+    collapsed stacks, which can be exported in the format used by
+    flamegraph.pl / speedscope / inferno.
+    """
+
+    def __init__(self, frequency: int | None = None) -> None:
+        """
+        Initialize the SamplingProfiler.
+
+        Args:
+            frequency (int | None, optional): Samples per second. Defaults to PROFILER_HZ or 20
+        """
+        env_frequency: str = getenv('PROFILER_HZ') or ''
+        self.frequency: int = frequency or (int(env_frequency) if env_frequency.isdigit() else 20)
+        self.stacks: dict[tuple[str, ...], int] = {}
+        self.samples: int = 0
+        self.started_at: datetime | None = None
+        self.sampling_time: float = 0.0
+        self._labels: dict[CodeType, str] = {}
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock: threading.Lock = threading.Lock()
+
+    # >>==============<< Running >>==============<<
+    @property
+    def running(self) -> bool:
+        """Whether the sampling thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    # >>==============<< Overhead >>==============<<
+    @property
+    def overhead(self) -> float:
+        """Fraction of wall time spent taking samples since the profiler was started."""
+        if self.started_at is None:
+            return 0.0
+        elapsed: float = (datetime.now() - self.started_at).total_seconds()
+        return self.sampling_time / elapsed if elapsed > 0 else 0.0
+
+    # ============================= Start / Stop =============================
+    def start(self, frequency: int | None = None) -> None:
+        """
+        Start the sampling thread.
+
+        Args:
+            frequency (int | None, optional): New samples per second. Defaults to the current one
+        """
+        if frequency:
+            self.frequency = frequency
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.started_at = datetime.now()
+        self.sampling_time = 0.0
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the sampling thread. The collected stacks are kept until reset().
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def reset(self) -> None:
+        """
+        Clear the collected stacks.
+        """
+        with self._lock:
+            self.stacks = {}
+            self.samples = 0
+        if self.running:
+            self.started_at = datetime.now()
+            self.sampling_time = 0.0
+
+    # ============================= Sampling =============================
+    def _label(self, code: CodeType) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f'{code.co_name} ({path.basename(code.co_filename)}:{code.co_firstlineno})'
+        return label
+
+    def _run(self) -> None:
+        interval: float = 1.0 / self.frequency
+        own_id: int = threading.get_ident()
+        while not self._stop_event.wait(interval):
+            start: float = time.perf_counter()
+            names: dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames: dict[int, FrameType] = sys._current_frames()
+            with self._lock:
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    self._add_sample(names.get(thread_id, str(thread_id)), frame)
+                self.samples += 1
+            self.sampling_time += time.perf_counter() - start
+
+    def _add_sample(self, thread_name: str, frame: FrameType | None) -> None:
+        labels: list[str] = []
+        while frame is not None and len(labels) < _MAX_DEPTH:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name)
+        labels.reverse()
+        stack: tuple[str, ...] = tuple(labels)
+        if stack not in self.stacks and len(self.stacks) >= _MAX_STACKS:
+            stack = _TRUNCATED
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    # ============================= Export =============================
+    def collapsed(self) -> str:
+        """
+        Export the collected stacks in the collapsed (folded) stack format.
+
+        Returns:
+            str: One 'frame;frame;frame count' line per distinct stack
+        """
+        with self._lock:
+            items: list[tuple[tuple[str, ...], int]] = list(self.stacks.items())
+        lines: list[str] = [f"{';'.join(frame.replace(';', ':') for frame in stack)} {count}" for stack, count in items]
+        lines.sort()
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, folder: str | None = None) -> str:
+        """
+        Write the collapsed stacks to a file.
+
+        Args:
+            folder (str | None, optional): Destination folder. Defaults to DATA_PATH
+
+        Returns:
+            str: Path of the written file
+        """
+        folder = folder or str(getenv('DATA_PATH'))
+        file_path: str = path.join(folder, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.folded")
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(self.collapsed())
+        return file_path
@@ -0,0 +1,102 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from collections import OrderedDict
+
+# Active (user, channel) windows kept at most, the least recently active are evicted first
+MAX_TRACKED: int = 10000
+
+# ============================= Rate Window =============================
+class RateWindow():
+    """
+    Timestamps of the last messages of one user in one channel.
+
+    The storage is preallocated with one slot per allowed message, so a window
+    uses the same memory however many messages the user sends.
+    """
+
+    __slots__ = ('times', 'next', 'last_seen', 'muted_until')
+
+    def __init__(self, capacity: int) -> None:
+        self.times: list[float] = [float('-inf')] * capacity
+        self.next: int = 0
+        self.last_seen: float = 0.0
+        # Messages are not counted again until the flood action cooled down
+        self.muted_until: float = 0.0
+
+# ============================= Flood Tracker class =============================
+class FloodTracker():
+    """
+    Sliding-window message rate tracker per (user, channel).
+
+    A flood is detected when a user sends more than max_messages messages in
+    window_seconds in the same channel: the slot overwritten by the new message
+    holds the timestamp of the message sent max_messages messages earlier.
+    Windows idle for longer than the window are evicted, oldest first.
+    """
+
+    def __init__(self, max_messages: int, window_seconds: float) -> None:
+        """
+        Initialize the FloodTracker.
+
+        Args:
+            max_messages (int): Messages allowed in the window
+            window_seconds (float): Length of the window in seconds
+        """
+        self.max_messages: int = max(1, max_messages)
+        self.window_seconds: float = window_seconds
+        # Ordered by last activity, the least recently active first
+        self.windows: OrderedDict[tuple[int, int], RateWindow] = OrderedDict()
+
+    # ============================= Hit =============================
+    def hit(self, user_id: int, channel_id: int, now: float) -> bool:
+        """
+        Record a message and check whether it exceeds the allowed rate.
+
+        Args:
+            user_id (int): Author of the message
+            channel_id (int): Channel of the message
+            now (float): Monotonic time of the message
+
+        Returns:
+            bool: True the first time the rate is exceeded (once per cooldown)
+        """
+        self.evict(now)
+        key: tuple[int, int] = (user_id, channel_id)
+        window: RateWindow | None = self.windows.get(key)
+        if window is None:
+            window = self.windows[key] = RateWindow(self.max_messages)
+            if len(self.windows) > MAX_TRACKED:
+                self.windows.popitem(last=False)
+        else:
+            self.windows.move_to_end(key)
+        window.last_seen = now
+        if now < window.muted_until:
+            return False
+
+        oldest: float = window.times[window.next]
+        window.times[window.next] = now
+        window.next = (window.next + 1) % len(window.times)
+        if now - oldest > self.window_seconds:
+            return False
+        # Start counting again after the cooldown
+        window.muted_until = now + self.window_seconds
+        window.times[:] = [float('-inf')] * len(window.times)
+        return True
+
+    # ============================= Evict =============================
+    def evict(self, now: float) -> None:
+        """
+        Drop the windows without messages for longer than the window.
+
+        Args:
+            now (float): Monotonic current time
+        """
+        while self.windows:
+            key, window = next(iter(self.windows.items()))
+            # The cooldown ends at most one window after the last message, so it is over too
+            if now - window.last_seen <= self.window_seconds:
+                return
+            del self.windows[key]
+
+    def __len__(self) -> int:
+        return len(self.windows)
@@ -0,0 +1,291 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import contextlib
+import time
+from datetime import datetime
+from os import getenv
+
+# Third-party library imports
+import discord
+from discord.ext import commands
+
+# ----------------------------- Custom Libraries -----------------------------
+from logger import Logger
+from config_manager import ConfigManager
+from utils import metrics
+from utils.roles import add_role
+from utils.printing import load_single_embed_text, create_embed_from_dict
+from cogs.tasks.welcome import create_group_welcome_message, welcome_group_size
+from cogs.diagnostics.rest_stats import rest_feature
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Settings ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+def _env_number(name: str, default: float) -> float:
+    value: str = getenv(name) or ''
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+# Seconds to wait after the join to allow Discord to propagate the user info
+JOIN_DELAY: float = 1.0
+
+# ============================= Join Pipeline class =============================
+class JoinPipeline():
+    """
+    Processes the member joins in the background.
+
+    The gateway handler only enqueues the member. A pool of workers assigns the
+    not verified role and sends the welcome DM, while a single sender groups the
+    newcomers of a burst into one welcome message. The log records produced by
+    the pipeline are written to the database in batches.
+    """
+
+    def __init__(self, bot: commands.Bot, log: Logger, config: ConfigManager) -> None:
+        """
+        Initialize the JoinPipeline.
+
+        Args:
+            bot (commands.Bot): Discord bot instance
+            log (Logger): Logger instance
+            config (ConfigManager): Configuration manager instance
+        """
+        self.bot: commands.Bot = bot
+        self.log: Logger = log
+        self.config: ConfigManager = config
+        # Settings, read here and not at import time so the values of the .env file are seen
+        # Joins waiting to be processed; further joins are left to the periodic welcome task
+        self.queue_size: int = int(_env_number('JOIN_QUEUE_SIZE', 1000))
+        # Joins processed concurrently
+        self.workers: int = int(_env_number('JOIN_WORKERS', 4))
+        # Seconds a welcome message waits for other newcomers before being sent
+        self.welcome_window: float = _env_number('JOIN_WELCOME_WINDOW', 3)
+        self.queue: asyncio.Queue[tuple[float, discord.Member]] = asyncio.Queue(maxsize=self.queue_size)
+        self.welcome_queue: asyncio.Queue[discord.Member] = asyncio.Queue()
+        # Newcomers mentioned by a single welcome message
+        self.welcome_group: int = welcome_group_size()
+        self.dropped: int = 0
+        self._overflowing: bool = False
+        self._tasks: list[asyncio.Task] = []
+        # Log records waiting to be written
+        self._pending_events: list[tuple[str, str]] = []
+        self._pending_verifications: list[tuple[str, str, str]] = []
+
+    # ============================= Start / Stop =============================
+    def start(self) -> None:
+        """
+        Start the workers and the welcome sender.
+        """
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(), name=f'join-worker-{index}') for index in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._welcome_sender(), name='join-welcome-sender'))
+
+    async def stop(self) -> None:
+        """
+        Stop the pipeline and write the pending log records.
+
+        Members still in the queues are welcomed by the periodic welcome task.
+        """
+        pending: list[int] = []
+        while True:
+            try:
+                pending.append(self.queue.get_nowait()[1].id)
+            except asyncio.QueueEmpty:
+                break
+        while True:
+            try:
+                pending.append(self.welcome_queue.get_nowait().id)
+            except asyncio.QueueEmpty:
+                break
+        self.bot.welcome_tracker.release(pending)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush_logs()
+
+    # ============================= Submit =============================
+    def submit(self, member: discord.Member) -> bool:
+        """
+        Enqueue a new member without waiting.
+
+        Args:
+            member (discord.Member): The member who joined
+
+        Returns:
+            bool: False if the queue is full and the member was dropped
+        """
+        try:
+            self.queue.put_nowait((time.monotonic(), member))
+        except asyncio.QueueFull:
+            # Not claimed: the member is found by the next welcome reconciliation
+            self.dropped += 1
+            metrics.increment('join.dropped')
+            if not self._overflowing:
+                self._overflowing = True
+                asyncio.create_task(self.log.error(
+                    f'Coda degli ingressi piena ({self.queue_size}). I nuovi utenti verranno accolti dalla task di benvenuto.',
+                    'EVENT - MEMBER JOIN'
+                ))
+            return False
+        self._overflowing = False
+        self.bot.welcome_tracker.claim(member.id)
+        metrics.increment('join.queued')
+        return True
+
+    # ============================= Workers =============================
+    async def _worker(self) -> None:
+        while True:
+            enqueued_at, member = await self.queue.get()
+            try:
+                delay: float = JOIN_DELAY - (time.monotonic() - enqueued_at)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                with rest_feature('join'):
+                    await self._process(member)
+                await self.welcome_queue.put(member)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.bot.welcome_tracker.release([member.id])
+                await self.log.error(f'Errore durante la gestione di un nuovo utente.\nUtente: {member.name} ({member.id})\n{e}', 'EVENT - MEMBER JOIN')
+            finally:
+                self.queue.task_done()
+
+    async def _process(self, member: discord.Member) -> None:
+        """
+        Assign the not verified role and send the welcome DM to a member.
+
+        Args:
+            member (discord.Member): The member who joined
+        """
+        guild: discord.Guild = member.guild
+        # Load bot communication channel
+        communication_channel = guild.get_channel(self.config.communication_channel)
+
+        # STEP 1: ASSIGN NOT VERIFIED ROLE
+        not_verified_role_id = self.config.load_admin('roles', 'not_verified')
+        if not_verified_role_id and not_verified_role_id != '':
+            try:
+                role: discord.Role | None = guild.get_role(int(not_verified_role_id))
+                if role is None:
+                    # Let add_role report the missing role
+                    await add_role(self.log, guild, int(not_verified_role_id), member.id, self.config)
+                elif role not in member.roles:
+                    await member.add_roles(role)
+                    self._pending_events.append((f'Nuovo ruolo aggiunto ad un utente.\n{member.name} ({member.id}) - {role.name} ({role.id})', 'role-assign-auto'))
+                # INFO LOG
+                self._pending_verifications.append((f'User {member.name} ({member.id}) non è verificato', 'unverified', str(member.id)))
+            except Exception as e:
+                # EXCEPTION
+                error_message: str = f"Errore durante l'assegnazione del ruolo 'not_verified'.\nUtente: {member.name} ({member.id})\n{e}"
+                await self._report_error(communication_channel, error_message, 'EVENT - MEMBER NOT VERIFIED ROLE')
+
+        # STEP 2: SEND WELCOME MESSAGE TO USER
+        try:
+            # Get welcome message
+            message_content: dict = await load_single_embed_text(guild, 'welcome-user', self.config)
+            # Create the embed message
+            message: discord.Embed = create_embed_from_dict(message_content)
+            # Send the message to the user
+            await member.send(embed=message)
+            # INFO LOG
+            self._pending_events.append((f'Messaggio di benvenuto inviato a {member.name} ({member.id})', 'guild_join'))
+        except discord.Forbidden:
+            # EXCEPTION
+            error_message: str = f"Errore durante l'invio del messaggio di benvenuto. \nUtente: {member.name} ({member.id}) \nL'utente ha disabilitato i messaggi privati."
+            await self._report_error(communication_channel, error_message, 'EVENT - MEMBER WELCOME')
+        except Exception as e:
+            # EXCEPTION
+            error_message: str = f"Errore durante l'invio del messaggio di benvenuto. \nUtente: {member.name} ({member.id}) \n{e}"
+            await self._report_error(communication_channel, error_message, 'EVENT - MEMBER WELCOME')
+
+    # ============================= Welcome Sender =============================
+    async def _welcome_sender(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: list[discord.Member] = [await self.welcome_queue.get()]
+            # Wait for the other newcomers of the burst
+            deadline: float = loop.time() + self.welcome_window
+            while len(batch) < self.welcome_group:
+                timeout: float = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.welcome_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                with rest_feature('welcome'):
+                    await self._send_welcome(batch)
+                await self._flush_logs()
+            except asyncio.CancelledError:
+                # Shutdown: the batch is welcomed by the periodic welcome task
+                self.bot.welcome_tracker.release([member.id for member in batch])
+                raise
+            except Exception as e:
+                # This is the only sender: it must survive, and the batch is retried by the next welcome reconciliation
+                self.bot.welcome_tracker.release([member.id for member in batch])
+                with contextlib.suppress(Exception):
+                    await self.log.error(f"Errore durante l'invio dei benvenuti in coda.\n{e}", 'EVENT - MEMBER WELCOME')
+
+    async def _send_welcome(self, members: list[discord.Member]) -> None:
+        """
+        Send one welcome message mentioning every member of the batch.
+
+        Args:
+            members (list[discord.Member]): Members joined in the same burst
+        """
+        guild: discord.Guild = members[0].guild
+        # Load bot communication channel
+        communication_channel = guild.get_channel(self.config.communication_channel)
+        names: str = ', '.join(f'{member.name} ({member.id})' for member in members)
+        try:
+            # Get welcome channel
+            welcome_channel: discord.TextChannel = guild.system_channel
+            # Create welcome message
+            message = await create_group_welcome_message(members, self.config, guild)
+            # Send welcome message
+            await welcome_channel.send(embeds=message)
+            # Insert welcome messages into database
+            now: str = datetime.now().isoformat()
+            self.log.db.insert_welcome_many([(now, str(member.id), member.name) for member in members])
+            self.bot.welcome_tracker.mark_welcomed([member.id for member in members])
+            # INFO LOG
+            self._pending_events.extend((f'Nuovo utente aggiunto, {member.name} ({member.id})', 'guild_join') for member in members)
+            metrics.increment('join.welcomed', len(members))
+        except Exception as e:
+            # The next welcome reconciliation retries these members
+            self.bot.welcome_tracker.release([member.id for member in members])
+            # EXCEPTION
+            error_message: str = f"Errore durante l'invio del messaggio di benvenuto. \nUtenti: {names} \n{e}"
+            await self._report_error(communication_channel, error_message, 'EVENT - MEMBER WELCOME')
+
+    async def _report_error(self, communication_channel: discord.abc.Messageable | None, error_message: str, command: str) -> None:
+        """
+        Log an error and send it to the communication channel, if available.
+
+        Args:
+            communication_channel (discord.abc.Messageable | None): Bot communication channel
+            error_message (str): The error
+            command (str): Source of the error
+        """
+        await self.log.error(error_message, command)
+        if communication_channel:
+            try:
+                await communication_channel.send(self.log.error_message(command = command, message = error_message))
+            except Exception as comm_error:
+                await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', command)
+
+    # ============================= Log Flush =============================
+    async def _flush_logs(self) -> None:
+        """
+        Write the pending event and verification records with one query per table.
+        """
+        events, self._pending_events = self._pending_events, []
+        verifications, self._pending_verifications = self._pending_verifications, []
+        if events:
+            await self.log.events(events)
+        if verifications:
+            await self.log.verifications(verifications)
@@ -1,5 +1,10 @@
 
 # ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
 # Third-party library imports
 import discord
 from discord.ext import commands
@@ -7,12 +12,21 @@ from discord.ext import commands
 # ----------------------------- Custom Libraries -----------------------------
 from logger import Logger
 from config_manager import ConfigManager
+from utils import metrics
+from utils.media import message_media, embed_metadata
+from .flood_tracker import FloodTracker
+from .thread_parents import ThreadParents
+
+# Time the database cleanup may take after its scheduled start, rows logged meanwhile can be removed too
+CLEANUP_MARGIN: timedelta = timedelta(hours=1)
 
 class MessageEvents(commands.Cog):
     """
     Cog that listens to message events and logs messages.
     
-    Applies filtering based on the message logging configuration.
+    Applies filtering based on the message logging configuration and detects
+    message floods according to the anti-flood configuration. Messages in
+    threads and forum posts are logged and filtered under their parent channel.
     """
 
     def __init__(self, bot: commands.Bot, log: Logger, config: ConfigManager) -> None:
@@ -20,6 +34,129 @@ class MessageEvents(commands.Cog):
         self.bot: commands.Bot = bot
         self.log: Logger = log
         self.config: ConfigManager = config
+        # Anti-flood settings and tracker, rebuilt when the config changes
+        self._flood_settings: dict = {}
+        self._flood_tracker: FloodTracker | None = None
+        self._flood_version: int = -1
+        # Running anti-flood actions, referenced until they finish so they are not garbage collected
+        self._flood_tasks: set[asyncio.Task] = set()
+        self.thread_parents: ThreadParents = ThreadParents()
+        # Since when every message of the logged channels is in the log: reset by a new gateway
+        # session (the messages sent while disconnected are missing) and by new logging settings
+        self.logged_since: datetime | None = None
+        # (enabled, logged channels) of the message logging configuration, reloaded when the config changes
+        self._logging_version: int = -1
+        self._logging_settings: tuple[bool, frozenset[int]] | None = None
+    
+    # ============================= Logging Filter =============================
+    def is_logged_channel(self, channel_id: int) -> bool:
+        """
+        Check whether messages of a channel are logged, according to the message logging configuration.
+        
+        Args:
+            channel_id (int): Discord channel ID
+            
+        Returns:
+            bool: True if the channel is logged
+        """
+        if self._logging_version != self.config.version:
+            self._logging_version = self.config.version
+            settings: tuple[bool, frozenset[int]] = (bool(self.config.load_message_logging()['enabled']), frozenset(self.config.load_message_logging_channels()))
+            if self._logging_settings is not None and settings != self._logging_settings:
+                # Channels logged from now on have no older messages in the log
+                self.logged_since = datetime.now(timezone.utc)
+            self._logging_settings = settings
+        enabled, channels = self._logging_settings
+        # When the filter is enabled, only the listed channels are logged
+        return channel_id in channels if enabled else True
+    
+    # ============================= Log Coverage =============================
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """
+        Start the log coverage at each new gateway session (a resumed session replays the missed events).
+        """
+        self.logged_since = datetime.now(timezone.utc)
+    
+    def log_coverage_start(self) -> datetime | None:
+        """
+        Get the moment from which the log holds every message of the logged channels: the latest
+        of the gateway session start, the last logging settings change and the last database cleanup.
+        
+        Returns:
+            datetime | None: Start of the coverage, None if the bot is not connected yet
+        """
+        if self.logged_since is None:
+            return None
+        last_cleanup: str | None = self.log.db.get_scheduler_runs().get('database_cleanup')
+        if last_cleanup is None:
+            return self.logged_since
+        return max(self.logged_since, datetime.fromisoformat(last_cleanup) + CLEANUP_MARGIN)
+    
+    # ============================= Anti-Flood =============================
+    def flood_tracker(self) -> FloodTracker | None:
+        """
+        Get the flood tracker for the current anti-flood configuration.
+        
+        Returns:
+            FloodTracker | None: The tracker, or None if the anti-flood is disabled
+        """
+        if self._flood_version != self.config.version:
+            self._flood_version = self.config.version
+            settings: dict = self.config.load_anti_flood()
+            if not settings['enabled']:
+                self._flood_tracker = None
+            elif (self._flood_tracker is None or settings['max_messages'] != self._flood_settings.get('max_messages')
+                  or settings['window_seconds'] != self._flood_settings.get('window_seconds')):
+                self._flood_tracker = FloodTracker(int(settings['max_messages']), float(settings['window_seconds']))
+            self._flood_settings = dict(settings)
+        return self._flood_tracker
+    
+    async def handle_flood(self, message: discord.Message) -> None:
+        """
+        Apply the configured anti-flood actions (timeout, role) to the author of a message and log the event.
+        
+        Members allowed to manage messages are ignored.
+        """
+        member: discord.Member = message.author
+        guild: discord.Guild = message.guild
+        communication_channel = guild.get_channel(self.config.communication_channel)
+        settings: dict = self._flood_settings
+        if member.guild_permissions.manage_messages:
+            return
+        
+        metrics.increment('flood.detected')
+        actions: list[str] = []
+        try:
+            if settings['timeout_minutes']:
+                await member.timeout(timedelta(minutes=int(settings['timeout_minutes'])), reason='Anti-flood')
+                actions.append(f"timeout di {settings['timeout_minutes']} minuti")
+            role: discord.Role | None = guild.get_role(int(settings['role_id'])) if settings['role_id'] else None
+            if role is not None and role not in member.roles:
+                await member.add_roles(role, reason='Anti-flood')
+                actions.append(f'ruolo {role.name} ({role.id})')
+            
+            log_message: str = (
+                f"Flood rilevato: {member.name} ({member.id}) ha superato {settings['max_messages']} messaggi in "
+                f"{settings['window_seconds']} secondi nel canale {message.channel.name} ({message.channel.id})."
+                + (f"\nAzioni: {', '.join(actions)}" if actions else '')
+            )
+            await self.log.event(log_message, 'anti-flood')
+            if communication_channel is not None:
+                await communication_channel.send(log_message)
+            
+        except discord.Forbidden as e:
+            # EXCEPTION
+            error_message: str = f'Permessi insufficienti per le azioni anti-flood.\nUtente: {member.name} ({member.id})\n{e}'
+            await self.log.error(error_message, 'EVENT - ANTI-FLOOD')
+            if communication_channel is not None:
+                await communication_channel.send(self.log.error_message(command = 'EVENT - ANTI-FLOOD', message = error_message))
+        except Exception as e:
+            # EXCEPTION
+            error_message: str = f'Errore durante le azioni anti-flood.\nUtente: {member.name} ({member.id})\n{e}'
+            await self.log.error(error_message, 'EVENT - ANTI-FLOOD')
+            if communication_channel is not None:
+                await communication_channel.send(self.log.error_message(command = 'EVENT - ANTI-FLOOD', message = error_message))
     
     # ============================= ON_MESSAGE =============================
     @commands.Cog.listener()
@@ -27,32 +164,38 @@ class MessageEvents(commands.Cog):
         """
         Handle every message and log it if configured.
         
-        Skips bot messages and respects configured logging channels.
+        Skips bot and direct messages and respects configured logging channels.
+        Thread messages are filtered by their parent channel.
         """
         guild: discord.Guild = message.guild
-        communication_channel = None
-        if guild is not None:
-            communication_channel = guild.get_channel(self.config.communication_channel)
+        if guild is None or message.author.bot:
+            return
+        communication_channel = guild.get_channel(self.config.communication_channel)
         
         try:
-            if message.author.bot:
-                return
+            # Anti-flood: only the in-memory window is updated here, the actions run in the background
+            tracker: FloodTracker | None = self.flood_tracker()
+            if tracker is not None and tracker.hit(message.author.id, message.channel.id, time.monotonic()):
+                task: asyncio.Task = asyncio.create_task(self.handle_flood(message))
+                self._flood_tasks.add(task)
+                task.add_done_callback(self._flood_tasks.discard)
             
-            # Check if message logging is enabled
-            if self.config.load_message_logging()['enabled']:
-                # Get message logging channels
-                message_logging_channels: list[int] = self.config.load_message_logging_channels()
-                # Check if the channel id is in message logging channels
-                if message.channel.id not in message_logging_channels:
-                    return
+            # Check the message logging configuration
+            channel_id, thread_id = self.thread_parents.resolve_channel(message.channel)
+            if not self.is_logged_channel(channel_id):
+                return
+            parent = guild.get_channel(channel_id) if thread_id is not None else message.channel
 
             # Log the message
             await self.log.message(
                 log_message=message.content,
-                channel_id=str(message.channel.id),
-                channel_name=message.channel.name,
+                channel_id=str(channel_id),
+                channel_name=parent.name if parent is not None else message.channel.name,
                 user_id=str(message.author.id),
-                user_name=message.author.name
+                user_name=message.author.name,
+                message_id=str(message.id),
+                media=message_media(message),
+                thread_id=str(thread_id) if thread_id is not None else None
             )
             
         except Exception as e:
@@ -60,4 +203,62 @@ class MessageEvents(commands.Cog):
             error_message: str = f'Errore nel salvataggio del seguente messaggio: \n\'{message.content}\' \nCanale: {message.channel.name} ({message.channel.id}) \n{e}'
             await self.log.error(error_message, 'EVENT - MESSAGE')
             if communication_channel is not None:
-                await communication_channel.send(self.log.error_message(command = 'EVENT - MESSAGE', message = error_message))
\ No newline at end of file
+                await communication_channel.send(self.log.error_message(command = 'EVENT - MESSAGE', message = error_message))
+    
+    # ============================= ON_RAW_MESSAGE_EDIT =============================
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """
+        Store the edit of a logged message as a delta against its previous version.
+        
+        Embeds resolved after sending (link previews) are added to the message media.
+        """
+        content: str | None = payload.data.get('content')
+        author: dict = payload.data.get('author') or {}
+        if author.get('bot') or payload.guild_id is None:
+            return
+        
+        try:
+            channel_id, _ = await self.thread_parents.resolve(self.bot.get_guild(payload.guild_id), payload.channel_id)
+            if not self.is_logged_channel(channel_id):
+                return
+            if payload.message.embeds:
+                await self.log.message_media(str(payload.message_id), [embed_metadata(embed) for embed in payload.message.embeds])
+            if content is not None:
+                await self.log.message_edit(str(payload.message_id), str(channel_id), content)
+        except Exception as e:
+            # EXCEPTION
+            error_message: str = f'Errore nel salvataggio della modifica del messaggio {payload.message_id} \nCanale: {payload.channel_id} \n{e}'
+            await self.log.error(error_message, 'EVENT - MESSAGE EDIT')
+    
+    # ============================= ON_RAW_MESSAGE_DELETE =============================
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        """
+        Store a tombstone for a deleted message, if it was logged.
+        """
+        if payload.guild_id is None:
+            return
+        
+        try:
+            await self.log.message_delete([str(payload.message_id)])
+        except Exception as e:
+            # EXCEPTION
+            error_message: str = f'Errore nel salvataggio dell\'eliminazione del messaggio {payload.message_id} \nCanale: {payload.channel_id} \n{e}'
+            await self.log.error(error_message, 'EVENT - MESSAGE DELETE')
+    
+    # ============================= ON_RAW_BULK_MESSAGE_DELETE =============================
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        """
+        Store the tombstones of bulk deleted messages with a single query.
+        """
+        if payload.guild_id is None:
+            return
+        
+        try:
+            await self.log.message_delete([str(message_id) for message_id in payload.message_ids])
+        except Exception as e:
+            # EXCEPTION
+            error_message: str = f'Errore nel salvataggio dell\'eliminazione di {len(payload.message_ids)} messaggi \nCanale: {payload.channel_id} \n{e}'
+            await self.log.error(error_message, 'EVENT - MESSAGE DELETE')
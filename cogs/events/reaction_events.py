@@ -7,6 +7,7 @@ from discord.ext import commands
 # ----------------------------- Custom Libraries -----------------------------
 from logger import Logger
 from config_manager import ConfigManager
+from utils import metrics
 from cogs.verification import VerificationManager
 from utils.roles import add_role_event, remove_role_event, add_role, remove_role
 
@@ -20,10 +21,39 @@ class ReactionEvents(commands.Cog):
         self.log: Logger = log
         self.config: ConfigManager = config
         self.verification: VerificationManager = verification
+        # IDs of the rules and reaction-role messages, rebuilt when the config changes
+        self._watched_ids: frozenset[int] = frozenset()
+        self._watched_version: int = -1
+    
+    # ============================= Watched Messages =============================
+    def watched_ids(self) -> frozenset[int]:
+        """
+        Get the IDs of the messages whose reactions are handled.
+        
+        Returns:
+            frozenset[int]: Rules message ID and reaction-role message IDs
+        """
+        if self._watched_version != self.config.version:
+            self._watched_version = self.config.version
+            ids: set[int] = set()
+            rules_message_id = self.config.load_rules().get('message_id')
+            for message_id in [rules_message_id, *self.config.load_roles().keys()]:
+                try:
+                    ids.add(int(message_id))
+                except (TypeError, ValueError):
+                    continue
+            ids.discard(0)
+            self._watched_ids = frozenset(ids)
+        return self._watched_ids
     
     # ============================= ON_RAW_REACTION_ADD (Add Role) =============================
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
+        # Fast path: reactions on ordinary messages are rejected before any I/O
+        if payload.message_id not in self.watched_ids():
+            metrics.increment('reactions.rejected')
+            return
+        metrics.increment('reactions.accepted')
         guild: discord.Guild = self.bot.get_guild(payload.guild_id)
         message_id: str = payload.message_id
         emoji: discord.PartialEmoji = payload.emoji
@@ -60,6 +90,11 @@ class ReactionEvents(commands.Cog):
     # ============================= ON_RAW_REACTION_REMOVE (Remove Role) =============================
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent) -> None:
+        # Fast path: reactions on ordinary messages are rejected before any I/O
+        if payload.message_id not in self.watched_ids():
+            metrics.increment('reactions.rejected')
+            return
+        metrics.increment('reactions.accepted')
         guild: discord.Guild = self.bot.get_guild(payload.guild_id)
         message_id: str = payload.message_id
         emoji: discord.PartialEmoji = payload.emoji
@@ -0,0 +1,84 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from collections import OrderedDict
+
+# Third-party library imports
+import discord
+
+# Threads whose parent is remembered, the least recently used are forgotten first
+CACHE_SIZE: int = 1024
+
+# ============================= Thread Parents class =============================
+class ThreadParents():
+    """
+    Bounded LRU cache mapping thread (and forum post) IDs to their parent channel ID.
+
+    Messages in threads are logged and filtered under their parent channel. The
+    parent is read from the thread object when available, so the API is only
+    called for threads that are not in the gateway cache (e.g. archived threads
+    seen through raw events), once per thread.
+    """
+
+    def __init__(self, size: int = CACHE_SIZE) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            size (int, optional): Maximum number of threads remembered. Defaults to CACHE_SIZE
+        """
+        self.size: int = size
+        self.parents: OrderedDict[int, int] = OrderedDict()
+
+    # ============================= Remember =============================
+    def remember(self, thread_id: int, parent_id: int) -> None:
+        """
+        Store the parent of a thread, evicting the least recently used thread if the cache is full.
+
+        Args:
+            thread_id (int): Thread ID
+            parent_id (int): Parent channel ID
+        """
+        self.parents[thread_id] = parent_id
+        self.parents.move_to_end(thread_id)
+        if len(self.parents) > self.size:
+            self.parents.popitem(last=False)
+
+    # ============================= Resolve =============================
+    def resolve_channel(self, channel: discord.abc.GuildChannel | discord.Thread) -> tuple[int, int | None]:
+        """
+        Get the parent channel of a channel object, without API calls.
+
+        Args:
+            channel (discord.abc.GuildChannel | discord.Thread): Channel of a message
+
+        Returns:
+            tuple[int, int | None]: (channel_id, thread_id); thread_id is None outside threads
+        """
+        if isinstance(channel, discord.Thread):
+            self.remember(channel.id, channel.parent_id)
+            return channel.parent_id, channel.id
+        return channel.id, None
+
+    async def resolve(self, guild: discord.Guild, channel_id: int) -> tuple[int, int | None]:
+        """
+        Get the parent channel of a channel ID (e.g. from a raw event).
+
+        Args:
+            guild (discord.Guild): Guild of the channel
+            channel_id (int): Channel or thread ID
+
+        Returns:
+            tuple[int, int | None]: (channel_id, thread_id); thread_id is None outside threads
+        """
+        parent_id: int | None = self.parents.get(channel_id)
+        if parent_id is not None:
+            self.parents.move_to_end(channel_id)
+            return parent_id, channel_id
+
+        channel = guild.get_channel_or_thread(channel_id)
+        if channel is None:
+            try:
+                channel = await guild.fetch_channel(channel_id)
+            except (discord.NotFound, discord.Forbidden):
+                return channel_id, None
+        return self.resolve_channel(channel)
@@ -11,7 +11,9 @@ from .twitch import setup_task as setup_twitch_task
 
 async def setup_all_tasks(bot: commands.bot, log: Logger, config: ConfigManager, twitch_app: TwitchApp) -> None:
     await setup_booster_task(bot, log, config)
-    await setup_twitch_task(twitch_app)
-    await bot.loop.create_task(bot.load_extension('cogs.tasks.weekly_report'))
-    await bot.loop.create_task(bot.load_extension('cogs.tasks.database_cleanup'))
-    await bot.loop.create_task(bot.load_extension('cogs.tasks.welcome'))
\ No newline at end of file
+    await setup_twitch_task(bot, twitch_app)
+    await bot.load_extension('cogs.tasks.weekly_report')
+    await bot.load_extension('cogs.tasks.database_cleanup')
+    await bot.load_extension('cogs.tasks.welcome')
+    # Every job is registered, start running them
+    bot.scheduler.start()
@@ -2,21 +2,24 @@
 # ----------------------------- Imported Libraries -----------------------------
 import asyncio
 import discord
-from discord.ext import tasks
 from discord.ext import commands
 from os import getenv
 # ----------------------------- Custom Libraries -----------------------------
 from logger import Logger
 from utils.roles import add_role, remove_role
+from utils.members import iter_members, low_memory_mode
 from config_manager import ConfigManager
+from scheduler import Job
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Blank Variables ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 _bot: commands.Bot
 _log: Logger
 _config: ConfigManager
 
-@tasks.loop(hours=1)
 async def check_booster():
+    """
+    Hourly reconciliation between the server boosters and the booster role.
+    """
     if _bot == None:
         return
 
@@ -30,8 +33,6 @@ async def check_booster():
     try:
         # Get bot guild
         guild: discord.Guild = _bot.get_guild(int(getenv('GUILD_ID')))
-        # Get all the members in the guild
-        members: list[discord.Member] = guild.members
         # Get the booster role
         booster_role_id = _config.load_admin('roles', 'server_booster')
         role: discord.Role = None
@@ -44,13 +45,24 @@ async def check_booster():
             await _log.error('Booster role not configured or not found in guild', 'TASK - CHECK BOOSTER')
             return
         
-        for member in members:
-            if member.premium_since is not None: # Check if member boosted
-                if role not in member.roles: # Check if role isn't already in member roles
-                    await add_role(_log, guild, role.id, member.id, _config) # Add role
-            else: # Member not boosted
-                if role in member.roles: # Check if role is in member roles
-                    await remove_role(_log, guild, role.id, member.id, _config) # Remove the role
+        if low_memory_mode():
+            # No member cache (and no member updates): stream the members and fix them one page at a time
+            async for member in iter_members(guild):
+                if member.premium_since is not None and role not in member.roles: # Boosted without the role
+                    await add_role(_log, guild, role.id, member.id, _config, member) # Add role
+                elif member.premium_since is None and role in member.roles: # Role without boosting
+                    await remove_role(_log, guild, role.id, member.id, _config, member) # Remove the role
+            return
+        
+        # Boost transitions are handled by MemberEvents.on_member_update,
+        # here only the differences missed by the events are fixed
+        boosters: set[discord.Member] = set(guild.premium_subscribers)
+        role_members: set[discord.Member] = set(role.members)
+        
+        for member in boosters - role_members: # Boosted without the role
+            await add_role(_log, guild, role.id, member.id, _config, member) # Add role
+        for member in role_members - boosters: # Role without boosting
+            await remove_role(_log, guild, role.id, member.id, _config, member) # Remove the role
     except Exception as e:
         # EXCEPTION
         error_message: str = f'Errore durante il controllo. \n{e}'
@@ -63,4 +75,5 @@ async def setup_task(bot, log, config):
     _bot = bot
     _log = log
     _config = config
-    check_booster.start()
\ No newline at end of file
+    # Every hour, spread over the first 5 minutes
+    bot.scheduler.add(Job('check_booster', '0 * * * *', check_booster, jitter=300))
\ No newline at end of file
@@ -1,23 +1,27 @@
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 import datetime
 from logger import Logger
 import pytz
 from config_manager import ConfigManager
+from scheduler import Job
 
 ROME_TZ = pytz.timezone('Europe/Rome')
 
 class DatabaseCleanup(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.logger = Logger()
-        self.config = ConfigManager()
-        self.database_cleanup.start()
+        self.logger: Logger = bot.log
+        self.config: ConfigManager = bot.config
+        # Mondays at 9:05, after the weekly report has read the week
+        bot.scheduler.add(Job('database_cleanup', '5 9 * * 1', self.database_cleanup, jitter=60, catch_up=True))
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.remove('database_cleanup')
 
-    @tasks.loop(hours=168)  # 168 ore = 1 settimana
     async def database_cleanup(self):
         """
-        Weekly database cleanup task that runs every Monday at 9:00 (Europe/Rome).
+        Weekly database cleanup task that runs every Monday at 9:05 (Europe/Rome).
         Deletes records older than the retention period from all database tables.
         Messages with to_maintain = 'True' are preserved.
         """
@@ -73,21 +77,6 @@ class DatabaseCleanup(commands.Cog):
             await communication_channel.send(self.logger.error_message(command='DATABASE-CLEANUP', message=error_message))
             await self.logger.error(self.logger.error_message(command='DATABASE-CLEANUP', message=error_message), 'TASK')
 
-    @database_cleanup.before_loop
-    async def before_database_cleanup(self):
-        """
-        Calcola quanto manca al prossimo lunedì alle 9:00 (Europe/Rome) e attende.
-        """
-        now_rome = datetime.datetime.now(ROME_TZ)
-        today = now_rome.date()
-        this_monday = today - datetime.timedelta(days=now_rome.weekday())
-        next_monday = this_monday + datetime.timedelta(days=7)
-        next_run = datetime.datetime.combine(next_monday, datetime.time(9, 0, 0), tzinfo=ROME_TZ)
-        seconds_until_next = (next_run - now_rome).total_seconds()
-        if seconds_until_next < 0:
-            seconds_until_next += 7 * 24 * 3600  # fallback di sicurezza
-        await discord.utils.sleep_until(next_run)
-
 async def setup(bot):
     """
     Setup function for the DatabaseCleanup cog.
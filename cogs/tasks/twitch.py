@@ -1,20 +1,21 @@
 
 # ----------------------------- Imported Libraries -----------------------------
-from discord.ext import tasks
+from discord.ext import commands
 # ----------------------------- Custom Libraries -----------------------------
 from cogs.twitch import TwitchApp
+from scheduler import Job
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Blank Variables ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 _twitch_app: TwitchApp
 
-@tasks.loop(minutes=1.0)
 async def check_twitch() -> None:
     if _twitch_app == None:
         return
     
     await _twitch_app.check_live_status()
 
-async def setup_task(twitch_app) -> None:
+async def setup_task(bot: commands.Bot, twitch_app: TwitchApp) -> None:
     global _twitch_app
     _twitch_app = twitch_app
-    check_twitch.start()
\ No newline at end of file
+    # Every minute
+    bot.scheduler.add(Job('twitch', '* * * * *', check_twitch, jitter=5))
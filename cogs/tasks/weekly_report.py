@@ -2,12 +2,13 @@ import datetime
 
 # Third-party library imports
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 import pytz
 
 # Custom libraries
 from logger import Logger
 from utils.printing import create_embed
+from scheduler import Job
 
 ROME_TZ = pytz.timezone('Europe/Rome')
 
@@ -27,8 +28,12 @@ class WeeklyReport(commands.Cog):
             bot (commands.Bot): Discord bot instance
         """
         self.bot = bot
-        self.logger = Logger()
-        self.weekly_report.start()
+        self.logger: Logger = bot.log
+        # Mondays at 9:00, sent at startup if the bot was offline at that time
+        bot.scheduler.add(Job('weekly_report', '0 9 * * 1', self.weekly_report, jitter=60, catch_up=True))
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.remove('weekly_report')
 
     def convert_italian_timestamp_to_datetime(self, italian_timestamp: str) -> datetime.datetime | None:
         """
@@ -56,7 +61,6 @@ class WeeklyReport(commands.Cog):
                 # If all parsing fails, return None
                 return None
 
-    @tasks.loop(hours=168)  # 168 hours = 1 week
     async def weekly_report(self):
         """
         Generate and send weekly Discord activity report.
@@ -83,12 +87,13 @@ class WeeklyReport(commands.Cog):
         leave_count = sum(1 for e in events if e[1] == 'remove')
         boost_count = sum(1 for e in events if e[1] == 'boost')
 
-        # Get messages from DB - convert to Italian timestamp format for comparison
-        messages = self.logger.db.get_messages(start_time_italian, end_time_italian)
+        # Count messages per channel in the DB (threads are counted under their parent channel)
         msg_per_channel = {}
-        for msg in messages:
-            channel_name = msg[2] or 'Sconosciuto'
-            msg_per_channel[channel_name] = msg_per_channel.get(channel_name, 0) + 1
+        for channel_id, stored_name, count in self.logger.db.count_messages_by_channel(start_time_italian, end_time_italian):
+            # Prefer the current name from the cache, the stored one for deleted channels
+            channel = self.bot.get_channel(int(channel_id)) if str(channel_id).isdigit() else None
+            channel_name = channel.name if channel is not None else (stored_name or 'Sconosciuto')
+            msg_per_channel[channel_name] = msg_per_channel.get(channel_name, 0) + count
 
         # Format dates for the report
         start_str = start_dt.strftime('%d/%m/%Y %H:%M')
@@ -105,7 +110,8 @@ class WeeklyReport(commands.Cog):
         )
         fields = []
         if msg_per_channel:
-            for ch, count in msg_per_channel.items():
+            # An embed holds at most 25 fields, the channels are sorted by activity
+            for ch, count in list(msg_per_channel.items())[:25]:
                 fields.append({
                     'name': ch,
                     'value': f'{count} messaggi',
@@ -132,24 +138,6 @@ class WeeklyReport(commands.Cog):
         if channel:
             await channel.send(embed=embed)
 
-    @weekly_report.before_loop
-    async def before_weekly_report(self) -> None:
-        """
-        Calculate time until next Monday 9:00 AM (Rome timezone) and wait.
-        
-        Ensures the weekly report runs at the correct time each week.
-        """
-        # Calculate time until next Monday at 9:00 Rome time
-        now_rome = datetime.datetime.now(ROME_TZ)
-        today = now_rome.date()
-        this_monday = today - datetime.timedelta(days=today.weekday())
-        next_monday = this_monday + datetime.timedelta(days=7)
-        next_run = datetime.datetime.combine(next_monday, datetime.time(9, 0, 0), tzinfo=ROME_TZ)
-        seconds_until_next = (next_run - now_rome).total_seconds()
-        if seconds_until_next < 0:
-            seconds_until_next += 7 * 24 * 3600  # safety fallback
-        await discord.utils.sleep_until(next_run)
-
 async def setup(bot):
     """
     Setup function for the WeeklyReport cog.
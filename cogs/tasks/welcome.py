@@ -1,7 +1,7 @@
 
 # ----------------------------- Imported Libraries -----------------------------
 import discord
-from discord.ext import tasks, commands
+from discord.ext import commands
 from datetime import datetime
 from logger import Logger
 import pytz
@@ -11,18 +11,18 @@ import asyncio
 # ----------------------------- Custom Libraries -----------------------------
 from config_manager import ConfigManager
 from utils import printing
+from scheduler import Job
 
 ROME_TZ = pytz.timezone('Europe/Rome')
 
-def extract_user_ids_from_welcome(welcome_messages: list[dict]) -> set:
+def welcome_group_size() -> int:
     """
-    Extract user IDs from the list of welcome message records.
-    Args:
-        welcome_messages (list[dict]): List of welcome message records from the database.
-    Returns:
-        set: Set of user IDs who have already received the welcome message.
+    Get the number of newcomers mentioned by a single welcome message (JOIN_WELCOME_GROUP, default 10).
+
+    Read when called, not at import time, so the value from the .env file is seen.
     """
-    return set(int(record['user_id']) for record in welcome_messages)
+    value: str = getenv('JOIN_WELCOME_GROUP') or ''
+    return int(value) if value.isdigit() and int(value) > 0 else 10
 
 async def create_welcome_message(member: discord.Member, config: ConfigManager, guild: discord.Guild) -> list[discord.Embed]:
     """
@@ -59,6 +59,45 @@ async def create_welcome_message(member: discord.Member, config: ConfigManager,
     ]
     return message
 
+async def create_group_welcome_message(members: list[discord.Member], config: ConfigManager, guild: discord.Guild) -> list[discord.Embed]:
+    """
+    Create a single welcome message mentioning several new members.
+    Args:
+        members (list[discord.Member]): The members to welcome.
+        config (ConfigManager): The configuration manager instance.
+        guild (discord.Guild): The guild where the members joined.
+    Returns:
+        list[discord.Embed]: List of embeds to send as welcome message.
+    """
+    if len(members) == 1:
+        return await create_welcome_message(members[0], config, guild)
+    
+    # Get rule channel
+    rule_channel_id = config.load_admin('channels', 'rule')
+    rule_channel: discord.TextChannel = None
+    
+    if rule_channel_id and rule_channel_id != '':
+        rule_channel = guild.get_channel(int(rule_channel_id))
+    
+    # Load embed message content
+    message_content: list[dict] = await printing.load_embed_text(guild, 'welcome', config)
+    
+    mentions: str = ', '.join(member.mention for member in members)
+    description: str = message_content[0]['description'].format(user=mentions, rule=rule_channel.mention if rule_channel else "#regole")
+    message: list[discord.Embed] = [
+        printing.create_embed(
+            title=message_content[0]['title'], # Load title
+            description=description, # Load description adding the mentions required
+            color=message_content[0]['color'], # Load the color from str
+            image=message_content[0]['image'], # Load image url
+            thumbnail=message_content[0]['thumbnail'], # Load thumbnail url
+        ),
+        printing.create_embed_from_dict(
+            data=message_content[1]
+        )
+    ]
+    return message
+
 class Welcome(commands.Cog):
     """
     Cog for handling the periodic welcome message task.
@@ -75,16 +114,26 @@ class Welcome(commands.Cog):
         self.bot = bot
         self.log = log
         self.config = config
+        # Newcomers mentioned by a single welcome message
+        self.welcome_group: int = welcome_group_size()
+        # Every hour
+        bot.scheduler.add(Job('welcome', '30 * * * *', self.execute_welcome_task, jitter=120))
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.remove('welcome')
 
-    async def execute_welcome_task(self):
+    async def execute_welcome_task(self, full: bool = False):
         """
-        Execute the welcome task logic manually.
-        This method can be called directly without the task decorator.
+        Execute the welcome reconciliation (run hourly by the scheduler).
+
+        Only the members joined after the last reconciliation (or whose welcome
+        failed) are checked against the in-memory welcome set; the members found
+        are welcomed in groups of JOIN_WELCOME_GROUP.
+        Args:
+            full (bool, optional): Check every member of the guild. Defaults to False.
         """
         try:
-            # Get welcome message records from database
-            welcome_messages = self.log.db.get_welcome()
-            sent_user_ids = extract_user_ids_from_welcome(welcome_messages)
+            tracker = self.bot.welcome_tracker
             # Get guild
             guild = self.bot.get_guild(int(getenv('GUILD_ID')))
             if not guild:
@@ -97,23 +146,31 @@ class Welcome(commands.Cog):
             if not welcome_channel:
                 await self.log.error("Welcome channel not found.", 'EVENT - TASK WELCOME')
                 return
-            users = [member for member in guild.members]
-            
-            await asyncio.sleep(1)
+            # Members joined since the last watermark still without a welcome message
+            users: list[discord.Member] = await tracker.pending_members(guild, full)
+            if not users:
+                return
             
-            # Check if welcome message exists for each user
-            for user in users:
-                if user.id not in sent_user_ids and user.bot == False:
+            for index in range(0, len(users), self.welcome_group):
+                group: list[discord.Member] = users[index:index + self.welcome_group]
+                try:
                     # Create welcome message
-                    message = await create_welcome_message(user, self.config, guild)
-                    # Send welcome message to user
+                    message = await create_group_welcome_message(group, self.config, guild)
+                    # Send welcome message to the users
                     await welcome_channel.send(embeds=message)
-                    # Insert welcome message into database
-                    self.log.db.insert_welcome(datetime.now().isoformat(), str(user.id), user.name)
-                    # INFO LOG
-                    await self.log.event(f"Messaggio di benvenuto inviato a {user.name} ({user.id})", 'welcome')
+                except Exception:
+                    # The watermark already passed these members: this group and the
+                    # ones not sent yet are retried by the next reconciliation
+                    tracker.release([user.id for user in users[index:]])
+                    raise
+                # Insert welcome messages into database
+                now: str = datetime.now().isoformat()
+                self.log.db.insert_welcome_many([(now, str(user.id), user.name) for user in group])
+                tracker.mark_welcomed([user.id for user in group])
+                # INFO LOG
+                await self.log.events([(f"Messaggio di benvenuto inviato a {user.name} ({user.id})", 'welcome') for user in group])
             # INFO LOG
-            await self.log.event(f"Messaggio di benvenuto inviato a {len(sent_user_ids)} utenti", 'welcome')
+            await self.log.event(f"Messaggio di benvenuto inviato a {len(users)} utenti", 'welcome')
         except Exception as e:
             # EXCEPTION
             communication_channel = self.bot.get_channel(self.config.communication_channel)
@@ -122,17 +179,10 @@ class Welcome(commands.Cog):
             if communication_channel:
                 await communication_channel.send(self.log.error_message(command = 'EVENT - TASK WELCOME', message = error_message))
 
-    @tasks.loop(hours=1)
-    async def welcome(self):
-        """
-        Periodic task that checks for new users and sends them a welcome message if they haven't received one yet.
-        """
-        await self.execute_welcome_task()
-
 async def setup(bot):
     """
     Setup function for the Welcome cog.
     Args:
         bot (commands.Bot): Discord bot instance to add the cog to.
     """
-    await bot.add_cog(Welcome(bot, Logger(), ConfigManager()))
\ No newline at end of file
+    await bot.add_cog(Welcome(bot, bot.log, bot.config))
\ No newline at end of file
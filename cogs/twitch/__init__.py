@@ -52,6 +52,8 @@ class TwitchApp():
         self.last_connection_error: datetime = None
         self.connection_error_count: int = 0
         self.connection_error_notified: bool = False
+        # Time of the last successful call to the Twitch API (exposed by the health endpoint)
+        self.last_successful_check: datetime = None
         # Initialize data and state
         self.setup()
     
@@ -357,6 +359,7 @@ class TwitchApp():
                 return
             # Fetch current stream info from Twitch
             stream: Stream = await get_stream(self.app, self.streamer_name)
+            self.last_successful_check = datetime.now()
             
             # Reset connection error tracking on successful connection
             await self._reset_connection_error_tracking()
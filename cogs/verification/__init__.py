@@ -1,13 +1,45 @@
 
 # ----------------------------- Standard libraries -----------------------------
 import asyncio
+import heapq
+import time
 from datetime import datetime, timezone
 from os import path, getenv
+import aiohttp
 import discord
 # ----------------------------- Custom libraries -----------------------------
 from utils.file_io import read_file, write_file
 from logger import Logger
 from config_manager import ConfigManager
+from utils import metrics
+from utils.members import resolve_member
+from cogs.diagnostics.rest_stats import rest_feature
+
+# Users verified per scheduler wake-up
+BATCH_SIZE: int = 50
+# Seconds before retrying a verification that failed, doubled at each attempt
+RETRY_DELAY: int = 60
+# Retries of a verification before it is abandoned
+MAX_RETRIES: int = 5
+# Role edits in flight at the same time
+VERIFY_CONCURRENCY: int = 5
+# Verification DMs waiting to be sent, and seconds between two of them
+DM_QUEUE_SIZE: int = 1000
+DM_INTERVAL: float = 0.5
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Tell whether a verification error may go away by itself (Discord 5xx, rate limit, timeout, connection).
+    
+    Args:
+        error (BaseException): The error
+        
+    Returns:
+        bool: True if the verification is worth retrying
+    """
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError, discord.DiscordServerError)):
+        return True
+    return isinstance(error, discord.HTTPException) and error.status == 429
 
 class VerificationManager:
     """
@@ -32,7 +64,15 @@ class VerificationManager:
         self.timeout = 0
         self.temp_role_id = 0
         self.verified_role_id = 0
+        # Users in verification by ID (guild_id, start_time, deadline), mirrored in the pending_verifications table
         self.waiting_users = {}
+        # (deadline, user_id) heap of the users in verification, served by a single task
+        self.deadlines: list[tuple[float, int]] = []
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._scheduler: asyncio.Task | None = None
+        # Verification DMs, sent by a separate low-priority task
+        self.dm_queue: asyncio.Queue[discord.Member] = asyncio.Queue(maxsize=DM_QUEUE_SIZE)
+        self._dm_sender: asyncio.Task | None = None
         self.file_path = path.join(getenv('DATA_PATH'), getenv('VERIFICATION_DATA_FILE_NAME'))
         self.setup()
     
@@ -43,12 +83,6 @@ class VerificationManager:
         else:
             return {}
     
-    # ============================= Save Data =============================
-    def save_data(self) -> None:
-        data: dict = self.load_data()
-        data['pending'] = self.waiting_users
-        write_file(self.file_path, data)
-    
     # ============================= Reload Data =============================
     def reload_data(self, data) -> None:
         self.timeout = data['config'].get('timeout', 0)
@@ -58,8 +92,33 @@ class VerificationManager:
         # Convert to int if not None, otherwise set to 0
         self.temp_role_id = int(temp_role_id) if temp_role_id and temp_role_id != '' else 0
         self.verified_role_id = int(verified_role_id) if verified_role_id and verified_role_id != '' else 0
+    
+    # ============================= Load Pending =============================
+    def load_pending(self) -> None:
+        """
+        Load the users in verification from the database.
+        """
+        self.waiting_users = {
+            user_id: {'guild_id': int(guild_id), 'start_time': start_time, 'deadline': deadline}
+            for user_id, guild_id, start_time, deadline in self.log.db.get_pending_verifications()
+        }
+    
+    def migrate_pending(self, data: dict) -> None:
+        """
+        Move the pending users saved in the JSON file by older versions to the database.
         
-        self.waiting_users = data.get('pending', {})
+        Args:
+            data (dict): Content of the verification data file
+        """
+        pending: dict = data.pop('pending', None)
+        if pending is None:
+            return
+        timeout: float = float(self.timeout or 0)
+        self.log.db.insert_pending_verification_many([
+            (user_id, str(entry['guild_id']), entry['start_time'], datetime.fromisoformat(entry['start_time']).timestamp() + timeout)
+            for user_id, entry in pending.items()
+        ])
+        write_file(self.file_path, data)
     
     # ============================= Setup =============================
     def setup(self) -> None:
@@ -70,14 +129,15 @@ class VerificationManager:
                     'timeout': '',
                     'temp_role_id': '',
                     'verified_role_id': ''
-                },
-                'pending': {}
+                }
             }
             write_file(self.file_path, default)
         else:
             # Load default data
             default = self.load_data()
             self.reload_data(default)
+            self.migrate_pending(default)
+        self.load_pending()
     
     # ============================= Update Config =============================
     def update_timeout(self, new_timeout: str) -> None:
@@ -89,63 +149,282 @@ class VerificationManager:
     
     # ============================= Start Timer =============================
     async def start_timer(self, guild_id: int, user_id: int) -> None:
+        """
+        Put a user in verification and schedule the completion after the timeout.
+        
+        Returns immediately: the deadline is handled by the scheduler task.
+        
+        Args:
+            guild_id (int): Guild of the user
+            user_id (int): User in verification
+        """
         now = datetime.now(timezone.utc)
+        deadline: float = now.timestamp() + float(self.timeout or 0)
         self.waiting_users[str(user_id)] = {
             'guild_id': guild_id,
-            'start_time': now.isoformat()
+            'start_time': now.isoformat(),
+            'deadline': deadline
         }
-        self.save_data()
+        self.log.db.insert_pending_verification(str(user_id), str(guild_id), now.isoformat(), deadline)
+        self.schedule(user_id, deadline)
+    
+    # ============================= Deadline Scheduler =============================
+    def schedule(self, user_id: int, deadline: float) -> None:
+        """
+        Add a verification deadline, waking the scheduler if it is the earliest one.
         
-        await asyncio.sleep(self.timeout)
-        await self.verify_user(user_id)
+        Args:
+            user_id (int): User in verification
+            deadline (float): POSIX time of the verification
+        """
+        heapq.heappush(self.deadlines, (deadline, user_id))
+        if self.deadlines[0][1] == user_id:
+            self._wakeup.set()
+        self.start_scheduler()
     
-    # ============================= Verify User =============================
-    async def verify_user(self, user_id: int) -> None:
+    def start_scheduler(self) -> None:
+        """
+        Start the scheduler task if it is not running.
+        """
+        if self._scheduler is None or self._scheduler.done():
+            self._scheduler = asyncio.create_task(self._run_scheduler(), name='verification-scheduler')
+    
+    def stop_scheduler(self) -> None:
+        """
+        Stop the scheduler and DM tasks. Pending users stay saved and are restored at the next start.
+        """
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            self._scheduler = None
+        if self._dm_sender is not None:
+            self._dm_sender.cancel()
+            self._dm_sender = None
+    
+    def deadline_of(self, user_id: int) -> float | None:
+        """
+        Get the current verification deadline of a user.
+        
+        Returns:
+            float | None: POSIX time of the verification, None if the user is not waiting
+        """
         entry = self.waiting_users.get(str(user_id))
         if not entry:
+            return None
+        return entry['deadline']
+    
+    async def _run_scheduler(self) -> None:
+        """
+        Sleep until the next deadline, then verify the due users in batches.
+        """
+        while True:
+            self._wakeup.clear()
+            if not self.deadlines:
+                await self._wakeup.wait()
+                continue
+            delay: float = self.deadlines[0][0] - time.time()
+            if delay > 0:
+                # Woken early when an earlier deadline is added
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            due: list[int] = []
+            now: float = time.time()
+            while self.deadlines and self.deadlines[0][0] <= now and len(due) < BATCH_SIZE:
+                _, user_id = heapq.heappop(self.deadlines)
+                deadline: float | None = self.deadline_of(user_id)
+                # Skip entries of users already verified or whose timer was restarted
+                if deadline is None or deadline > now or user_id in due:
+                    continue
+                due.append(user_id)
+            try:
+                await self.verify_users(due)
+            except Exception as e:
+                # The due users are out of the heap: without a retry they would never be verified
+                await self.log.error(f'Errore durante la verifica di {len(due)} utenti: {e}', 'VERIFICATION')
+                await self._retry(due)
+    
+    async def _retry(self, user_ids: list[int]) -> None:
+        """
+        Schedule the verification of users again, saving the new deadline.
+        
+        The delay starts at RETRY_DELAY seconds and doubles at each attempt. After
+        MAX_RETRIES attempts the verification is abandoned (the attempts are counted
+        by this process only, a restart starts counting again).
+        
+        Args:
+            user_ids (list[int]): Users whose verification failed (the ones no longer waiting are skipped)
+        """
+        now: float = time.time()
+        records: list[tuple[str, str, str, float]] = []
+        exhausted: list[int] = []
+        for user_id in user_ids:
+            entry: dict | None = self.waiting_users.get(str(user_id))
+            if entry is None:
+                continue
+            entry['attempts'] = entry.get('attempts', 0) + 1
+            if entry['attempts'] > MAX_RETRIES:
+                exhausted.append(user_id)
+                continue
+            retry_at: float = now + RETRY_DELAY * 2 ** (entry['attempts'] - 1)
+            entry['deadline'] = retry_at
+            heapq.heappush(self.deadlines, (retry_at, user_id))
+            records.append((str(user_id), str(entry['guild_id']), entry['start_time'], retry_at))
+        try:
+            self.log.db.insert_pending_verification_many(records)
+        except Exception as e:
+            # Still retried by this process, only a restart before the retry would use the old deadline
+            await self.log.error(f'Impossibile salvare il nuovo termine di verifica di {len(records)} utenti: {e}', 'VERIFICATION')
+        if exhausted:
+            await self._abandon(exhausted, f'nessun esito dopo {MAX_RETRIES} tentativi')
+    
+    async def _abandon(self, user_ids: list[int], reason: str) -> None:
+        """
+        Remove users from the verification queue without verifying them.
+        
+        Their roles are left as they are, so an admin has to complete the verification.
+        
+        Args:
+            user_ids (list[int]): Users whose verification cannot be completed
+            reason (str): Why the verification was abandoned
+        """
+        for user_id in user_ids:
+            self.waiting_users.pop(str(user_id), None)
+        await self.log.error(
+            f'Verifica abbandonata per {len(user_ids)} utenti ({reason}), da completare manualmente: {", ".join(str(user_id) for user_id in user_ids)}',
+            'VERIFICATION'
+        )
+        self.log.db.delete_pending_verifications([str(user_id) for user_id in user_ids])
+    
+    # ============================= Verify Users =============================
+    async def verify_users(self, user_ids: list[int]) -> None:
+        """
+        Complete the verification of a batch of users.
+        
+        Up to VERIFY_CONCURRENCY role edits run at once (discord.py waits on the
+        rate limit buckets, so the concurrency only bounds the in-flight calls).
+        The log records and the queue removal are written with one query each,
+        and the DMs are left to the low-priority DM queue. A user whose
+        verification fails with a transient error stays queued and is retried
+        (see _retry); any other error abandons the verification.
+        
+        Args:
+            user_ids (list[int]): Users whose verification time is over
+        """
+        if not user_ids:
             return
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
         
-        guild: discord.Guild = self.bot.get_guild(entry['guild_id'])
-        member: discord.Member = guild.get_member(user_id)
+        async def complete(user_id: int) -> discord.Member | None:
+            async with semaphore:
+                return await self._complete_verification(user_id)
         
-        if member:
-            # Only remove temp role if it's configured
-            if self.temp_role_id != 0:
-                temp_role = guild.get_role(self.temp_role_id)
-                if temp_role and temp_role in member.roles:
-                    await member.remove_roles(temp_role)
-            
-            # Only add verified role if it's configured
-            if self.verified_role_id != 0:
-                verified_role = guild.get_role(self.verified_role_id)
-                if verified_role and verified_role not in member.roles:
-                    await member.add_roles(verified_role)
+        with rest_feature('verification'):
+            results: list = await asyncio.gather(*(complete(user_id) for user_id in user_ids), return_exceptions=True)
+        
+        done: list[str] = []
+        failed: list[int] = []
+        rejected: list[int] = []
+        entries: list[tuple[str, str, str]] = []
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, Exception):
+                await self.log.error(f'Errore durante la verifica dell\'utente {user_id}: {result}', 'VERIFICATION')
+                # A permanent error (role above the bot, deleted role, ...) would fail again at every retry
+                (failed if is_transient(result) else rejected).append(user_id)
+                continue
+            self.waiting_users.pop(str(user_id), None)
+            done.append(str(user_id))
+            if result is not None:
+                # INFO Log that the user has been verified
+                entries.append((f'User {result.name} ({result.id}) has been verified', 'verified', str(result.id)))
+                self.queue_dm(result)
+        
+        if failed:
+            await self._retry(failed)
+        if rejected:
+            await self._abandon(rejected, 'errore non temporaneo')
+        self.log.db.delete_pending_verifications(done)
+        if entries:
+            await self.log.verifications(entries)
+        metrics.increment('verification.completed', len(done))
+    
+    async def verify_user(self, user_id: int) -> None:
+        """
+        Complete the verification of a single user (see verify_users).
+        
+        Args:
+            user_id (int): User to verify
+        """
+        await self.verify_users([user_id])
+    
+    async def _complete_verification(self, user_id: int) -> discord.Member | None:
+        """
+        Swap the temporary role for the verified role with a single member edit.
+        
+        Args:
+            user_id (int): User to verify
             
-            # INFO Log that the user has been verified
-            await self.log.verification(f'User {member.name} ({member.id}) has been verified', 'verified', str(member.id))
+        Returns:
+            discord.Member | None: The member, None if they left the guild
+        """
+        entry = self.waiting_users.get(str(user_id))
+        guild: discord.Guild | None = self.bot.get_guild(entry['guild_id']) if entry else None
+        member: discord.Member | None = await resolve_member(guild, user_id) if guild is not None else None
+        if member is None:
+            return None
+        
+        # Only the configured roles are changed, the others are kept as they are
+        roles: list[discord.Role] = [role for role in member.roles if not role.is_default() and role.id != self.temp_role_id]
+        verified_role: discord.Role | None = guild.get_role(self.verified_role_id) if self.verified_role_id != 0 else None
+        if verified_role is not None and verified_role not in roles:
+            roles.append(verified_role)
+        if set(roles) != {role for role in member.roles if not role.is_default()}:
+            await member.edit(roles=roles, reason='Verifica completata')
+        return member
+    
+    # ============================= DM Queue =============================
+    def queue_dm(self, member: discord.Member) -> None:
+        """
+        Queue the verification DM of a member, dropping it if the queue is full.
+        
+        Args:
+            member (discord.Member): The verified member
+        """
+        try:
+            self.dm_queue.put_nowait(member)
+        except asyncio.QueueFull:
+            metrics.increment('verification.dm_dropped')
+            return
+        if self._dm_sender is None or self._dm_sender.done():
+            self._dm_sender = asyncio.create_task(self._send_dms(), name='verification-dm-sender')
+    
+    async def _send_dms(self) -> None:
+        """
+        Send the queued verification DMs one at a time, pausing between them.
+        """
+        while True:
+            member: discord.Member = await self.dm_queue.get()
             try:
-                await member.send('✅ Verifica completata! Ora hai accesso al server. Buon divertimento!')
-            except:
+                with rest_feature('verification-dm'):
+                    await member.send('✅ Verifica completata! Ora hai accesso al server. Buon divertimento!')
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # DMs disabled or member gone: nothing to do
                 pass
-        
-        # Cleanup
-        del self.waiting_users[str(user_id)]
-        self.save_data()
+            await asyncio.sleep(DM_INTERVAL)
     
     # ============================= Restore Pending Tasks =============================
     async def restore_pending_tasks(self) -> None:
-        async def delayed_verify(self, user_id: int, delay: int) -> None:
-            await asyncio.sleep(delay)
-            await self.verify_user(user_id)        
+        """
+        Reload the queue with one query and start the scheduler.
         
-        now = datetime.now(timezone.utc)
-        for user_id, data in list(self.waiting_users.items()):
-            start_time: datetime = datetime.fromisoformat(data['start_time'])
-            elapsed: int = (now - start_time).total_seconds()
-            remaining: int = self.timeout - elapsed
-            
-            if remaining <= 0:
-                await self.verify_user(int(user_id))
-            else:
-                asyncio.create_task(delayed_verify(int(user_id), remaining))
-    
+        The rows come sorted by deadline (index scan), which is already a valid heap.
+        Users whose time is already over are verified by the scheduler right away.
+        """
+        self.load_pending()
+        self.deadlines = [(entry['deadline'], int(user_id)) for user_id, entry in self.waiting_users.items()]
+        self._wakeup.set()
+        self.start_scheduler()
@@ -0,0 +1,89 @@
+# ----------------------------- Standard libraries -----------------------------
+from datetime import datetime
+import discord
+# ----------------------------- Custom libraries -----------------------------
+from logger import Logger
+from utils.members import iter_members
+
+class WelcomeTracker:
+    """
+    Keeps in memory which users already received the welcome message.
+
+    The welcome table is read once; afterwards the set is updated by the join
+    pipeline as messages are sent. The periodic reconciliation only looks at
+    the members joined after its last watermark (member.joined_at), plus the
+    members whose welcome previously failed.
+    """
+
+    def __init__(self, log: Logger):
+        """
+        Initialize the WelcomeTracker.
+
+        Args:
+            log (Logger): Logger instance whose database holds the welcome table
+        """
+        self.log = log
+        self.welcomed: set[int] = set()
+        # Members currently handled by the join pipeline
+        self.claimed: set[int] = set()
+        # Members whose welcome message could not be sent
+        self.retry: set[int] = set()
+        # joined_at of the newest member seen by the last reconciliation
+        self.watermark: datetime | None = None
+        self.loaded: bool = False
+
+    # ============================= Load =============================
+    def load(self) -> None:
+        """
+        Load the welcomed user IDs from the database (only the first time).
+        """
+        if self.loaded:
+            return
+        self.welcomed = self.log.db.get_welcome_user_ids()
+        self.loaded = True
+
+    # ============================= State Updates =============================
+    def claim(self, member_id: int) -> None:
+        """Mark a member as being welcomed by the join pipeline."""
+        self.claimed.add(member_id)
+
+    def mark_welcomed(self, member_ids: list[int]) -> None:
+        """Record that the members received the welcome message."""
+        self.welcomed.update(member_ids)
+        self.claimed.difference_update(member_ids)
+        self.retry.difference_update(member_ids)
+
+    def release(self, member_ids: list[int]) -> None:
+        """Record that the welcome message could not be sent, so the next reconciliation retries it."""
+        self.claimed.difference_update(member_ids)
+        self.retry.update(member_ids)
+
+    # ============================= Reconciliation =============================
+    async def pending_members(self, guild: discord.Guild, full: bool = False) -> list[discord.Member]:
+        """
+        Get the members still waiting for the welcome message and advance the watermark.
+
+        Args:
+            guild (discord.Guild): The guild to reconcile
+            full (bool, optional): Ignore the watermark and check every member. Defaults to False
+
+        Returns:
+            list[discord.Member]: Members to welcome, oldest join first
+        """
+        self.load()
+        watermark: datetime | None = None if full else self.watermark
+        newest: datetime | None = self.watermark
+        pending: list[discord.Member] = []
+        async for member in iter_members(guild):
+            joined_at: datetime | None = member.joined_at
+            if joined_at is not None and (newest is None or joined_at > newest):
+                newest = joined_at
+            is_new: bool = watermark is None or joined_at is None or joined_at > watermark
+            if not is_new and member.id not in self.retry:
+                continue
+            if member.bot or member.id in self.welcomed or member.id in self.claimed:
+                continue
+            pending.append(member)
+        self.watermark = newest
+        pending.sort(key=lambda member: member.joined_at.timestamp() if member.joined_at else 0)
+        return pending
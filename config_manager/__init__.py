@@ -35,7 +35,15 @@ default_config = {
         'enabled': False,
         'channels': []
     },
-    'retention_days': 90
+    'retention_days': 90,
+    'anti_flood': {
+        'enabled': False,
+        'max_messages': 6,
+        'window_seconds': 8,
+        # 0 disables the timeout / the role
+        'timeout_minutes': 0,
+        'role_id': 0
+    }
 }
 
 class ConfigManager:
@@ -44,6 +52,9 @@ class ConfigManager:
     Handles CRUD operations on roles, rules, exceptions and other configurations.
     """
     
+    # Incremented on every save by any instance, lets callers invalidate data derived from the file
+    _version: int = 0
+    
     def __init__(self) -> None:
         """Initialize the ConfigManager and create the configuration file if it doesn't exist."""
         self._config_path: str = self._get_config_path()
@@ -63,31 +74,36 @@ class ConfigManager:
         else:
             config = self._load_config()
             
-            # Check and add missing fields from default_config
-            self._ensure_config_structure(config, default_config)
-            
-            self._save_config(config)
+            # Check and add missing fields from default_config, rewriting the file only if some were missing
+            if self._ensure_config_structure(config, default_config):
+                self._save_config(config)
     
-    def _ensure_config_structure(self, config: Dict[str, Any], default_structure: Dict[str, Any]) -> None:
+    def _ensure_config_structure(self, config: Dict[str, Any], default_structure: Dict[str, Any]) -> bool:
         """
         Recursively ensure that all fields from default_structure exist in config.
         
         Args:
             config: Current configuration dictionary
             default_structure: Default configuration structure to check against
+            
+        Returns:
+            bool: True if some field was added
         """
+        changed: bool = False
         for key, default_value in default_structure.items():
             if key not in config:
                 # Add missing key with default value
                 config[key] = default_value
+                changed = True
             elif isinstance(default_value, dict) and isinstance(config[key], dict):
                 # Recursively check nested dictionaries
-                self._ensure_config_structure(config[key], default_value)
+                changed = self._ensure_config_structure(config[key], default_value) or changed
             elif isinstance(default_value, list) and isinstance(config[key], list):
                 # For lists, ensure they exist (don't modify content)
                 pass
             # For other types (str, int, bool), the key exists so no action needed
-    
+        return changed
+
     def _load_config(self) -> Dict[str, Any]:
         """Load and return the content of the configuration file."""
         return read_file(self._config_path)
@@ -95,6 +111,12 @@ class ConfigManager:
     def _save_config(self, config: Dict[str, Any]) -> None:
         """Save the configuration to the file."""
         write_file(self._config_path, config)
+        ConfigManager._version += 1
+    
+    @property
+    def version(self) -> int:
+        """Number of configuration saves since startup."""
+        return ConfigManager._version
     
     def _load_communication_channel(self) -> int:
         """Load the communication channel from the configuration file."""
@@ -473,6 +495,28 @@ class ConfigManager:
         config['retention_days'] = days
         self._save_config(config)
     
+    # ============================= Anti-Flood Management =============================
+    def load_anti_flood(self) -> dict:
+        """
+        Load the anti-flood configuration.
+        
+        Returns:
+            dict: enabled, max_messages, window_seconds, timeout_minutes and role_id
+        """
+        config = self._load_config()
+        return config['anti_flood']
+    
+    def update_anti_flood(self, settings: dict) -> None:
+        """
+        Update the anti-flood configuration.
+        
+        Parameters:
+            settings: Keys of the anti-flood configuration to change
+        """
+        config = self._load_config()
+        config['anti_flood'].update(settings)
+        self._save_config(config)
+    
     # ============================= Utility Methods =============================
     
     def get_config_path(self) -> str:
@@ -2,9 +2,28 @@
 # ----------------------------- Standard libraries -----------------------------
 # Standard library imports
 import sqlite3
+import time
 from sqlite3 import Connection, Cursor
 from os import getenv, path, mkdir
 
+# ----------------------------- Custom libraries -----------------------------
+from .compression import body_hash, train_dictionary, compress, decompress
+
+# Columns of a logged message, resolving the compact storage (names and body stored apart)
+MESSAGE_SELECT: str = (
+    "SELECT messages.timestamp, messages.channel_id, COALESCE(messages.channel_name, channel_names.name), "
+    "messages.user_id, COALESCE(messages.user_name, user_names.name), messages.message, "
+    "message_bodies.codec, message_bodies.dict_id, message_bodies.body "
+    "FROM messages "
+    "LEFT JOIN channel_names ON channel_names.channel_id = messages.channel_id AND messages.channel_name IS NULL "
+    "LEFT JOIN user_names ON user_names.user_id = messages.user_id AND messages.user_name IS NULL "
+    "LEFT JOIN message_bodies ON message_bodies.body_id = messages.body_id"
+)
+# Columns of a background job, and the ones changed while it runs
+JOB_COLUMNS: tuple[str, ...] = ('job_id', 'kind', 'priority', 'status', 'params', 'checkpoint', 'progress',
+                                'channel_id', 'message_id', 'requested_by', 'created', 'updated', 'error')
+JOB_UPDATABLE: frozenset[str] = frozenset({'status', 'checkpoint', 'progress', 'channel_id', 'message_id', 'error'})
+
 # ============================= DB Manager class =============================
 class DB():
     """
@@ -21,10 +40,20 @@ class DB():
         Sets up the database path, creates necessary tables if they don't exist,
         and initializes connection variables.
         """
-        self.tables: list[str] = ['events', 'commands', 'messages', 'errors', 'verification', 'welcome']
+        self.tables: list[str] = ['events', 'commands', 'messages', 'errors', 'verification', 'welcome', 'message_changes', 'media', 'message_media',
+                                  'channel_names', 'user_names', 'message_bodies', 'compression_dicts', 'pending_verifications',
+                                  'scheduler_runs', 'jobs']
         self.db_path: str = ''
         self.conn: Connection | None = None
         self.cursor: Cursor | None = None
+        # Write statistics, exposed by the health endpoint
+        self.last_write: float | None = None
+        self.write_count: int = 0
+        # Compact message storage (MESSAGE_STORAGE=compact): interned names, deduplicated compressed bodies
+        self.compact: bool = getenv('MESSAGE_STORAGE') == 'compact'
+        # Compression dictionaries by ID, and the ID of the one used for new bodies
+        self.dictionaries: dict[int, bytes] = {}
+        self.dictionary_id: int | None = None
         self.configure_db()
     
     # >>==============<< Create Table >>==============<< 
@@ -34,7 +63,10 @@ class DB():
         
         Args:
             table_name (str): Name of the table to create ('events', 'commands', 
-                            'messages', 'errors', 'verification', 'welcome')
+                            'messages', 'errors', 'verification', 'welcome', 'message_changes',
+                            'media', 'message_media', 'channel_names', 'user_names',
+                            'message_bodies', 'compression_dicts', 'pending_verifications',
+                            'scheduler_runs', 'jobs')
         
         Returns:
             str: SQL CREATE TABLE statement
@@ -47,13 +79,41 @@ class DB():
         elif table_name == 'commands':
             return 'CREATE TABLE IF NOT EXISTS commands (timestamp TEXT, type TEXT, command TEXT, message TEXT);'
         elif table_name == 'messages':
-            return 'CREATE TABLE IF NOT EXISTS messages (timestamp TEXT, channel_id TEXT, channel_name TEXT, user_id TEXT, user_name TEXT, message TEXT, to_maintain TEXT);'
+            return 'CREATE TABLE IF NOT EXISTS messages (timestamp TEXT, channel_id TEXT, channel_name TEXT, user_id TEXT, user_name TEXT, message TEXT, to_maintain TEXT, message_id TEXT);'
         elif table_name == 'errors':
             return 'CREATE TABLE IF NOT EXISTS errors (timestamp TEXT, type TEXT, message TEXT);'
         elif table_name == 'verification':
             return 'CREATE TABLE IF NOT EXISTS verification (timestamp TEXT, status TEXT, user_id TEXT, message TEXT);'
         elif table_name == 'welcome':
             return 'CREATE TABLE IF NOT EXISTS welcome (timestamp TEXT, user_id TEXT, user_name TEXT);'
+        elif table_name == 'message_changes':
+            # kind is 'edit' (delta against the previous version) or 'delete' (tombstone, empty delta)
+            return 'CREATE TABLE IF NOT EXISTS message_changes (timestamp TEXT, message_id TEXT, channel_id TEXT, kind TEXT, delta TEXT);'
+        elif table_name == 'media':
+            # One row per distinct attachment/sticker/embed, identified by key
+            return 'CREATE TABLE IF NOT EXISTS media (media_id INTEGER PRIMARY KEY, kind TEXT, key TEXT UNIQUE, url TEXT, filename TEXT, size INTEGER, content_type TEXT, summary TEXT);'
+        elif table_name == 'message_media':
+            return 'CREATE TABLE IF NOT EXISTS message_media (message_id TEXT, media_id INTEGER, PRIMARY KEY (message_id, media_id)) WITHOUT ROWID;'
+        elif table_name == 'channel_names':
+            return 'CREATE TABLE IF NOT EXISTS channel_names (channel_id TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;'
+        elif table_name == 'user_names':
+            return 'CREATE TABLE IF NOT EXISTS user_names (user_id TEXT PRIMARY KEY, name TEXT) WITHOUT ROWID;'
+        elif table_name == 'message_bodies':
+            # One row per distinct content (SHA-1 hash), see database.compression for the codecs
+            return 'CREATE TABLE IF NOT EXISTS message_bodies (body_id INTEGER PRIMARY KEY, hash BLOB UNIQUE, codec INTEGER, dict_id INTEGER, raw_size INTEGER, body BLOB);'
+        elif table_name == 'compression_dicts':
+            return 'CREATE TABLE IF NOT EXISTS compression_dicts (dict_id INTEGER PRIMARY KEY, timestamp TEXT, data BLOB);'
+        elif table_name == 'pending_verifications':
+            # deadline is the POSIX time at which the user is verified
+            return 'CREATE TABLE IF NOT EXISTS pending_verifications (user_id TEXT PRIMARY KEY, guild_id TEXT, start_time TEXT, deadline REAL);'
+        elif table_name == 'scheduler_runs':
+            # Last run of each scheduled job (ISO format, UTC)
+            return 'CREATE TABLE IF NOT EXISTS scheduler_runs (job TEXT PRIMARY KEY, last_run TEXT, duration REAL, status TEXT);'
+        elif table_name == 'jobs':
+            # Background admin jobs: params, checkpoint and progress are JSON, status message in channel_id/message_id
+            return ('CREATE TABLE IF NOT EXISTS jobs (job_id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, priority INTEGER, status TEXT, '
+                    'params TEXT, checkpoint TEXT, progress TEXT, channel_id TEXT, message_id TEXT, requested_by TEXT, '
+                    'created TEXT, updated TEXT, error TEXT);')
         else:
             raise ValueError(f"Tried to create unknown table: {table_name}")
 
@@ -78,8 +138,38 @@ class DB():
         for table in self.tables:
             self.cursor.execute(self.create_table(table))
             self.conn.commit()
+        self.migrate()
+        # Newest compression dictionary, used for the new bodies
+        row = self.cursor.execute('SELECT dict_id, data FROM compression_dicts ORDER BY dict_id DESC LIMIT 1').fetchone()
+        if row is not None:
+            self.dictionary_id = row[0]
+            self.dictionaries[row[0]] = row[1]
         self.close_db()
     
+    # >>==============<< Migrate >>==============<< 
+    def migrate(self) -> None:
+        """
+        Bring the tables created by older versions up to date and create the indexes.
+        
+        Must be called with an open connection.
+        """
+        # Discord message ID of the logged messages (added after the first release)
+        columns: list[str] = [row[1] for row in self.cursor.execute('PRAGMA table_info(messages)').fetchall()]
+        if 'message_id' not in columns:
+            self.cursor.execute('ALTER TABLE messages ADD COLUMN message_id TEXT')
+        # Body of the messages in compact storage
+        if 'body_id' not in columns:
+            self.cursor.execute('ALTER TABLE messages ADD COLUMN body_id INTEGER')
+        # Thread of the messages sent in threads and forum posts (channel_id is the parent)
+        if 'thread_id' not in columns:
+            self.cursor.execute('ALTER TABLE messages ADD COLUMN thread_id TEXT')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_message_id ON messages (message_id)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_message_changes_message_id ON message_changes (message_id)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_pending_verifications_deadline ON pending_verifications (deadline)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status)')
+        self.cursor.execute('CREATE INDEX IF NOT EXISTS idx_messages_user_id ON messages (user_id)')
+        self.conn.commit()
+    
     # >>==============<< Open DB >>==============<< 
     def open_db(self) -> None:
         """
@@ -91,6 +181,15 @@ class DB():
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
     
+    # >>==============<< Commit >>==============<< 
+    def commit(self) -> None:
+        """
+        Commit the current transaction and update the write statistics.
+        """
+        self.conn.commit()
+        self.last_write = time.time()
+        self.write_count += 1
+    
     # ============================= Insert Functions =============================
     # >>==============<< Insert Event >>==============<< 
     def insert_event(self, timestamp: str, record_type: str, message: str) -> None:
@@ -107,7 +206,7 @@ class DB():
             'INSERT INTO events (timestamp, type, message) VALUES (?, ?, ?)',
             (timestamp, record_type, message)
         )
-        self.conn.commit()
+        self.commit()
         self.close_db()
     
     # >>==============<< Insert Command >>==============<< 
@@ -126,14 +225,17 @@ class DB():
             'INSERT INTO commands (timestamp, type, command, message) VALUES (?, ?, ?, ?)',
             (timestamp, record_type, command, message)
         )
-        self.conn.commit()
+        self.commit()
         self.close_db()
         
     # >>==============<< Insert Message >>==============<< 
-    def insert_message(self, timestamp: str, channel_id: str, channel_name: str, user_id: str, user_name: str, message: str, to_maintain: str = 'False') -> None:
+    def insert_message(self, timestamp: str, channel_id: str, channel_name: str, user_id: str, user_name: str, message: str, to_maintain: str = 'False', message_id: str | None = None, thread_id: str | None = None) -> None:
         """
         Insert a message record into the database.
         
+        In compact storage the names go to the channel_names/user_names tables and
+        the content to message_bodies, compressed and stored once per distinct text.
+        
         Args:
             timestamp (str): ISO format timestamp of the message
             channel_id (str): Discord channel ID where the message was sent
@@ -142,13 +244,20 @@ class DB():
             user_name (str): Username who sent the message
             message (str): Content of the message
             to_maintain (str, optional): Flag indicating if message should be maintained. Defaults to 'False'
+            message_id (str | None, optional): Discord message ID. Defaults to None
+            thread_id (str | None, optional): Thread or forum post ID, when channel_id is its parent. Defaults to None
         """
         self.open_db()
+        body_id: int | None = None
+        if self.compact:
+            self._intern_names(channel_id, channel_name, user_id, user_name)
+            body_id = self._store_body(message)
+            channel_name, user_name, message = None, None, None
         self.cursor.execute(
-            'INSERT INTO messages (timestamp, channel_id, channel_name, user_id, user_name, message, to_maintain) VALUES (?, ?, ?, ?, ?, ?, ?)',
-            (timestamp, channel_id, channel_name, user_id, user_name, message, to_maintain)
+            'INSERT INTO messages (timestamp, channel_id, channel_name, user_id, user_name, message, to_maintain, message_id, body_id, thread_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (timestamp, channel_id, channel_name, user_id, user_name, message, to_maintain, message_id, body_id, thread_id)
         )
-        self.conn.commit()
+        self.commit()
         self.close_db()
 
     # >>==============<< Insert Error >>==============<< 
@@ -166,7 +275,7 @@ class DB():
             'INSERT INTO errors (timestamp, type, message) VALUES (?, ?, ?)',
             (timestamp, record_type, message)
         )
-        self.conn.commit()
+        self.commit()
         self.close_db()
     
     # >>==============<< Insert Verification >>==============<< 
@@ -185,7 +294,7 @@ class DB():
             'INSERT INTO verification (timestamp, status, user_id, message) VALUES (?, ?, ?, ?)',
             (timestamp, status, user_id, message)
         )
-        self.conn.commit()
+        self.commit()
         self.close_db()
 
     # >>==============<< Insert Welcome >>==============<< 
@@ -203,7 +312,188 @@ class DB():
             'INSERT INTO welcome (timestamp, user_id, user_name) VALUES (?, ?, ?)',
             (timestamp, user_id, user_name)
         )
-        self.conn.commit()
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Message Media >>==============<< 
+    def insert_message_media(self, message_id: str, media: list[dict]) -> None:
+        """
+        Link the media of a logged message, storing each distinct media (same key) only once.
+        
+        Args:
+            message_id (str): Discord message ID
+            media (list[dict]): Records with kind, key, url, filename, size, content_type and summary
+        """
+        if not media:
+            return
+        self.open_db()
+        self.cursor.executemany(
+            'INSERT OR IGNORE INTO media (kind, key, url, filename, size, content_type, summary) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(item['kind'], item['key'], item['url'], item['filename'], item['size'], item['content_type'], item['summary']) for item in media]
+        )
+        self.cursor.executemany(
+            'INSERT OR IGNORE INTO message_media (message_id, media_id) SELECT ?, media_id FROM media '
+            'WHERE key = ? AND EXISTS (SELECT 1 FROM messages WHERE message_id = ?)',
+            [(message_id, item['key'], message_id) for item in media]
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Message Change >>==============<< 
+    def insert_message_change(self, timestamp: str, message_id: str, channel_id: str, kind: str, delta: str) -> None:
+        """
+        Insert a message change record into the database.
+        
+        Args:
+            timestamp (str): Timestamp of the change
+            message_id (str): Discord message ID
+            channel_id (str): Discord channel ID of the message
+            kind (str): 'edit' or 'delete'
+            delta (str): Delta against the previous version (empty for deletions)
+        """
+        self.open_db()
+        self.cursor.execute(
+            'INSERT INTO message_changes (timestamp, message_id, channel_id, kind, delta) VALUES (?, ?, ?, ?, ?)',
+            (timestamp, message_id, channel_id, kind, delta)
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Message Tombstones >>==============<< 
+    def insert_message_tombstones(self, timestamp: str, message_ids: list[str]) -> int:
+        """
+        Record the deletion of the given messages, only for those that were logged.
+        
+        Args:
+            timestamp (str): Timestamp of the deletion
+            message_ids (list[str]): Discord message IDs
+            
+        Returns:
+            int: Number of tombstones inserted
+        """
+        if not message_ids:
+            return 0
+        self.open_db()
+        placeholders = ','.join('?' for _ in message_ids)
+        self.cursor.execute(
+            f"INSERT INTO message_changes (timestamp, message_id, channel_id, kind, delta) "
+            f"SELECT ?, message_id, channel_id, 'delete', '' FROM messages WHERE message_id IN ({placeholders})",
+            [timestamp, *message_ids]
+        )
+        inserted = self.cursor.rowcount
+        self.commit()
+        self.close_db()
+        return inserted
+    
+    # ============================= Batch Insert Functions =============================
+    # >>==============<< Insert Pending Verification >>==============<< 
+    def insert_pending_verification(self, user_id: str, guild_id: str, start_time: str, deadline: float) -> None:
+        """
+        Add a user to the verification queue, replacing their previous entry.
+        
+        Args:
+            user_id (str): Discord user ID
+            guild_id (str): Discord guild ID
+            start_time (str): ISO format start of the verification
+            deadline (float): POSIX time at which the user is verified
+        """
+        self.open_db()
+        self.cursor.execute(
+            'INSERT OR REPLACE INTO pending_verifications (user_id, guild_id, start_time, deadline) VALUES (?, ?, ?, ?)',
+            (user_id, guild_id, start_time, deadline)
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Update Scheduler Run >>==============<< 
+    def update_scheduler_run(self, job: str, last_run: str, duration: float, status: str) -> None:
+        """
+        Save the last run of a scheduled job.
+        
+        Args:
+            job (str): Name of the job
+            last_run (str): ISO format scheduled time of the run
+            duration (float): Run time in seconds
+            status (str): 'ok' or 'error'
+        """
+        self.open_db()
+        self.cursor.execute(
+            'INSERT OR REPLACE INTO scheduler_runs (job, last_run, duration, status) VALUES (?, ?, ?, ?)',
+            (job, last_run, duration, status)
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Events (Batch) >>==============<< 
+    def insert_events_many(self, records: list[tuple[str, str, str]]) -> None:
+        """
+        Insert several event records in a single transaction.
+        
+        Args:
+            records (list[tuple[str, str, str]]): (timestamp, type, message) tuples
+        """
+        if not records:
+            return
+        self.open_db()
+        self.cursor.executemany(
+            'INSERT INTO events (timestamp, type, message) VALUES (?, ?, ?)',
+            records
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Verification (Batch) >>==============<< 
+    def insert_verification_many(self, records: list[tuple[str, str, str, str]]) -> None:
+        """
+        Insert several verification records in a single transaction.
+        
+        Args:
+            records (list[tuple[str, str, str, str]]): (timestamp, status, user_id, message) tuples
+        """
+        if not records:
+            return
+        self.open_db()
+        self.cursor.executemany(
+            'INSERT INTO verification (timestamp, status, user_id, message) VALUES (?, ?, ?, ?)',
+            records
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Pending Verification (Batch) >>==============<< 
+    def insert_pending_verification_many(self, records: list[tuple[str, str, str, float]]) -> None:
+        """
+        Add several users to the verification queue in a single transaction.
+        
+        Args:
+            records (list[tuple[str, str, str, float]]): (user_id, guild_id, start_time, deadline) tuples
+        """
+        if not records:
+            return
+        self.open_db()
+        self.cursor.executemany(
+            'INSERT OR REPLACE INTO pending_verifications (user_id, guild_id, start_time, deadline) VALUES (?, ?, ?, ?)',
+            records
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Insert Welcome (Batch) >>==============<< 
+    def insert_welcome_many(self, records: list[tuple[str, str, str]]) -> None:
+        """
+        Insert several welcome records in a single transaction.
+        
+        Args:
+            records (list[tuple[str, str, str]]): (timestamp, user_id, user_name) tuples
+        """
+        if not records:
+            return
+        self.open_db()
+        self.cursor.executemany(
+            'INSERT INTO welcome (timestamp, user_id, user_name) VALUES (?, ?, ?)',
+            records
+        )
+        self.commit()
         self.close_db()
     
     # ============================= Get Functions =============================
@@ -242,12 +532,145 @@ class DB():
             list: List of tuples containing (timestamp, channel_id, channel_name, user_id, user_name, message) for matching messages
         """
         self.open_db()
-        query = "SELECT timestamp, channel_id, channel_name, user_id, user_name, message FROM messages WHERE timestamp BETWEEN ? AND ?"
+        query = MESSAGE_SELECT + " WHERE messages.timestamp BETWEEN ? AND ?"
         self.cursor.execute(query, (start_time, end_time))
+        result = [self._decode_message(row) for row in self.cursor.fetchall()]
+        self.close_db()
+        return result
+    
+    # >>==============<< Count Messages by Channel >>==============<< 
+    def count_messages_by_channel(self, start_time: str, end_time: str) -> list:
+        """
+        Count the messages of each channel between start_time and end_time.
+        
+        Messages of threads and forum posts are counted under their parent channel.
+        
+        Args:
+            start_time (str): ISO format start timestamp
+            end_time (str): ISO format end timestamp
+            
+        Returns:
+            list: List of tuples containing (channel_id, channel_name, count), most active first
+        """
+        self.open_db()
+        self.cursor.execute(
+            "SELECT messages.channel_id, COALESCE(MAX(messages.channel_name), MAX(channel_names.name)), COUNT(*) FROM messages "
+            "LEFT JOIN channel_names ON channel_names.channel_id = messages.channel_id "
+            "WHERE messages.timestamp BETWEEN ? AND ? GROUP BY messages.channel_id ORDER BY COUNT(*) DESC",
+            (start_time, end_time)
+        )
+        result = self.cursor.fetchall()
+        self.close_db()
+        return result
+    
+    # >>==============<< Get Message History >>==============<< 
+    def get_message_history(self, message_id: str) -> tuple[tuple | None, list]:
+        """
+        Get a logged message and its changes.
+        
+        Args:
+            message_id (str): Discord message ID
+            
+        Returns:
+            tuple[tuple | None, list]: (timestamp, channel_id, channel_name, user_id, user_name, message) of the
+            original message (None if not logged) and the (timestamp, kind, delta) changes in insertion order
+        """
+        self.open_db()
+        self.cursor.execute(MESSAGE_SELECT + " WHERE messages.message_id = ? LIMIT 1", (message_id,))
+        original = self.cursor.fetchone()
+        if original is not None:
+            original = self._decode_message(original)
+        changes: list = []
+        if original is not None:
+            self.cursor.execute(
+                "SELECT timestamp, kind, delta FROM message_changes WHERE message_id = ? ORDER BY rowid",
+                (message_id,)
+            )
+            changes = self.cursor.fetchall()
+        self.close_db()
+        return original, changes
+    
+    # >>==============<< Get Message Media >>==============<< 
+    def get_message_media(self, message_id: str) -> list:
+        """
+        Get the media linked to a message.
+        
+        Args:
+            message_id (str): Discord message ID
+            
+        Returns:
+            list: List of tuples containing (kind, url, filename, size, content_type, summary)
+        """
+        self.open_db()
+        self.cursor.execute(
+            "SELECT media.kind, media.url, media.filename, media.size, media.content_type, media.summary "
+            "FROM message_media JOIN media ON media.media_id = message_media.media_id WHERE message_media.message_id = ?",
+            (message_id,)
+        )
         result = self.cursor.fetchall()
         self.close_db()
         return result
     
+    # >>==============<< Get User Message IDs >>==============<< 
+    def get_user_message_ids(self, user_id: str, after_id: int) -> list:
+        """
+        Get the logged messages of a user newer than a message ID, skipping the ones already deleted.
+        
+        Args:
+            user_id (str): Discord user ID
+            after_id (int): Only the messages with a greater ID (a snowflake, so a point in time)
+            
+        Returns:
+            list: List of tuples containing (channel_id, thread_id, message_id), thread_id is None outside threads
+        """
+        self.open_db()
+        self.cursor.execute(
+            "SELECT channel_id, thread_id, message_id FROM messages "
+            "WHERE user_id = ? AND message_id IS NOT NULL AND CAST(message_id AS INTEGER) > ? "
+            "AND message_id NOT IN (SELECT message_id FROM message_changes WHERE kind = 'delete')",
+            (user_id, after_id)
+        )
+        result = self.cursor.fetchall()
+        self.close_db()
+        return result
+    
+    # >>==============<< Get Pending Verifications >>==============<< 
+    def get_pending_verifications(self, until: float | None = None) -> list:
+        """
+        Get the users in the verification queue, earliest deadline first.
+        
+        Args:
+            until (float | None, optional): Only the users due by this POSIX time. Defaults to None (all)
+            
+        Returns:
+            list: List of tuples containing (user_id, guild_id, start_time, deadline)
+        """
+        self.open_db()
+        if until is None:
+            self.cursor.execute('SELECT user_id, guild_id, start_time, deadline FROM pending_verifications ORDER BY deadline')
+        else:
+            self.cursor.execute(
+                'SELECT user_id, guild_id, start_time, deadline FROM pending_verifications WHERE deadline <= ? ORDER BY deadline',
+                (until,)
+            )
+        result = self.cursor.fetchall()
+        self.close_db()
+        return result
+    
+    # >>==============<< Get Scheduler Runs >>==============<< 
+    def get_scheduler_runs(self) -> dict[str, str]:
+        """
+        Get the last run of every scheduled job.
+        
+        Returns:
+            dict[str, str]: ISO format last run by job name
+        """
+        self.open_db()
+        self.cursor.execute('SELECT job, last_run FROM scheduler_runs')
+        result = self.cursor.fetchall()
+        self.close_db()
+        return {job: last_run for job, last_run in result}
+    
     # >>==============<< Get Welcome by User ID >>==============<< 
     def get_welcome(self, user_id: str = None) -> dict | list:
         """
@@ -288,6 +711,20 @@ class DB():
                     })
         return output
     
+    # >>==============<< Get Welcomed User IDs >>==============<< 
+    def get_welcome_user_ids(self) -> set[int]:
+        """
+        Get the IDs of every user who already received the welcome message.
+        
+        Returns:
+            set[int]: Distinct user IDs of the welcome table
+        """
+        self.open_db()
+        self.cursor.execute("SELECT DISTINCT user_id FROM welcome")
+        result = self.cursor.fetchall()
+        self.close_db()
+        return {int(row[0]) for row in result}
+    
     # ============================= Delete Functions =============================
     # >>==============<< Delete Messages by Date Range >>==============<< 
     def delete_messages_by_range(self, start_time: str, end_time: str) -> int:
@@ -309,7 +746,36 @@ class DB():
         query = "DELETE FROM messages WHERE timestamp BETWEEN ? AND ? AND to_maintain = 'False'"
         self.cursor.execute(query, (start_time, end_time))
         deleted_count = self.cursor.rowcount
-        self.conn.commit()
+        # Drop the edits, tombstones and media links of the messages no longer logged
+        self.cursor.execute(
+            "DELETE FROM message_changes WHERE message_id NOT IN (SELECT message_id FROM messages WHERE message_id IS NOT NULL)"
+        )
+        self.cursor.execute(
+            "DELETE FROM message_media WHERE message_id NOT IN (SELECT message_id FROM messages WHERE message_id IS NOT NULL)"
+        )
+        self.cursor.execute("DELETE FROM media WHERE media_id NOT IN (SELECT media_id FROM message_media)")
+        self.cursor.execute("DELETE FROM message_bodies WHERE body_id NOT IN (SELECT body_id FROM messages WHERE body_id IS NOT NULL)")
+        self.commit()
+        self.close_db()
+        return deleted_count
+    
+    # >>==============<< Delete Pending Verifications >>==============<< 
+    def delete_pending_verifications(self, user_ids: list[str]) -> int:
+        """
+        Remove users from the verification queue.
+        
+        Args:
+            user_ids (list[str]): Discord user IDs
+            
+        Returns:
+            int: Number of deleted rows
+        """
+        if not user_ids:
+            return 0
+        self.open_db()
+        self.cursor.executemany('DELETE FROM pending_verifications WHERE user_id = ?', [(user_id,) for user_id in user_ids])
+        deleted_count = self.cursor.rowcount
+        self.commit()
         self.close_db()
         return deleted_count
     
@@ -339,7 +805,7 @@ class DB():
         
         self.cursor.execute(query, params)
         deleted_count = self.cursor.rowcount
-        self.conn.commit()
+        self.commit()
         self.close_db()
         return deleted_count
     
@@ -369,10 +835,253 @@ class DB():
         
         self.cursor.execute(query, params)
         deleted_count = self.cursor.rowcount
-        self.conn.commit()
+        self.commit()
         self.close_db()
         return deleted_count
     
+    # ============================= Compact Message Storage =============================
+    # >>==============<< Intern Names >>==============<< 
+    def _intern_names(self, channel_id: str, channel_name: str, user_id: str, user_name: str) -> None:
+        """
+        Store the current channel and user names, writing only when they changed.
+        
+        Must be called with an open connection.
+        """
+        self.cursor.execute(
+            'INSERT INTO channel_names (channel_id, name) VALUES (?, ?) '
+            'ON CONFLICT (channel_id) DO UPDATE SET name = excluded.name WHERE name IS NOT excluded.name',
+            (channel_id, channel_name)
+        )
+        self.cursor.execute(
+            'INSERT INTO user_names (user_id, name) VALUES (?, ?) '
+            'ON CONFLICT (user_id) DO UPDATE SET name = excluded.name WHERE name IS NOT excluded.name',
+            (user_id, user_name)
+        )
+    
+    # >>==============<< Store Body >>==============<< 
+    def _store_body(self, text: str) -> int:
+        """
+        Get the ID of a message body, compressing and storing it if it is new.
+        
+        Must be called with an open connection.
+        
+        Args:
+            text (str): Message content
+            
+        Returns:
+            int: The body ID
+        """
+        digest: bytes = body_hash(text)
+        row = self.cursor.execute('SELECT body_id FROM message_bodies WHERE hash = ?', (digest,)).fetchone()
+        if row is not None:
+            return row[0]
+        dictionary: bytes | None = self.dictionaries.get(self.dictionary_id) if self.dictionary_id is not None else None
+        codec, body = compress(text, dictionary)
+        self.cursor.execute(
+            'INSERT INTO message_bodies (hash, codec, dict_id, raw_size, body) VALUES (?, ?, ?, ?, ?)',
+            (digest, codec, self.dictionary_id if dictionary else None, len(text.encode('utf-8')), body)
+        )
+        return self.cursor.lastrowid
+    
+    # >>==============<< Decode Message >>==============<< 
+    def _decode_message(self, row: tuple) -> tuple:
+        """
+        Turn a MESSAGE_SELECT row into (timestamp, channel_id, channel_name, user_id, user_name, message).
+        
+        Must be called with an open connection.
+        """
+        timestamp, channel_id, channel_name, user_id, user_name, message, codec, dict_id, body = row
+        if message is None and body is not None:
+            dictionary: bytes | None = None
+            if dict_id is not None:
+                if dict_id not in self.dictionaries:
+                    self.dictionaries[dict_id] = self.cursor.execute(
+                        'SELECT data FROM compression_dicts WHERE dict_id = ?', (dict_id,)
+                    ).fetchone()[0]
+                dictionary = self.dictionaries[dict_id]
+            message = decompress(codec, body, dictionary)
+        return (timestamp, channel_id, channel_name, user_id, user_name, message)
+    
+    # >>==============<< Train Dictionary >>==============<< 
+    def train_message_dictionary(self, timestamp: str, sample_size: int = 5000) -> int | None:
+        """
+        Train a compression dictionary on the most recent messages and use it for the new bodies.
+        
+        Bodies already stored keep the dictionary they were compressed with.
+        
+        Args:
+            timestamp (str): Creation timestamp of the dictionary
+            sample_size (int, optional): Number of recent messages to learn from. Defaults to 5000
+            
+        Returns:
+            int | None: The dictionary ID, or None if the messages have no repetitions to learn
+        """
+        self.open_db()
+        self.cursor.execute(MESSAGE_SELECT + " ORDER BY messages.rowid DESC LIMIT ?", (sample_size,))
+        samples: list[str] = [self._decode_message(row)[5] or '' for row in self.cursor.fetchall()]
+        dictionary: bytes = train_dictionary(samples)
+        if not dictionary:
+            self.close_db()
+            return None
+        self.cursor.execute('INSERT INTO compression_dicts (timestamp, data) VALUES (?, ?)', (timestamp, dictionary))
+        self.dictionary_id = self.cursor.lastrowid
+        self.dictionaries[self.dictionary_id] = dictionary
+        self.commit()
+        self.close_db()
+        return self.dictionary_id
+    
+    # >>==============<< Compact Messages >>==============<< 
+    def compact_messages(self, limit: int = 500) -> int:
+        """
+        Move a batch of messages stored in plain form to the compact storage.
+        
+        Args:
+            limit (int, optional): Maximum number of messages to convert. Defaults to 500
+            
+        Returns:
+            int: Number of converted messages (0 when none are left)
+        """
+        self.open_db()
+        self.cursor.execute(
+            'SELECT rowid, channel_id, channel_name, user_id, user_name, message FROM messages WHERE body_id IS NULL LIMIT ?',
+            (limit,)
+        )
+        rows: list = self.cursor.fetchall()
+        for rowid, channel_id, channel_name, user_id, user_name, message in rows:
+            self._intern_names(channel_id, channel_name, user_id, user_name)
+            self.cursor.execute(
+                'UPDATE messages SET channel_name = NULL, user_name = NULL, message = NULL, body_id = ? WHERE rowid = ?',
+                (self._store_body(message or ''), rowid)
+            )
+        self.commit()
+        self.close_db()
+        return len(rows)
+    
+    # >>==============<< Storage Report >>==============<< 
+    def get_message_storage_report(self) -> dict:
+        """
+        Compare the bytes used by the logged messages with their plain size.
+        
+        Returns:
+            dict: plain_rows, compact_rows, distinct_bodies, logical_bytes (plain size of the compact
+            rows), stored_bytes (bodies, names and dictionaries), saved_bytes and dictionary_id
+        """
+        self.open_db()
+        plain_rows, compact_rows = self.cursor.execute(
+            'SELECT COALESCE(SUM(body_id IS NULL), 0), COALESCE(SUM(body_id IS NOT NULL), 0) FROM messages'
+        ).fetchone()
+        logical_bytes: int = self.cursor.execute(
+            'SELECT COALESCE(SUM(message_bodies.raw_size + LENGTH(CAST(channel_names.name AS BLOB)) + LENGTH(CAST(user_names.name AS BLOB))), 0) '
+            'FROM messages JOIN message_bodies ON message_bodies.body_id = messages.body_id '
+            'LEFT JOIN channel_names ON channel_names.channel_id = messages.channel_id '
+            'LEFT JOIN user_names ON user_names.user_id = messages.user_id'
+        ).fetchone()[0]
+        distinct_bodies, body_bytes = self.cursor.execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(body) + LENGTH(hash)), 0) FROM message_bodies'
+        ).fetchone()
+        name_bytes: int = self.cursor.execute(
+            'SELECT (SELECT COALESCE(SUM(LENGTH(CAST(name AS BLOB))), 0) FROM channel_names) + '
+            '(SELECT COALESCE(SUM(LENGTH(CAST(name AS BLOB))), 0) FROM user_names)'
+        ).fetchone()[0]
+        dictionary_bytes: int = self.cursor.execute('SELECT COALESCE(SUM(LENGTH(data)), 0) FROM compression_dicts').fetchone()[0]
+        self.close_db()
+        stored_bytes: int = body_bytes + name_bytes + dictionary_bytes
+        return {
+            'plain_rows': plain_rows,
+            'compact_rows': compact_rows,
+            'distinct_bodies': distinct_bodies,
+            'logical_bytes': logical_bytes,
+            'stored_bytes': stored_bytes,
+            'saved_bytes': logical_bytes - stored_bytes,
+            'dictionary_id': self.dictionary_id
+        }
+    
+    # ============================= Background Jobs =============================
+    # >>==============<< Insert Job >>==============<< 
+    def insert_job(self, kind: str, priority: int, params: str, requested_by: str, created: str) -> int:
+        """
+        Queue a new background job.
+        
+        Args:
+            kind (str): Handler of the job (e.g. 'assign-all')
+            priority (int): Priority, lower runs first
+            params (str): JSON parameters of the handler
+            requested_by (str): ID of the user who started the job
+            created (str): Creation time (ISO format)
+            
+        Returns:
+            int: ID of the job
+        """
+        self.open_db()
+        self.cursor.execute(
+            'INSERT INTO jobs (kind, priority, status, params, checkpoint, progress, requested_by, created, updated) '
+            'VALUES (?, ?, \'queued\', ?, \'{}\', \'{}\', ?, ?, ?)',
+            (kind, priority, params, requested_by, created, created)
+        )
+        job_id: int = self.cursor.lastrowid
+        self.commit()
+        self.close_db()
+        return job_id
+    
+    # >>==============<< Update Job >>==============<< 
+    def update_job(self, job_id: int, updated: str, **fields: str | None) -> None:
+        """
+        Update some columns of a background job.
+        
+        Args:
+            job_id (int): ID of the job
+            updated (str): Update time (ISO format)
+            **fields: Columns to set (status, checkpoint, progress, channel_id, message_id, error)
+        """
+        columns: list[str] = [column for column in fields if column in JOB_UPDATABLE]
+        self.open_db()
+        self.cursor.execute(
+            f"UPDATE jobs SET {', '.join(f'{column} = ?' for column in columns + ['updated'])} WHERE job_id = ?",
+            (*(fields[column] for column in columns), updated, job_id)
+        )
+        self.commit()
+        self.close_db()
+    
+    # >>==============<< Get Jobs >>==============<< 
+    def get_jobs(self, statuses: list[str] | None = None, limit: int = 25) -> list[dict]:
+        """
+        Get background jobs, newest first.
+        
+        Args:
+            statuses (list[str] | None, optional): Only the jobs in these statuses. Defaults to None (all)
+            limit (int, optional): Maximum number of jobs. Defaults to 25
+            
+        Returns:
+            list[dict]: Jobs as dictionaries keyed by column name
+        """
+        self.open_db()
+        if statuses:
+            self.cursor.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE status IN ({', '.join('?' * len(statuses))}) ORDER BY job_id DESC LIMIT ?",
+                (*statuses, limit)
+            )
+        else:
+            self.cursor.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs ORDER BY job_id DESC LIMIT ?", (limit,))
+        result = self.cursor.fetchall()
+        self.close_db()
+        return [dict(zip(JOB_COLUMNS, row)) for row in result]
+    
+    # >>==============<< Get Job >>==============<< 
+    def get_job(self, job_id: int) -> dict | None:
+        """
+        Get a background job.
+        
+        Args:
+            job_id (int): ID of the job
+            
+        Returns:
+            dict | None: The job keyed by column name, None if it does not exist
+        """
+        self.open_db()
+        row = self.cursor.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        self.close_db()
+        return dict(zip(JOB_COLUMNS, row)) if row is not None else None
+    
     # ============================= Close Functions =============================
     # >>==============<< Close DB >>==============<< 
     def close_db(self) -> None:
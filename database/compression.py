@@ -0,0 +1,102 @@
+
+# ----------------------------- Standard libraries -----------------------------
+# Standard library imports
+import hashlib
+import zlib
+from collections import Counter
+
+# Codecs of the stored message bodies
+CODEC_RAW: int = 0
+CODEC_DEFLATE: int = 1
+# zlib only looks back 32 KiB, a larger dictionary would be ignored
+DICTIONARY_SIZE: int = 32 * 1024
+# Longest sample fragment worth putting in the dictionary
+MAX_FRAGMENT: int = 256
+
+# ============================= Hash =============================
+def body_hash(text: str) -> bytes:
+    """
+    Get the deduplication hash of a message body.
+
+    Args:
+        text (str): Message content
+
+    Returns:
+        bytes: SHA-1 digest of the UTF-8 content
+    """
+    return hashlib.sha1(text.encode('utf-8')).digest()
+
+# ============================= Train Dictionary =============================
+def train_dictionary(samples: list[str], size: int = DICTIONARY_SIZE) -> bytes:
+    """
+    Build a preset deflate dictionary from sample messages.
+
+    Repeated whole messages and repeated words are ranked by the bytes they
+    would save (occurrences x length); the best ones are kept up to size, with
+    the most valuable at the end of the dictionary, where deflate references
+    are shortest.
+
+    Args:
+        samples (list[str]): Message contents
+        size (int, optional): Maximum dictionary size in bytes. Defaults to DICTIONARY_SIZE
+
+    Returns:
+        bytes: The dictionary (empty if the samples have no repetitions)
+    """
+    counter: Counter = Counter()
+    for text in samples:
+        if 3 < len(text) <= MAX_FRAGMENT:
+            counter[text] += 1
+        counter.update(word for word in set(text.split()) if 3 < len(word) <= MAX_FRAGMENT)
+
+    ranked: list[str] = sorted(
+        (fragment for fragment, count in counter.items() if count > 1),
+        key=lambda fragment: counter[fragment] * len(fragment.encode('utf-8')),
+        reverse=True
+    )
+    parts: list[bytes] = []
+    total: int = 0
+    for fragment in ranked:
+        data: bytes = fragment.encode('utf-8')
+        if total + len(data) + 1 > size:
+            continue
+        parts.append(data)
+        total += len(data) + 1
+    return b' '.join(reversed(parts))
+
+# ============================= Compress =============================
+def compress(text: str, dictionary: bytes | None = None) -> tuple[int, bytes]:
+    """
+    Compress a message body with raw deflate, optionally using a preset dictionary.
+
+    Args:
+        text (str): Message content
+        dictionary (bytes | None, optional): Preset dictionary. Defaults to None
+
+    Returns:
+        tuple[int, bytes]: The codec and the stored bytes (raw UTF-8 when compression does not help)
+    """
+    data: bytes = text.encode('utf-8')
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=dictionary) if dictionary else zlib.compressobj(9, zlib.DEFLATED, -15)
+    compressed: bytes = compressor.compress(data) + compressor.flush()
+    if len(compressed) < len(data):
+        return CODEC_DEFLATE, compressed
+    return CODEC_RAW, data
+
+# ============================= Decompress =============================
+def decompress(codec: int, body: bytes, dictionary: bytes | None = None) -> str:
+    """
+    Restore a message body stored by compress.
+
+    Args:
+        codec (int): Codec returned by compress
+        body (bytes): Stored bytes
+        dictionary (bytes | None, optional): The dictionary used to compress. Defaults to None
+
+    Returns:
+        str: The message content
+    """
+    if codec == CODEC_RAW:
+        return bytes(body).decode('utf-8')
+    decompressor = zlib.decompressobj(-15, zdict=dictionary) if dictionary else zlib.decompressobj(-15)
+    return (decompressor.decompress(body) + decompressor.flush()).decode('utf-8')
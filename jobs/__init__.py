@@ -0,0 +1,286 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import contextlib
+import json
+import time
+from datetime import datetime, timezone
+from os import getenv
+from typing import Any
+
+# Third-party library imports
+import discord
+from discord.ext import commands
+
+# ----------------------------- Custom Libraries -----------------------------
+from logger import Logger
+from cogs.diagnostics.rest_stats import rest_feature
+from .handlers import HANDLERS
+
+# Jobs run at the same time
+_env_workers: str = getenv('JOB_WORKERS') or ''
+JOB_WORKERS: int = int(_env_workers) if _env_workers.isdigit() and int(_env_workers) > 0 else 2
+# Minimum seconds between two edits of a status message
+PROGRESS_INTERVAL: float = 5.0
+
+# Statuses of a job, with how they are shown in the status message
+STATUS_LABELS: dict[str, str] = {
+    'queued': '⏳ in coda',
+    'running': '🔄 in esecuzione',
+    'done': '✅ completato',
+    'failed': '❌ fallito',
+    'cancelled': '🛑 annullato'
+}
+ACTIVE_STATUSES: list[str] = ['queued', 'running']
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+# ============================= Job Run class =============================
+class JobRun():
+    """
+    A job being executed, handed to its handler.
+
+    The handler reads its parameters and the checkpoint of the previous
+    attempt, and calls save() after each unit of work: the checkpoint and
+    the progress counters are persisted, and the status message is edited
+    at most every PROGRESS_INTERVAL seconds.
+    """
+
+    def __init__(self, manager: 'JobManager', record: dict) -> None:
+        self.manager: JobManager = manager
+        self.bot: commands.Bot = manager.bot
+        self.job_id: int = record['job_id']
+        self.kind: str = record['kind']
+        self.params: dict[str, Any] = json.loads(record['params'] or '{}')
+        self.checkpoint: dict[str, Any] = json.loads(record['checkpoint'] or '{}')
+        self.progress: dict[str, Any] = json.loads(record['progress'] or '{}')
+        self.channel_id: int | None = int(record['channel_id']) if record['channel_id'] else None
+        self.message_id: int | None = int(record['message_id']) if record['message_id'] else None
+        self.cancel_requested: bool = False
+        self._last_edit: float = 0.0
+
+    @property
+    def guild(self) -> discord.Guild | None:
+        return self.bot.get_guild(int(self.params['guild_id']))
+
+    # ============================= Save =============================
+    async def save(self, checkpoint: dict[str, Any], **progress: Any) -> None:
+        """
+        Persist the checkpoint and the progress counters, then refresh the status message.
+
+        Args:
+            checkpoint (dict[str, Any]): Where to resume if the job is interrupted
+            **progress (Any): Progress counters (label: value), shown in the status message
+        """
+        self.checkpoint = checkpoint
+        self.progress.update(progress)
+        self.manager.log.db.update_job(self.job_id, _now(), checkpoint=json.dumps(checkpoint), progress=json.dumps(self.progress))
+        if time.monotonic() - self._last_edit >= PROGRESS_INTERVAL:
+            await self.manager.update_status_message(self, 'running')
+
+# ============================= Job Manager class =============================
+class JobManager():
+    """
+    Persistent queue of the long admin operations (bulk role changes, server-wide
+    message deletion, bulk DMs, ...).
+
+    Jobs are stored in the jobs table and executed by a pool of JOB_WORKERS
+    workers, lower priority first. Each job reports its progress by editing a
+    single status message, saves a checkpoint after every unit of work and can
+    be cancelled. Jobs interrupted by a restart are resumed from their last
+    checkpoint.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the JobManager.
+
+        Args:
+            bot (commands.Bot): Discord bot instance (its logger provides the database)
+        """
+        self.bot: commands.Bot = bot
+        self.log: Logger = bot.log
+        self.queue: asyncio.PriorityQueue[tuple[int, int]] = asyncio.PriorityQueue()
+        # Jobs being executed by ID
+        self.running: dict[int, tuple[JobRun, asyncio.Task]] = {}
+        self._workers: list[asyncio.Task] = []
+
+    # ============================= Start / Stop =============================
+    def start(self) -> None:
+        """
+        Start the workers. The jobs left queued or running by the previous process are resumed.
+        """
+        if self._workers:
+            return
+        for record in reversed(self.log.db.get_jobs(ACTIVE_STATUSES, limit=1000)):
+            self.queue.put_nowait((record['priority'], record['job_id']))
+        self._workers = [asyncio.create_task(self._worker(), name=f'job-worker-{index}') for index in range(JOB_WORKERS)]
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. The running jobs keep their status and checkpoint, they resume at the next start.
+        """
+        tasks: list[asyncio.Task] = self._workers + [task for _, task in self.running.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+
+    # ============================= Submit / Cancel =============================
+    async def submit(self, kind: str, params: dict[str, Any], requested_by: int, channel: discord.abc.Messageable) -> int:
+        """
+        Queue a job and post its status message.
+
+        Args:
+            kind (str): Handler of the job, a key of HANDLERS
+            params (dict[str, Any]): JSON serializable parameters (guild_id is required)
+            requested_by (int): ID of the user who started the job
+            channel (discord.abc.Messageable): Channel of the status message
+
+        Returns:
+            int: ID of the job
+        """
+        handler = HANDLERS[kind]
+        job_id: int = self.log.db.insert_job(kind, handler.priority, json.dumps(params), str(requested_by), _now())
+        run: JobRun = JobRun(self, self.log.db.get_job(job_id))
+        try:
+            message: discord.Message = await channel.send(self.render(run, 'queued'))
+            run.channel_id, run.message_id = message.channel.id, message.id
+            self.log.db.update_job(job_id, _now(), channel_id=str(run.channel_id), message_id=str(run.message_id))
+        except discord.HTTPException as e:
+            # The job runs anyway, only its progress is not shown
+            await self.log.error(f'Impossibile inviare il messaggio di stato del job #{job_id}: {e}', 'JOBS')
+        self.queue.put_nowait((handler.priority, job_id))
+        return job_id
+
+    async def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a queued or running job. A running job stops at its next await, after its last checkpoint.
+
+        Args:
+            job_id (int): ID of the job
+
+        Returns:
+            bool: False if the job does not exist or is already finished
+        """
+        if job_id in self.running:
+            run, task = self.running[job_id]
+            run.cancel_requested = True
+            task.cancel()
+            return True
+        record: dict | None = self.log.db.get_job(job_id)
+        if record is None or record['status'] not in ACTIVE_STATUSES:
+            return False
+        # Still in the queue: the worker skips it
+        self.log.db.update_job(job_id, _now(), status='cancelled')
+        await self.update_status_message(JobRun(self, record), 'cancelled')
+        return True
+
+    # ============================= Workers =============================
+    async def _worker(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            _, job_id = await self.queue.get()
+            try:
+                await self._run_job(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # An error outside the handler (database, malformed record) must not stop the worker,
+                # not even when the database is the cause and the error cannot be logged
+                with contextlib.suppress(Exception):
+                    await self.log.error(f'Errore del worker sul job #{job_id}: {e}', 'JOBS')
+
+    async def _run_job(self, job_id: int) -> None:
+        record: dict | None = self.log.db.get_job(job_id)
+        # Cancelled while queued, or queued twice
+        if record is None or record['status'] not in ACTIVE_STATUSES or job_id in self.running:
+            return
+        run: JobRun = JobRun(self, record)
+        task: asyncio.Task = asyncio.create_task(self._execute(run), name=f'job-{job_id}')
+        self.running[job_id] = (run, task)
+        try:
+            # Shielded: cancelling the job must not stop the worker
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not run.cancel_requested:
+                # Shutdown: the job is cancelled by stop(), this worker stops too
+                raise
+        finally:
+            self.running.pop(job_id, None)
+
+    async def _execute(self, run: JobRun) -> None:
+        try:
+            # Inside the try: a job of a removed kind, or a database error, fails the job only
+            handler = HANDLERS.get(run.kind)
+            if handler is None:
+                raise LookupError(f'tipo di job sconosciuto: {run.kind}')
+            self.log.db.update_job(run.job_id, _now(), status='running')
+            await self.update_status_message(run, 'running')
+            with rest_feature(f'job-{run.kind}'):
+                await handler.run(run)
+        except asyncio.CancelledError:
+            if not run.cancel_requested:
+                # Shutdown: left as running, resumed from the checkpoint at the next start
+                raise
+            self.log.db.update_job(run.job_id, _now(), status='cancelled')
+            await self.update_status_message(run, 'cancelled')
+            await self.log.command(f'Job #{run.job_id} ({run.kind}) annullato: {run.progress}', 'jobs', run.kind.upper())
+            return
+        except Exception as e:
+            error_message: str = f'Errore durante il job #{run.job_id} ({run.kind}): {e}'
+            self.log.db.update_job(run.job_id, _now(), status='failed', error=str(e))
+            await self.update_status_message(run, 'failed', str(e))
+            await self.log.error(error_message, 'JOBS')
+            communication_channel = self.bot.get_channel(self.bot.config.communication_channel) if self.bot.config.communication_channel else None
+            if communication_channel:
+                try:
+                    await communication_channel.send(self.log.error_message(command='JOBS', message=error_message))
+                except Exception as comm_error:
+                    await self.log.error(f'Impossibile inviare errore al canale di comunicazione: {comm_error}', 'JOBS')
+            return
+        self.log.db.update_job(run.job_id, _now(), status='done')
+        await self.update_status_message(run, 'done')
+        await self.log.command(f'Job #{run.job_id} ({run.kind}) completato: {run.progress}', 'jobs', run.kind.upper())
+
+    # ============================= Status Message =============================
+    def render(self, run: JobRun, status: str, error: str | None = None) -> str:
+        """
+        Build the text of the status message of a job.
+
+        Args:
+            run (JobRun): The job
+            status (str): Current status
+            error (str | None, optional): Error of a failed job. Defaults to None
+
+        Returns:
+            str: The message content
+        """
+        title: str = HANDLERS[run.kind].title if run.kind in HANDLERS else run.kind
+        lines: list[str] = [f'**Job #{run.job_id}** · {title} — {STATUS_LABELS[status]}']
+        lines += [f'{label}: **{value}**' for label, value in run.progress.items()]
+        if status in ACTIVE_STATUSES:
+            lines.append(f'Annulla con `/admin job-cancel job_id:{run.job_id}`')
+        if error:
+            lines.append(f'Errore: {error[:500]}')
+        return '\n'.join(lines)
+
+    async def update_status_message(self, run: JobRun, status: str, error: str | None = None) -> None:
+        """
+        Edit the status message of a job (no API call for jobs without one).
+
+        Args:
+            run (JobRun): The job
+            status (str): Current status
+            error (str | None, optional): Error of a failed job. Defaults to None
+        """
+        run._last_edit = time.monotonic()
+        channel = self.bot.get_channel(run.channel_id) if run.channel_id else None
+        if channel is None or run.message_id is None:
+            return
+        try:
+            await channel.get_partial_message(run.message_id).edit(content=self.render(run, status, error))
+        except discord.HTTPException:
+            # Deleted status message: the job goes on without it
+            run.message_id = None
@@ -0,0 +1,287 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Awaitable, Callable, NamedTuple
+
+# Third-party library imports
+import discord
+
+# ----------------------------- Custom Libraries -----------------------------
+from utils.members import iter_members
+from utils.purge import PURGEABLE_CHANNELS, delete_messages, purge_channels
+from utils.roles import apply_role_batch, iter_role_targets
+from utils.printing import load_single_embed_text, create_embed_from_dict
+
+if TYPE_CHECKING:
+    from . import JobRun
+
+# Members handled between two checkpoints
+CHECKPOINT_EVERY: int = 50
+
+# ============================= Handler =============================
+class JobHandler(NamedTuple):
+    """A kind of background job: its title, its priority (lower runs first) and its coroutine."""
+    title: str
+    priority: int
+    run: Callable[['JobRun'], Awaitable[None]]
+
+# ============================= Roles =============================
+async def _bulk_role(run: 'JobRun', add: bool) -> None:
+    """
+    Add (or remove) a role to every member that needs the change, skipping the members with an exception role ('cmd-role').
+    The changes are applied in batches of CHECKPOINT_EVERY members, with one log row per batch. With the 'dry_run'
+    parameter the members are only counted.
+    Checkpoint: the ID of the last member of the last batch.
+    """
+    guild: discord.Guild = run.guild
+    role: discord.Role | None = guild.get_role(int(run.params['role_id']))
+    if role is None:
+        raise ValueError(f"Ruolo {run.params['role_id']} non trovato")
+    dry_run: bool = bool(run.params.get('dry_run'))
+    if not dry_run and not role.is_assignable():
+        raise ValueError(f'Il ruolo {role.name} è gestito da un\'integrazione o è sopra il ruolo del bot')
+    except_ids: set[int] = {int(role_id) for role_id in run.bot.config.load_exception('cmd-role')}
+    command: str = 'assign-all' if add else 'remove-all'
+    if dry_run:
+        label: str = 'Membri da modificare (simulazione)'
+    else:
+        label = 'Ruoli assegnati' if add else 'Ruoli rimossi'
+    changed: int = run.progress.get(label, 0)
+    errors: int = run.progress.get('Errori', 0)
+    after: int = run.checkpoint.get('after', 0)
+    batch: list[discord.Member] = []
+
+    async def flush() -> None:
+        nonlocal changed, errors
+        if batch and not dry_run:
+            done, failed = await apply_role_batch(batch, role, add, f'/role {command} (job #{run.job_id})')
+            if done:
+                members: str = ', '.join(f'{member.name} ({member.id})' for member in done)
+                await run.bot.log.command(f"Ruolo {role.name} ({role.id}) {'assegnato a' if add else 'rimosso da'} {len(done)} membri: {members}", 'role', command)
+            if failed:
+                members = ', '.join(f'{member.name} ({member.id}): {error}' for member, error in failed)
+                action: str = "l'assegnazione" if add else 'la rimozione'
+                await run.bot.log.error(f'Errore durante {action} del ruolo {role.name} ({role.id}) a {len(failed)} membri: {members}', f'COMMAND - ROLE - {command.upper()}')
+            changed += len(done)
+            errors += len(failed)
+        else:
+            changed += len(batch)
+        batch.clear()
+        await run.save({'after': after}, **{label: changed, 'Errori': errors})
+
+    async for member in iter_role_targets(guild, role, add, except_ids, after):
+        batch.append(member)
+        if len(batch) == CHECKPOINT_EVERY:
+            after = member.id
+            await flush()
+    if batch:
+        after = batch[-1].id
+    await flush()
+
+async def assign_all(run: 'JobRun') -> None:
+    await _bulk_role(run, add=True)
+
+async def remove_all(run: 'JobRun') -> None:
+    await _bulk_role(run, add=False)
+
+# ============================= Welcome =============================
+async def update_welcome_db(run: 'JobRun') -> None:
+    """
+    Add every member not yet welcomed to the welcome table, without sending messages.
+    Checkpoint: the ID of the last member handled.
+    """
+    tracker = run.bot.welcome_tracker
+    tracker.load()
+    checked: int = run.progress.get('Membri controllati', 0)
+    added: int = run.progress.get('Utenti aggiunti', 0)
+    after: int = run.checkpoint.get('after', 0)
+    records: list[tuple[str, str, str]] = []
+
+    async def flush() -> None:
+        nonlocal added
+        run.bot.log.db.insert_welcome_many(records)
+        tracker.mark_welcomed([int(record[1]) for record in records])
+        added += len(records)
+        records.clear()
+        await run.save({'after': after}, **{'Membri controllati': checked, 'Utenti aggiunti': added})
+
+    timestamp: str = datetime.now(timezone.utc).isoformat()
+    async for member in iter_members(run.guild, after=after):
+        after = member.id
+        checked += 1
+        if not member.bot and member.id not in tracker.welcomed:
+            records.append((timestamp, str(member.id), str(member)))
+        if checked % (CHECKPOINT_EVERY * 10) == 0:
+            await flush()
+    await flush()
+
+async def dm_welcome(run: 'JobRun') -> None:
+    """
+    Send the welcome DM to every member with the 'not_verified' role.
+    Checkpoint: the ID of the last member handled, saved after every DM so none is sent twice.
+    """
+    guild: discord.Guild = run.guild
+    role_id = run.bot.config.load_admin('roles', 'not_verified')
+    role: discord.Role | None = guild.get_role(int(role_id)) if role_id and str(role_id).isdigit() else None
+    if role is None:
+        raise ValueError('Ruolo "not_verified" non configurato')
+    message: discord.Embed = create_embed_from_dict(await load_single_embed_text(guild, 'welcome-user', run.bot.config))
+    checked: int = run.progress.get('Membri controllati', 0)
+    sent: int = run.progress.get('DM inviati', 0)
+    failed: int = run.progress.get('DM non consegnati', 0)
+    after: int = run.checkpoint.get('after', 0)
+
+    async for member in iter_members(guild, after=after):
+        after = member.id
+        checked += 1
+        if role in member.roles:
+            try:
+                await member.send(embed=message)
+                sent += 1
+                await run.bot.log.command(f'DM di benvenuto inviato a {member.name} ({member.id})', 'admin', 'DM-WELCOME-BULK')
+            except discord.HTTPException as e:
+                failed += 1
+                reason: str = "L'utente ha disabilitato i messaggi privati." if isinstance(e, discord.Forbidden) else str(e)
+                await run.bot.log.error(f"Errore durante l'invio del DM di benvenuto. \nUtente: {member.name} ({member.id}) \n{reason}", 'COMMAND - ADMIN - DM-WELCOME-BULK')
+        elif checked % CHECKPOINT_EVERY:
+            # No DM sent: checkpoint only every CHECKPOINT_EVERY members
+            continue
+        await run.save({'after': after}, **{'Membri controllati': checked, 'DM inviati': sent, 'DM non consegnati': failed})
+    await run.save({'after': after}, **{'Membri controllati': checked, 'DM inviati': sent, 'DM non consegnati': failed})
+
+# ============================= Messages =============================
+async def _resolve_channel(guild: discord.Guild, channel_id: int) -> discord.abc.GuildChannel | discord.Thread | None:
+    """Get a channel or thread from the cache, fetching it if it is not cached (archived threads). None if it no longer exists."""
+    channel = guild.get_channel_or_thread(channel_id)
+    if channel is None:
+        try:
+            channel = await guild.fetch_channel(channel_id)
+        except discord.HTTPException:
+            return None
+    return channel
+
+async def _server_channels(guild: discord.Guild) -> list[discord.abc.Messageable]:
+    """
+    Get every purgeable channel and thread of a guild, the archived threads (forum posts included) too.
+
+    The cache holds the active threads only, so the archived ones are listed from their parent
+    channel. The private archived threads are listed only where the bot can manage threads.
+    """
+    channels: list[discord.abc.Messageable] = [channel for channel in [*guild.channels, *guild.threads] if isinstance(channel, PURGEABLE_CHANNELS)]
+    seen: set[int] = {channel.id for channel in channels}
+    for parent in guild.channels:
+        if not isinstance(parent, (discord.TextChannel, discord.ForumChannel)):
+            continue
+        permissions: discord.Permissions = parent.permissions_for(guild.me)
+        if not permissions.read_message_history:
+            continue
+        listings = [parent.archived_threads(limit=None)]
+        if isinstance(parent, discord.TextChannel) and permissions.manage_threads:
+            listings.append(parent.archived_threads(private=True, limit=None))
+        try:
+            for listing in listings:
+                async for thread in listing:
+                    if thread.id not in seen:
+                        seen.add(thread.id)
+                        channels.append(thread)
+        except discord.HTTPException:
+            # Listing not allowed: the archived threads of this channel are skipped
+            continue
+    return channels
+
+async def _delete_logged_messages(run: 'JobRun', user_id: int, channels: list[discord.abc.Messageable]) -> tuple[dict[str, int | None], int]:
+    """
+    Delete the messages of a user found in the message log, by ID and in bulk per channel.
+
+    The log is complete only for the logged channels and only since its coverage start
+    (see MessageEvents.log_coverage_start), so the history of these channels is left to
+    scan from that point backwards, and the other channels are scanned entirely. Messages
+    of bots are never logged, so for a bot every channel is scanned entirely.
+
+    Returns:
+        tuple[dict[str, int | None], int]: History cursor of each channel (None for a full scan), messages deleted
+    """
+    cursors: dict[str, int | None] = {str(channel.id): None for channel in channels}
+    message_events = run.bot.get_cog('MessageEvents')
+    member: discord.Member | None = run.guild.get_member(user_id)
+    is_bot: bool = bool(run.params.get('is_bot')) or (member is not None and member.bot)
+    if not run.params.get('use_log') or is_bot or message_events is None:
+        return cursors, 0
+    # Threads are logged under their parent channel
+    covered: list[discord.abc.Messageable] = [channel for channel in channels if message_events.is_logged_channel(channel.parent_id if isinstance(channel, discord.Thread) else channel.id)]
+    coverage_start: datetime | None = message_events.log_coverage_start()
+    if coverage_start is None or not covered:
+        return cursors, 0
+    start_id: int = discord.utils.time_snowflake(coverage_start)
+
+    by_channel: dict[int, list[discord.Object]] = {}
+    for channel_id, thread_id, message_id in run.bot.log.db.get_user_message_ids(str(user_id), start_id):
+        by_channel.setdefault(int(thread_id or channel_id), []).append(discord.Object(id=int(message_id)))
+    deleted: int = 0
+    for channel_id, messages in by_channel.items():
+        channel = await _resolve_channel(run.guild, channel_id)
+        if isinstance(channel, PURGEABLE_CHANNELS):
+            deleted += await delete_messages(channel, messages)
+    for channel in covered:
+        cursors[str(channel.id)] = start_id
+    return cursors, deleted
+
+async def clear_server_user(run: 'JobRun') -> None:
+    """
+    Delete the messages of a user in every channel and thread of the server (archived threads included),
+    PURGE_CONCURRENCY channels at a time. With the 'use_log' parameter, the messages in the message log are
+    deleted first and only the history not covered by the log is scanned. A channel that fails is logged and
+    left in the checkpoint at its last page, the others go on.
+    Checkpoint: the channels still to finish, each with the oldest message read in it.
+    """
+    guild: discord.Guild = run.guild
+    user_id: int = int(run.params['user_id'])
+    pending: dict[str, int | None] | None = run.checkpoint.get('pending')
+    if pending is None:
+        # Fixed at the first run, so a resumed job visits the same channels
+        pending, from_log = await _delete_logged_messages(run, user_id, await _server_channels(guild))
+        await run.save({'pending': pending, 'total': len(pending)}, **{'Messaggi cancellati': from_log, 'Trovati nel log': from_log})
+    total: int = run.checkpoint.get('total', len(pending))
+    deleted: int = run.progress.get('Messaggi cancellati', 0)
+    read: int = run.progress.get('Messaggi letti', 0)
+    failed: int = run.progress.get('Canali con errori', 0)
+
+    channels: list[discord.abc.Messageable] = []
+    for channel_id in list(pending):
+        channel = await _resolve_channel(guild, int(channel_id))
+        permissions: discord.Permissions | None = channel.permissions_for(guild.me) if channel is not None else None
+        if permissions is not None and permissions.manage_messages and permissions.read_message_history:
+            channels.append(channel)
+        else:
+            # Deleted channel or missing permissions: nothing to purge
+            del pending[channel_id]
+
+    async def on_page(channel_id: int, before: int | None, page_read: int, page_deleted: int) -> None:
+        nonlocal deleted, read
+        deleted += page_deleted
+        read += page_read
+        if before is None:
+            pending.pop(str(channel_id), None)
+        else:
+            pending[str(channel_id)] = before
+        await run.save({'pending': pending, 'total': total}, **{'Messaggi cancellati': deleted, 'Messaggi letti': read, 'Canali controllati': f'{total - len(pending)}/{total}'})
+
+    async def on_error(channel_id: int, error: Exception) -> None:
+        nonlocal failed
+        failed += 1
+        channel = guild.get_channel_or_thread(channel_id)
+        name: str = channel.name if channel is not None else str(channel_id)
+        await run.bot.log.error(f'Errore durante la pulizia del canale {name} ({channel_id}) nel job #{run.job_id}: {error}', 'COMMAND - ADMIN - CLEAR-SERVER-USER')
+        await run.save({'pending': pending, 'total': total}, **{'Canali con errori': failed})
+
+    await purge_channels(channels, lambda message: message.author.id == user_id, {int(channel_id): before for channel_id, before in pending.items()}, on_page, on_error)
+    await run.save({'pending': pending, 'total': total}, **{'Messaggi cancellati': deleted, 'Messaggi letti': read, 'Canali controllati': f'{total - len(pending)}/{total}', 'Canali con errori': failed})
+
+# ============================= Handlers =============================
+HANDLERS: dict[str, JobHandler] = {
+    'update-welcome-db': JobHandler('Aggiornamento tabella welcome', 1, update_welcome_db),
+    'assign-all': JobHandler('Assegnazione ruolo a tutti', 2, assign_all),
+    'remove-all': JobHandler('Rimozione ruolo da tutti', 2, remove_all),
+    'clear-server-user': JobHandler('Pulizia messaggi utente nel server', 3, clear_server_user),
+    'dm-welcome': JobHandler('DM di benvenuto ai non verificati', 4, dm_welcome)
+}
@@ -0,0 +1,168 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import json
+from os import getenv
+
+# Third-party library imports
+from aiohttp import web
+from discord.ext import commands
+
+# ----------------------------- Custom Libraries -----------------------------
+from logger import Logger, RECENT_COLUMNS
+from cogs.diagnostics.health import build_health_report
+from utils import metrics
+
+# ============================= Local Server class =============================
+class LocalServer():
+    """
+    Small HTTP server bound to the local machine.
+
+    Exposes diagnostic endpoints (health and readiness probes, live tail of the
+    log records) built from in-memory state, without touching the database. The server is started only if the
+    LOCAL_SERVER_PORT environment variable is set.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the LocalServer and register its routes.
+
+        Args:
+            bot (commands.Bot): Discord bot instance (its logger provides the in-memory records)
+        """
+        self.bot: commands.Bot = bot
+        self.log: Logger = bot.log
+        self.host: str = getenv('LOCAL_SERVER_HOST') or '127.0.0.1'
+        port: str = getenv('LOCAL_SERVER_PORT') or ''
+        self.port: int | None = int(port) if port.isdigit() else None
+        self.app: web.Application = web.Application()
+        self.app.router.add_get('/health', self.health)
+        self.app.router.add_get('/ready', self.ready)
+        self.app.router.add_get('/metrics', self.metrics)
+        self.app.router.add_get('/logs/recent', self.recent_logs)
+        self.app.router.add_get('/logs/stream', self.stream_logs)
+        self._runner: web.AppRunner | None = None
+        # Handlers of the open /logs/stream connections, ended by stop()
+        self._streams: set[asyncio.Task] = set()
+
+    # >>==============<< Enabled >>==============<<
+    @property
+    def enabled(self) -> bool:
+        """Whether the server has been configured to run."""
+        return self.port is not None
+
+    # >>==============<< Start >>==============<<
+    async def start(self) -> None:
+        """
+        Start listening on LOCAL_SERVER_HOST:LOCAL_SERVER_PORT if configured.
+        """
+        if not self.enabled or self._runner is not None:
+            return
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        await self.log.event(f'Server locale avviato su {self.host}:{self.port}', 'setup')
+
+    # >>==============<< Stop >>==============<<
+    async def stop(self) -> None:
+        """
+        Stop the server and close all the open connections.
+        """
+        if self._runner is not None:
+            # The log streams never end by themselves: without this, cleanup waits for them
+            for task in self._streams:
+                task.cancel()
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ============================= Health Routes =============================
+    # >>==============<< Health >>==============<<
+    async def health(self, request: web.Request) -> web.Response:
+        """
+        Return the health report of the bot as JSON.
+
+        Answers 200 when the bot is healthy and 503 when it is degraded.
+        """
+        report: dict = build_health_report(self.bot)
+        return web.json_response(report, status=200 if report['status'] == 'ok' else 503)
+
+    # >>==============<< Ready >>==============<<
+    async def ready(self, request: web.Request) -> web.Response:
+        """
+        Answer 200 once the bot is connected to the gateway, 503 otherwise.
+        """
+        is_ready: bool = self.bot.is_ready() and not self.bot.is_closed()
+        return web.json_response({'ready': is_ready}, status=200 if is_ready else 503)
+
+    # >>==============<< Metrics >>==============<<
+    async def metrics(self, request: web.Request) -> web.Response:
+        """
+        Return the counters and timings of the metrics registry as JSON.
+
+        The optional 'prefix' query parameter filters them by name.
+        """
+        prefix: str = request.query.get('prefix', '')
+        return web.json_response({
+            'counters': metrics.get_counters(prefix),
+            'timings': metrics.get_timings(prefix)
+        })
+
+    # ============================= Log Routes =============================
+    # >>==============<< Recent Logs >>==============<<
+    async def recent_logs(self, request: web.Request) -> web.Response:
+        """
+        Return the records kept in memory for a table as JSON.
+
+        Query parameters: table (default 'events'), filter, offset, limit.
+        """
+        table: str = request.query.get('table', 'events')
+        if table not in RECENT_COLUMNS:
+            return web.json_response({'error': f'Unknown table: {table}'}, status=400)
+        offset: str = request.query.get('offset', '0')
+        limit: str = request.query.get('limit', '50')
+        records: list[dict] = self.log.get_recent(
+            table,
+            text_filter=request.query.get('filter', ''),
+            offset=int(offset) if offset.isdigit() else 0,
+            limit=int(limit) if limit.isdigit() else 50
+        )
+        return web.json_response(records)
+
+    # >>==============<< Stream Logs >>==============<<
+    async def stream_logs(self, request: web.Request) -> web.StreamResponse:
+        """
+        Stream every new log record as Server-Sent Events.
+
+        The optional 'table' query parameter restricts the stream to one table.
+        """
+        table_filter: str = request.query.get('table', '')
+        if table_filter and table_filter not in RECENT_COLUMNS:
+            return web.json_response({'error': f'Unknown table: {table_filter}'}, status=400)
+        response = web.StreamResponse(headers={
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache'
+        })
+        await response.prepare(request)
+        queue: asyncio.Queue = self.log.subscribe()
+        task: asyncio.Task = asyncio.current_task()
+        self._streams.add(task)
+        try:
+            while True:
+                try:
+                    table, record = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep the connection alive through proxies
+                    await response.write(b': keep-alive\n\n')
+                    continue
+                if table_filter and table != table_filter:
+                    continue
+                data: str = json.dumps(dict(zip(RECENT_COLUMNS[table], record)), ensure_ascii=False)
+                await response.write(f'event: {table}\ndata: {data}\n\n'.encode('utf-8'))
+        except ConnectionResetError:
+            # Client gone
+            pass
+        finally:
+            self._streams.discard(task)
+            self.log.unsubscribe(queue)
+        return response
@@ -1,12 +1,24 @@
 
 # ----------------------------- Standard libraries -----------------------------
 # Standard library imports
+import asyncio
 from os import getenv, path, mkdir
 
 # ----------------------------- Custom libraries -----------------------------
 from utils.file_io import write_file, read_file
 from utils.printing import format_datetime_now
+from utils.text_delta import make_delta, apply_delta
 from database import DB
+from .ring_buffer import RingBuffer
+
+# Columns of the records kept in memory for each logged table
+RECENT_COLUMNS: dict[str, tuple[str, ...]] = {
+    'events': ('timestamp', 'type', 'message'),
+    'commands': ('timestamp', 'type', 'command', 'message'),
+    'messages': ('timestamp', 'channel_id', 'channel_name', 'user_id', 'user_name', 'message'),
+    'errors': ('timestamp', 'type', 'message'),
+    'verification': ('timestamp', 'status', 'user_id', 'message')
+}
 
 # ============================= Logger class =============================
 class Logger():
@@ -21,9 +33,89 @@ class Logger():
         """
         Initialize the Logger with a database connection.
         
-        Creates a new database instance for storing log records.
+        Creates a new database instance for storing log records and the
+        in-memory ring buffers holding the most recent records of each table.
         """
         self.db: DB = DB()
+        # Size of the in-memory buffers (RECENT_LOG_SIZE records per table)
+        recent_size: str = getenv('RECENT_LOG_SIZE') or '200'
+        self.recent: dict[str, RingBuffer] = {
+            table: RingBuffer(int(recent_size) if recent_size.isdigit() else 200) for table in RECENT_COLUMNS
+        }
+        # Queues of the live tail subscribers
+        self._subscribers: set[asyncio.Queue] = set()
+    
+    # ============================= Recent Records =============================
+    # >>==============<< Remember Record >>==============<< 
+    def _remember(self, table: str, record: tuple) -> None:
+        """
+        Store a record in the in-memory buffer and push it to the live tail subscribers.
+        
+        Args:
+            table (str): Name of the table the record belongs to
+            record (tuple): Record values, ordered as in RECENT_COLUMNS
+        """
+        self.recent[table].append(record)
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((table, record))
+            except asyncio.QueueFull:
+                # Slow subscribers lose records instead of slowing down logging
+                pass
+    
+    # >>==============<< Get Recent Records >>==============<< 
+    def get_recent(self, table: str, text_filter: str = '', offset: int = 0, limit: int = 10) -> list[dict]:
+        """
+        Get the most recent records of a table from memory, newest first.
+        
+        Args:
+            table (str): Name of the table ('events', 'commands', 'messages', 'errors', 'verification')
+            text_filter (str, optional): Case-insensitive text that must appear in one of the values. Defaults to ''
+            offset (int, optional): Number of matching records to skip. Defaults to 0
+            limit (int, optional): Maximum number of records to return. Defaults to 10
+            
+        Returns:
+            list[dict]: List of records as dictionaries keyed by column name
+        """
+        columns: tuple[str, ...] = RECENT_COLUMNS[table]
+        needle: str = text_filter.lower()
+        output: list[dict] = []
+        skipped: int = 0
+        for record in self.recent[table].newest_first():
+            if needle and not any(needle in str(value).lower() for value in record):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            output.append(dict(zip(columns, record)))
+            if len(output) >= limit:
+                break
+        return output
+    
+    # >>==============<< Subscribe >>==============<< 
+    def subscribe(self, max_size: int = 100) -> asyncio.Queue:
+        """
+        Register a live tail subscriber.
+        
+        Args:
+            max_size (int, optional): Maximum number of records queued for the subscriber. Defaults to 100
+            
+        Returns:
+            asyncio.Queue: Queue receiving (table, record) tuples for every new record
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self._subscribers.add(queue)
+        return queue
+    
+    # >>==============<< Unsubscribe >>==============<< 
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """
+        Remove a live tail subscriber.
+        
+        Args:
+            queue (asyncio.Queue): Queue returned by subscribe()
+        """
+        self._subscribers.discard(queue)
     
     # >>==============<< New Event Record >>==============<< 
     async def event(self, log_message: str, record_type: str) -> None:
@@ -42,6 +134,7 @@ class Logger():
             - tiktok
             - chat-clear
             - role-assign-auto
+            - anti-flood
         """
         # Load formatted datetime now
         now: str = format_datetime_now()
@@ -52,6 +145,23 @@ class Logger():
             record_type=record_type, 
             message=log_message
         )
+        self._remember('events', (now, record_type, log_message))
+        
+    # >>==============<< New Event Records (Batch) >>==============<< 
+    async def events(self, entries: list[tuple[str, str]]) -> None:
+        """
+        Add several events to the log with a single database write.
+        
+        Args:
+            entries (list[tuple[str, str]]): (log_message, record_type) pairs, see event()
+        """
+        # Load formatted datetime now
+        now: str = format_datetime_now()
+        
+        records: list[tuple[str, str, str]] = [(now, record_type, log_message) for log_message, record_type in entries]
+        self.db.insert_events_many(records)
+        for record in records:
+            self._remember('events', record)
         
     # >>==============<< New Command Record >>==============<< 
     async def command(self, log_message: str, record_type: str, command: str) -> None:
@@ -73,9 +183,10 @@ class Logger():
             command=command, 
             message=log_message
         )
+        self._remember('commands', (now, record_type, command, log_message))
     
     # >>==============<< New Message Record >>==============<< 
-    async def message(self, log_message: str, channel_id: str, channel_name: str, user_id: str, user_name: str) -> None:
+    async def message(self, log_message: str, channel_id: str, channel_name: str, user_id: str, user_name: str, message_id: str | None = None, media: list[dict] | None = None, thread_id: str | None = None) -> None:
         """
         Log a Discord message to the database.
         
@@ -85,6 +196,9 @@ class Logger():
             channel_name (str): Name of the Discord channel
             user_id (str): Discord user ID who sent the message
             user_name (str): Username who sent the message
+            message_id (str | None, optional): Discord message ID, needed to track edits and deletions. Defaults to None
+            media (list[dict] | None, optional): Attachment, sticker and embed metadata (see utils.media). Defaults to None
+            thread_id (str | None, optional): Thread or forum post ID, when channel_id is its parent. Defaults to None
         """
         # Load formatted datetime now
         now: str = format_datetime_now()
@@ -96,8 +210,115 @@ class Logger():
             channel_name=channel_name,
             user_id=user_id,
             user_name=user_name,
-            message=log_message
+            message=log_message,
+            message_id=message_id,
+            thread_id=thread_id
         )
+        if media and message_id:
+            self.db.insert_message_media(message_id, media)
+        self._remember('messages', (now, channel_id, channel_name, user_id, user_name, log_message))
+    
+    # >>==============<< Message Edit Record >>==============<< 
+    async def message_edit(self, message_id: str, channel_id: str, new_content: str) -> bool:
+        """
+        Log the edit of a logged message as a delta against its previous version.
+        
+        Args:
+            message_id (str): Discord message ID
+            channel_id (str): Discord channel ID of the message
+            new_content (str): Content after the edit
+            
+        Returns:
+            bool: False if the message was not logged or its content did not change
+        """
+        versions: list[tuple[str, str]] = self.message_history(message_id)
+        if not versions or versions[-1][1] is None:
+            return False
+        previous: str = versions[-1][1]
+        if previous == new_content:
+            return False
+        self.db.insert_message_change(format_datetime_now(), message_id, channel_id, 'edit', make_delta(previous, new_content))
+        return True
+    
+    # >>==============<< Message Delete Records >>==============<< 
+    async def message_delete(self, message_ids: list[str]) -> int:
+        """
+        Log the deletion of messages as tombstones (only for logged messages).
+        
+        Args:
+            message_ids (list[str]): Discord message IDs
+            
+        Returns:
+            int: Number of logged messages marked as deleted
+        """
+        return self.db.insert_message_tombstones(format_datetime_now(), message_ids)
+    
+    # >>==============<< Message Media Records >>==============<< 
+    async def message_media(self, message_id: str, media: list[dict]) -> None:
+        """
+        Add media to an already logged message (e.g. link embeds resolved after sending).
+        
+        Args:
+            message_id (str): Discord message ID
+            media (list[dict]): Attachment, sticker and embed metadata (see utils.media)
+        """
+        self.db.insert_message_media(message_id, media)
+    
+    # >>==============<< Message History >>==============<< 
+    def message_history(self, message_id: str) -> list[tuple[str, str | None]]:
+        """
+        Rebuild every logged version of a message.
+        
+        Args:
+            message_id (str): Discord message ID
+            
+        Returns:
+            list[tuple[str, str | None]]: (timestamp, content) for each version, oldest first;
+            a deletion is reported with None content. Empty if the message was not logged
+        """
+        original, changes = self.db.get_message_history(message_id)
+        if original is None:
+            return []
+        content: str = original[5]
+        versions: list[tuple[str, str | None]] = [(original[0], content)]
+        for timestamp, kind, delta in changes:
+            if kind == 'delete':
+                versions.append((timestamp, None))
+                continue
+            content = apply_delta(content, delta)
+            versions.append((timestamp, content))
+        return versions
+    
+    # >>==============<< Message Storage >>==============<< 
+    async def train_message_dictionary(self) -> int | None:
+        """
+        Train a new compression dictionary on the recent messages (see DB.train_message_dictionary).
+        
+        Returns:
+            int | None: The dictionary ID, or None if there was nothing to learn
+        """
+        return self.db.train_message_dictionary(format_datetime_now())
+    
+    async def compact_messages(self, batch_size: int = 500) -> int:
+        """
+        Move every message stored in plain form to the compact storage.
+        
+        Works in batches and yields to the event loop between them, so the bot
+        keeps running during the conversion.
+        
+        Args:
+            batch_size (int, optional): Messages converted per transaction. Defaults to 500
+            
+        Returns:
+            int: Number of converted messages
+        """
+        total: int = 0
+        while True:
+            converted: int = self.db.compact_messages(batch_size)
+            total += converted
+            if converted < batch_size:
+                return total
+            await asyncio.sleep(0)
     
     # >>==============<< New Error Record >>==============<< 
     async def error(self, log_message: str, record_type: str) -> None:
@@ -117,6 +338,7 @@ class Logger():
             record_type=record_type,
             message=log_message
         )
+        self._remember('errors', (now, record_type, log_message))
 
     # >>==============<< New Verification Record >>==============<< 
     async def verification(self, log_message: str, status: str, user_id: str) -> None:
@@ -133,6 +355,23 @@ class Logger():
 
         # Insert new record to db
         self.db.insert_verification(timestamp=now, status=status, user_id=user_id, message=log_message)
+        self._remember('verification', (now, status, user_id, log_message))
+        
+    # >>==============<< New Verification Records (Batch) >>==============<< 
+    async def verifications(self, entries: list[tuple[str, str, str]]) -> None:
+        """
+        Log several verification records with a single database write.
+        
+        Args:
+            entries (list[tuple[str, str, str]]): (log_message, status, user_id) tuples, see verification()
+        """
+        # Load formatted datetime now
+        now: str = format_datetime_now()
+        
+        records: list[tuple[str, str, str, str]] = [(now, status, user_id, log_message) for log_message, status, user_id in entries]
+        self.db.insert_verification_many(records)
+        for record in records:
+            self._remember('verification', record)
         
     # >>==============<< Error Message >>==============<<
     def error_message(self, command: str, message: str) -> str:
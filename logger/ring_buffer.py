@@ -0,0 +1,62 @@
+# ----------------------------- Standard libraries -----------------------------
+from typing import Any, Iterator
+
+# ============================= Ring Buffer class =============================
+class RingBuffer():
+    """
+    Fixed-size circular buffer holding the most recent records.
+
+    The storage is preallocated once, so appending never allocates a new list
+    and the oldest record is overwritten when the buffer is full.
+    """
+
+    __slots__ = ('capacity', '_items', '_next', '_size')
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Initialize the buffer with the given capacity.
+
+        Args:
+            capacity (int): Maximum number of records kept in memory
+        """
+        self.capacity: int = max(1, capacity)
+        self._items: list[Any] = [None] * self.capacity
+        self._next: int = 0
+        self._size: int = 0
+
+    # >>==============<< Append >>==============<<
+    def append(self, item: Any) -> None:
+        """
+        Store a record, overwriting the oldest one if the buffer is full.
+
+        Args:
+            item (Any): The record to store
+        """
+        self._items[self._next] = item
+        self._next = (self._next + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    # >>==============<< Newest First >>==============<<
+    def newest_first(self) -> Iterator[Any]:
+        """
+        Iterate over the stored records from the newest to the oldest.
+
+        Returns:
+            Iterator[Any]: Iterator over the stored records
+        """
+        for offset in range(1, self._size + 1):
+            yield self._items[(self._next - offset) % self.capacity]
+
+    # >>==============<< Clear >>==============<<
+    def clear(self) -> None:
+        """
+        Remove all the records without releasing the preallocated storage.
+        """
+        for index in range(self.capacity):
+            self._items[index] = None
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
@@ -33,7 +33,16 @@ intents = discord.Intents(
     auto_moderation_configuration=False,
     auto_moderation_execution=False
 )
-bot = WishBot(command_prefix=str(getenv('COMMAND_PREFIX')), intents=intents)
+# Low memory mode: members are not cached nor chunked, features needing them fetch them on demand
+if getenv('LOW_MEMORY_MODE') == '1':
+    bot = WishBot(
+        command_prefix=str(getenv('COMMAND_PREFIX')),
+        intents=intents,
+        member_cache_flags=discord.MemberCacheFlags.none(),
+        chunk_guilds_at_startup=False
+    )
+else:
+    bot = WishBot(command_prefix=str(getenv('COMMAND_PREFIX')), intents=intents)
 
 # ============================= MAIN AND START =============================
 # >>==============<< MAIN >>==============<< 
@@ -0,0 +1,246 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from os import getenv
+from typing import Any, Awaitable, Callable
+
+# Third-party library imports
+import pytz
+from discord.ext import commands
+
+# ----------------------------- Custom Libraries -----------------------------
+from logger import Logger
+from utils import metrics
+from cogs.diagnostics.rest_stats import rest_feature
+from .cron import CronExpression
+
+# Timezone of the cron expressions
+ROME_TZ = pytz.timezone('Europe/Rome')
+
+# ============================= Job class =============================
+class Job():
+    """
+    A coroutine function run by the Scheduler according to a cron expression.
+
+    The expression can be overridden with the SCHEDULE_<NAME> environment
+    variable (e.g. SCHEDULE_WEEKLY_REPORT='0 9 * * 1').
+    """
+
+    def __init__(self, name: str, cron: str, func: Callable[..., Awaitable[Any]], jitter: float = 0, catch_up: bool = False) -> None:
+        """
+        Initialize the Job.
+
+        Args:
+            name (str): Unique name, also used for the metrics and the REST stats feature
+            cron (str): Default cron expression, evaluated in Europe/Rome
+            func (Callable[..., Awaitable[Any]]): Coroutine function to run
+            jitter (float, optional): Maximum random delay in seconds added to each run. Defaults to 0
+            catch_up (bool, optional): Run once at startup if a run was missed while the bot was offline. Defaults to False
+        """
+        self.name: str = name
+        self.cron: CronExpression = CronExpression(getenv(f"SCHEDULE_{name.upper().replace('-', '_')}") or cron)
+        self.func: Callable[..., Awaitable[Any]] = func
+        self.jitter: float = jitter
+        self.catch_up: bool = catch_up
+        # Runtime state
+        self.next_run: datetime | None = None
+        self.last_run: datetime | None = None
+        self.last_duration: float | None = None
+        self.last_error: str | None = None
+        self.runs: int = 0
+        self.failures: int = 0
+        self.skipped: int = 0
+        self.task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    # ============================= Next Run =============================
+    def schedule_next(self, after: datetime) -> None:
+        """
+        Compute the next run after a moment, adding the random jitter.
+
+        Args:
+            after (datetime): Timezone-aware reference time
+        """
+        next_run: datetime = self.cron.next_after(after, ROME_TZ)
+        if self.jitter:
+            next_run += timedelta(seconds=random.uniform(0, self.jitter))
+        self.next_run = next_run
+
+# ============================= Scheduler class =============================
+class Scheduler():
+    """
+    Runs every periodic task of the bot from a single loop.
+
+    The loop sleeps until the earliest job is due. A job still running when it
+    is due again is skipped (no overlapping runs). The last run of each job is
+    saved in the database, so jobs with catch_up run once at startup when
+    their scheduled time passed while the bot was offline. Run times and
+    failures are recorded in the metrics registry as 'scheduler.<name>'.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        """
+        Initialize the Scheduler.
+
+        Args:
+            bot (commands.Bot): Discord bot instance (its logger provides the database)
+        """
+        self.bot: commands.Bot = bot
+        self.log: Logger = bot.log
+        self.jobs: dict[str, Job] = {}
+        self._wakeup: asyncio.Event = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._last_runs: dict[str, datetime] | None = None
+
+    # ============================= Jobs =============================
+    def add(self, job: Job) -> None:
+        """
+        Register a job (replacing the job with the same name) and plan its next run.
+
+        Args:
+            job (Job): The job
+        """
+        self.remove(job.name)
+        if self._last_runs is None:
+            self._last_runs = {name: datetime.fromisoformat(last_run) for name, last_run in self.log.db.get_scheduler_runs().items()}
+        now: datetime = datetime.now(timezone.utc)
+        job.last_run = self._last_runs.get(job.name)
+        if job.catch_up and job.last_run is not None and job.cron.next_after(job.last_run, ROME_TZ) <= now:
+            # Missed while offline: run once as soon as the loop starts
+            job.next_run = now
+        else:
+            job.schedule_next(now)
+        self.jobs[job.name] = job
+        self._wakeup.set()
+
+    def remove(self, name: str) -> None:
+        """
+        Unregister a job. A run in progress is left to finish.
+
+        Args:
+            name (str): Name of the job
+        """
+        self.jobs.pop(name, None)
+
+    # ============================= Start / Stop =============================
+    def start(self) -> None:
+        """
+        Start the scheduler loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name='scheduler')
+
+    async def stop(self) -> None:
+        """
+        Stop the scheduler loop and cancel the running jobs.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        running: list[asyncio.Task] = [job.task for job in self.jobs.values() if job.running]
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    # ============================= Loop =============================
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now: datetime = datetime.now(timezone.utc)
+            due: list[Job] = [job for job in self.jobs.values() if job.next_run is not None and job.next_run <= now]
+            for job in due:
+                self._start_job(job, scheduled=job.next_run)
+                job.schedule_next(now)
+
+            upcoming: list[datetime] = [job.next_run for job in self.jobs.values() if job.next_run is not None]
+            timeout: float | None = (min(upcoming) - datetime.now(timezone.utc)).total_seconds() if upcoming else None
+            # Woken early when a job is added
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(timeout, 0) if timeout is not None else None)
+            except asyncio.TimeoutError:
+                pass
+
+    def _start_job(self, job: Job, scheduled: datetime, **kwargs: Any) -> bool:
+        if job.running:
+            job.skipped += 1
+            metrics.increment(f'scheduler.{job.name}.skipped')
+            return False
+        job.task = asyncio.create_task(self._execute(job, scheduled, **kwargs), name=f'job-{job.name}')
+        return True
+
+    async def _execute(self, job: Job, scheduled: datetime, **kwargs: Any) -> str:
+        started: float = time.monotonic()
+        status: str = 'ok'
+        try:
+            with rest_feature(job.name):
+                await job.func(**kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = 'error'
+            job.failures += 1
+            job.last_error = str(e)
+            metrics.increment(f'scheduler.{job.name}.failures')
+            await self.log.error(f'Errore durante la task {job.name}: {e}', 'TASK - SCHEDULER')
+        finally:
+            job.last_duration = time.monotonic() - started
+            metrics.observe(f'scheduler.{job.name}', job.last_duration)
+        job.runs += 1
+        job.last_run = scheduled
+        self.log.db.update_scheduler_run(job.name, scheduled.isoformat(), job.last_duration, status)
+        return status
+
+    # ============================= Manual Run =============================
+    async def run_now(self, name: str, **kwargs: Any) -> bool:
+        """
+        Run a job immediately and wait for it, unless it is already running.
+
+        Args:
+            name (str): Name of the job
+            **kwargs: Arguments passed to the job function
+
+        Returns:
+            bool: False if the job was already running
+
+        Raises:
+            KeyError: If the job does not exist
+            RuntimeError: If the job failed (the error is already logged)
+        """
+        job: Job = self.jobs[name]
+        if not self._start_job(job, scheduled=datetime.now(timezone.utc), **kwargs):
+            return False
+        if await job.task == 'error':
+            raise RuntimeError(job.last_error)
+        return True
+
+    # ============================= Status =============================
+    def status(self) -> dict[str, dict[str, Any]]:
+        """
+        Describe every job: expression, next and last run, counters and run time.
+
+        Returns:
+            dict[str, dict[str, Any]]: Job status by name
+        """
+        output: dict[str, dict[str, Any]] = {}
+        for name, job in self.jobs.items():
+            timing: dict[str, float] = metrics.get_timings(f'scheduler.{name}').get(f'scheduler.{name}', {})
+            output[name] = {
+                'cron': str(job.cron),
+                'running': job.running,
+                'next_run': job.next_run.isoformat() if job.next_run else None,
+                'last_run': job.last_run.isoformat() if job.last_run else None,
+                'runs': job.runs,
+                'failures': job.failures,
+                'skipped': job.skipped,
+                'last_duration': round(job.last_duration, 3) if job.last_duration is not None else None,
+                'max_duration': round(timing['max'], 3) if timing else None,
+                'last_error': job.last_error
+            }
+        return output
@@ -0,0 +1,110 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from datetime import datetime, timedelta
+
+# Third-party library imports
+import pytz
+
+# (minimum, maximum) of each field: minute, hour, day of month, month, day of week (0 = Sunday)
+_FIELDS: list[tuple[int, int]] = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# ============================= Cron Expression class =============================
+class CronExpression():
+    """
+    Five-field cron expression ('minute hour day-of-month month day-of-week').
+
+    Each field accepts '*', numbers, ranges ('1-5'), steps ('*/15', '0-30/10')
+    and comma separated lists. As in cron, when both the day of month and the
+    day of week are restricted a day matching either of them is accepted.
+    Sunday is 0 (or 7) in the day-of-week field.
+    """
+
+    def __init__(self, expression: str) -> None:
+        """
+        Parse a cron expression.
+
+        Args:
+            expression (str): The expression, e.g. '0 9 * * 1' (Mondays at 9:00)
+
+        Raises:
+            ValueError: If the expression is not valid
+        """
+        fields: list[str] = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f'Invalid cron expression (5 fields expected): {expression}')
+        self.expression: str = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = [
+            self._parse(field, minimum, maximum) for field, (minimum, maximum) in zip(fields, _FIELDS)
+        ]
+        # 7 is another name for Sunday
+        self.weekdays: set[int] = {day % 7 for day in weekdays}
+        self.any_day: bool = fields[2] == '*'
+        self.any_weekday: bool = fields[4] == '*'
+
+    @staticmethod
+    def _parse(field: str, minimum: int, maximum: int) -> set[int]:
+        values: set[int] = set()
+        for part in field.split(','):
+            step: int = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+            if part == '*':
+                start, end = minimum, maximum
+            elif '-' in part:
+                start, end = (int(value) for value in part.split('-', 1))
+            else:
+                start = int(part)
+                end = maximum if step > 1 else start
+            if start < minimum or end > maximum or start > end or step < 1:
+                raise ValueError(f'Invalid cron field: {field}')
+            values.update(range(start, end + 1, step))
+        return values
+
+    # ============================= Matching =============================
+    def _day_matches(self, day: datetime) -> bool:
+        # isoweekday: Monday = 1 ... Sunday = 7
+        day_ok: bool = day.day in self.days
+        weekday_ok: bool = day.isoweekday() % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    # ============================= Next Run =============================
+    def next_after(self, moment: datetime, timezone: pytz.BaseTzInfo) -> datetime:
+        """
+        Get the first time matching the expression strictly after a moment.
+
+        The expression is evaluated on the wall clock of the timezone, so
+        '0 9 * * 1' stays at 9:00 across daylight saving time changes.
+
+        Args:
+            moment (datetime): Timezone-aware reference time
+            timezone (pytz.BaseTzInfo): Timezone of the expression
+
+        Returns:
+            datetime: The next matching time, aware in the given timezone
+        """
+        # Work on the naive wall clock, one minute after the reference
+        local: datetime = moment.astimezone(timezone).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        # Four years always contain every valid date
+        limit: datetime = local + timedelta(days=366 * 4)
+        while local < limit:
+            if local.month not in self.months:
+                # First day of the next month
+                local = (local.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(local):
+                local = (local + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if local.hour not in self.hours:
+                local = (local + timedelta(hours=1)).replace(minute=0)
+                continue
+            if local.minute not in self.minutes:
+                local += timedelta(minutes=1)
+                continue
+            return timezone.normalize(timezone.localize(local))
+        raise ValueError(f'Cron expression never matches: {self.expression}')
+
+    def __str__(self) -> str:
+        return self.expression
@@ -0,0 +1,100 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import hashlib
+
+# Third-party library imports
+import discord
+
+# ============================= Helpers =============================
+def _strip_query(url: str) -> str:
+    """Remove the query string (e.g. the expiring CDN signature) from a URL."""
+    return url.split('?', 1)[0]
+
+# ============================= Attachment =============================
+def attachment_metadata(attachment: discord.Attachment) -> dict:
+    """
+    Build the metadata record of an attachment.
+
+    Discord does not expose a content hash, so the deduplication key is the
+    CDN URL without its expiring signature parameters.
+
+    Args:
+        attachment (discord.Attachment): The attachment
+
+    Returns:
+        dict: kind, key, url, filename, size, content_type and summary
+    """
+    url: str = _strip_query(attachment.url)
+    return {
+        'kind': 'attachment',
+        'key': url,
+        'url': url,
+        'filename': attachment.filename,
+        'size': attachment.size,
+        'content_type': attachment.content_type or '',
+        'summary': attachment.description or ''
+    }
+
+# ============================= Sticker =============================
+def sticker_metadata(sticker: discord.StickerItem) -> dict:
+    """
+    Build the metadata record of a sticker, keyed by the sticker ID.
+
+    Args:
+        sticker (discord.StickerItem): The sticker
+
+    Returns:
+        dict: kind, key, url, filename, size, content_type and summary
+    """
+    return {
+        'kind': 'sticker',
+        'key': f'sticker:{sticker.id}',
+        'url': sticker.url,
+        'filename': '',
+        'size': 0,
+        'content_type': sticker.format.name,
+        'summary': sticker.name
+    }
+
+# ============================= Embed =============================
+def embed_metadata(embed: discord.Embed) -> dict:
+    """
+    Build the metadata record of an embed.
+
+    The key is the embed URL (or its image/video/thumbnail URL); embeds without
+    any URL are keyed by the SHA-1 of their summary.
+
+    Args:
+        embed (discord.Embed): The embed
+
+    Returns:
+        dict: kind, key, url, filename, size, content_type and summary
+    """
+    url: str = embed.url or embed.image.url or embed.video.url or embed.thumbnail.url or ''
+    summary: str = ' - '.join(part for part in (embed.provider.name, embed.title, embed.description) if part)[:300]
+    key: str = url if url else 'embed:' + hashlib.sha1(summary.encode('utf-8')).hexdigest()
+    return {
+        'kind': 'embed',
+        'key': key,
+        'url': url,
+        'filename': '',
+        'size': 0,
+        'content_type': embed.type or '',
+        'summary': summary
+    }
+
+# ============================= Message Media =============================
+def message_media(message: discord.Message) -> list[dict]:
+    """
+    Collect the metadata of the attachments, stickers and embeds of a message.
+
+    Args:
+        message (discord.Message): The message
+
+    Returns:
+        list[dict]: One metadata record per item, see attachment_metadata
+    """
+    media: list[dict] = [attachment_metadata(attachment) for attachment in message.attachments]
+    media.extend(sticker_metadata(sticker) for sticker in message.stickers)
+    media.extend(embed_metadata(embed) for embed in message.embeds)
+    return media
@@ -0,0 +1,69 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+from os import getenv
+from typing import AsyncIterator
+
+# Third-party library imports
+import discord
+
+# ============================= Low Memory Mode =============================
+def low_memory_mode() -> bool:
+    """
+    Check whether the bot runs without the member cache (LOW_MEMORY_MODE=1).
+
+    Returns:
+        bool: True if members are not cached and must be fetched on demand
+    """
+    return getenv('LOW_MEMORY_MODE') == '1'
+
+# ============================= Iterate Members =============================
+async def iter_members(guild: discord.Guild, after: int | None = None) -> AsyncIterator[discord.Member]:
+    """
+    Iterate over every member of a guild.
+
+    Uses the member cache when it is complete, otherwise streams the members
+    from the API (pages of 1000), so only one page is kept in memory.
+
+    Args:
+        guild (discord.Guild): Discord guild instance
+        after (int | None, optional): Only the members with a greater ID, in ascending ID order,
+            so an interrupted iteration can be resumed. Defaults to None (all, in any order)
+
+    Yields:
+        discord.Member: The members of the guild
+    """
+    if not low_memory_mode() and guild.chunked:
+        # Copy the list: the cache can change while the caller awaits
+        members: list[discord.Member] = list(guild.members)
+        if after is not None:
+            members = sorted((member for member in members if member.id > after), key=lambda member: member.id)
+        for member in members:
+            yield member
+        return
+
+    # The API returns the members in ascending ID order
+    async for member in guild.fetch_members(limit=None, after=discord.Object(id=after) if after else discord.utils.MISSING):
+        yield member
+
+# ============================= Resolve Member =============================
+async def resolve_member(guild: discord.Guild, member_id: int) -> discord.Member | None:
+    """
+    Get a member from the cache or, if it is not cached, from the API.
+
+    Args:
+        guild (discord.Guild): Discord guild instance
+        member_id (int): ID of the member
+
+    Returns:
+        discord.Member | None: The member, or None if they are not in the guild
+
+    Raises:
+        discord.HTTPException: If the member cannot be fetched for another reason (missing access, server error)
+    """
+    member: discord.Member | None = guild.get_member(member_id)
+    if member is not None:
+        return member
+    try:
+        return await guild.fetch_member(member_id)
+    except discord.NotFound:
+        return None
@@ -0,0 +1,71 @@
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Registry ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Process-wide counters and timings, kept in memory only
+_counters: dict[str, int] = {}
+_timings: dict[str, dict[str, float]] = {}
+
+# ============================= Increment =============================
+def increment(name: str, value: int = 1) -> None:
+    """
+    Increment a counter of the metrics registry.
+
+    Args:
+        name (str): Name of the counter (dotted, e.g. 'rest.calls')
+        value (int, optional): Amount to add. Defaults to 1.
+    """
+    _counters[name] = _counters.get(name, 0) + value
+
+# ============================= Observe =============================
+def observe(name: str, seconds: float) -> None:
+    """
+    Record a duration in the metrics registry.
+
+    Args:
+        name (str): Name of the timing (dotted, e.g. 'rest.ratelimit_wait')
+        seconds (float): Duration to record
+    """
+    timing = _timings.get(name)
+    if timing is None:
+        timing = _timings[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0}
+    timing['count'] += 1
+    timing['total'] += seconds
+    timing['last'] = seconds
+    if seconds > timing['max']:
+        timing['max'] = seconds
+
+# ============================= Get Counters =============================
+def get_counters(prefix: str = '') -> dict[str, int]:
+    """
+    Get a copy of the counters whose name starts with prefix.
+
+    Args:
+        prefix (str, optional): Name prefix to filter by. Defaults to '' (all counters).
+
+    Returns:
+        dict[str, int]: Counter values by name
+    """
+    return {name: value for name, value in _counters.items() if name.startswith(prefix)}
+
+# ============================= Get Timings =============================
+def get_timings(prefix: str = '') -> dict[str, dict[str, float]]:
+    """
+    Get a copy of the timings whose name starts with prefix.
+
+    Args:
+        prefix (str, optional): Name prefix to filter by. Defaults to '' (all timings).
+
+    Returns:
+        dict[str, dict[str, float]]: count, total, max and last duration by name
+    """
+    return {name: dict(timing) for name, timing in _timings.items() if name.startswith(prefix)}
+
+# ============================= Reset =============================
+def reset(prefix: str = '') -> None:
+    """
+    Remove the counters and timings whose name starts with prefix.
+
+    Args:
+        prefix (str, optional): Name prefix to filter by. Defaults to '' (everything).
+    """
+    for registry in (_counters, _timings):
+        for name in [name for name in registry if name.startswith(prefix)]:
+            del registry[name]
@@ -2,7 +2,7 @@
 # ----------------------------- Standard library -----------------------------
 # Standard library imports
 from datetime import datetime, timezone
-from os import getenv, path
+from os import getenv, path, stat
 
 # Third-party library imports
 import discord
@@ -11,6 +11,9 @@ from discord import Embed
 # ----------------------------- Custom Libraries -----------------------------
 from .file_io import read_file
 
+# Content of embed_text.json, re-read only when the file modification time changes
+_embed_text_cache: dict = {'mtime': None, 'text': {}}
+
 italian_month: list[str] = ["", "gennaio", "febbraio", "marzo", "aprile", "maggio", "giugno", "luglio", "agosto", "settembre", "ottobre", "novembre", "dicembre"]
 
 # ============================= Safe Send Message =============================
@@ -90,6 +93,24 @@ def format_datetime_extended(time: str) -> str:
     local_datetime = converted_datetime.astimezone()
     return local_datetime.strftime(f"%H:%M %d {italian_month[local_datetime.month]} %Y")
 
+# ============================= Embed text file =============================
+def read_embed_text() -> dict:
+    """
+    Read the embed_text.json file, using the cached content while the file is unchanged.
+    
+    Returns:
+        dict: Content of the file, or empty dict if it cannot be read
+    """
+    embed_text_path: str = path.join(str(getenv('DATA_PATH')), str(getenv('EMBED_TEXT_FILE_NAME')))
+    try:
+        mtime: float | None = stat(embed_text_path).st_mtime
+    except OSError:
+        mtime = None
+    if mtime is None or mtime != _embed_text_cache['mtime']:
+        _embed_text_cache['text'] = read_file(embed_text_path)
+        _embed_text_cache['mtime'] = mtime if _embed_text_cache['text'] else None
+    return _embed_text_cache['text']
+
 # ============================= Embed data load =============================
 async def load_embed_text(guild: discord.Guild, item: str, config) -> list[dict]:
     """
@@ -106,9 +127,8 @@ async def load_embed_text(guild: discord.Guild, item: str, config) -> list[dict]
     # Load communication channel
     communication_channel = guild.get_channel(config.communication_channel)
     
-    # Load embed text file
-    embed_text_path: str = path.join(str(getenv('DATA_PATH')), str(getenv('EMBED_TEXT_FILE_NAME')))
-    text: dict = read_file(embed_text_path)
+    # Load embed text file (cached until the file changes)
+    text: dict = read_embed_text()
     
     # Check if text was loaded successfully
     if not text:
@@ -0,0 +1,241 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, NamedTuple
+
+# Third-party library imports
+import discord
+
+# ----------------------------- Custom Libraries -----------------------------
+from utils.ratelimit import RateBudget
+
+# Channels whose history can be read and purged
+PURGEABLE_CHANNELS: tuple[type, ...] = (discord.TextChannel, discord.VoiceChannel, discord.StageChannel, discord.Thread)
+# Channels purged at the same time by purge_channels()
+PURGE_CONCURRENCY: int = 4
+# Messages older than this cannot be bulk deleted (with a margin for the time spent between read and delete)
+BULK_DELETE_MAX_AGE: timedelta = timedelta(days=14) - timedelta(minutes=5)
+# Messages too old for the bulk delete are deleted one by one, about one per second per channel (Discord rate limit)
+OLD_DELETES_PER_SECOND: float = 1.0
+# Channels that can be replaced by an empty clone
+CLONEABLE_CHANNELS: tuple[type, ...] = (discord.TextChannel, discord.VoiceChannel, discord.StageChannel, discord.ForumChannel)
+
+# Budget shared by every purge of the process
+PURGE_BUDGET: RateBudget = RateBudget(rate=5.0, burst=5)
+
+# ============================= Bulk Delete Boundary =============================
+def bulk_delete_boundary() -> int:
+    """
+    Get the oldest message ID that can still be bulk deleted.
+
+    Message IDs are snowflakes, ordered by creation time, so the age check of a
+    message is a comparison of its ID with this value.
+
+    Returns:
+        int: Snowflake of the moment BULK_DELETE_MAX_AGE ago
+    """
+    return discord.utils.time_snowflake(datetime.now(timezone.utc) - BULK_DELETE_MAX_AGE)
+
+# ============================= Delete Messages =============================
+async def delete_messages(channel: discord.abc.Messageable, messages: list[discord.abc.Snowflake], budget: RateBudget = PURGE_BUDGET) -> int:
+    """
+    Delete messages of one channel: bulk delete (up to 100 per request) for the
+    recent ones, one by one for the ones too old to be bulk deleted.
+
+    Only the IDs are needed, so messages known from the log can be deleted
+    without fetching them.
+
+    Args:
+        channel (discord.abc.Messageable): Channel of the messages
+        messages (list[discord.abc.Snowflake]): Messages (or discord.Object with their ID) to delete
+        budget (RateBudget, optional): Request budget. Defaults to PURGE_BUDGET
+
+    Returns:
+        int: Number of messages deleted
+    """
+    boundary: int = bulk_delete_boundary()
+    recent: list[discord.abc.Snowflake] = [message for message in messages if message.id > boundary]
+    old: list[discord.abc.Snowflake] = [message for message in messages if message.id <= boundary]
+    deleted: int = 0
+    for start in range(0, len(recent), 100):
+        chunk: list[discord.abc.Snowflake] = recent[start:start + 100]
+        await budget.acquire()
+        try:
+            await channel.delete_messages(chunk)
+            deleted += len(chunk)
+        except discord.HTTPException:
+            pass
+    for message in old:
+        await budget.acquire()
+        try:
+            await channel.get_partial_message(message.id).delete()
+            deleted += 1
+        except discord.HTTPException:
+            pass
+    return deleted
+
+# ============================= Purge Channel =============================
+async def purge_channel(
+    channel: discord.abc.Messageable,
+    check: Callable[[discord.Message], bool],
+    before: int | None = None,
+    on_page: Callable[[int | None, int, int], Awaitable[None]] | None = None,
+    budget: RateBudget = PURGE_BUDGET
+) -> int:
+    """
+    Delete the messages of a channel matching a check.
+
+    The history is read once, newest first, in pages of 100 with a 'before'
+    cursor: each page is filtered and its matching messages deleted before
+    reading the next one.
+
+    Args:
+        channel (discord.abc.Messageable): Channel to purge
+        check (Callable[[discord.Message], bool]): True for the messages to delete
+        before (int | None, optional): Resume from this message ID (excluded). Defaults to None (newest message)
+        on_page (Callable[[int | None, int, int], Awaitable[None]] | None, optional): Called after each page
+            with the cursor to resume from (None once the channel is done), the messages read and the messages
+            deleted in the page. Defaults to None
+        budget (RateBudget, optional): Request budget. Defaults to PURGE_BUDGET
+
+    Returns:
+        int: Number of messages deleted
+    """
+    deleted: int = 0
+    while True:
+        await budget.acquire()
+        try:
+            page: list[discord.Message] = [message async for message in channel.history(limit=100, before=discord.Object(id=before) if before else None)]
+        except (discord.Forbidden, discord.NotFound):
+            # History not readable, or channel deleted meanwhile
+            page = []
+        page_deleted: int = await delete_messages(channel, [message for message in page if check(message)], budget)
+        deleted += page_deleted
+        before = page[-1].id if len(page) == 100 else None
+        if on_page is not None:
+            await on_page(before, len(page), page_deleted)
+        if before is None:
+            return deleted
+
+# ============================= Purge Channels =============================
+async def purge_channels(
+    channels: list[discord.abc.Messageable],
+    check: Callable[[discord.Message], bool],
+    cursors: dict[int, int | None] | None = None,
+    on_page: Callable[[int, int | None, int, int], Awaitable[None]] | None = None,
+    on_error: Callable[[int, Exception], Awaitable[None]] | None = None,
+    concurrency: int = PURGE_CONCURRENCY,
+    budget: RateBudget = PURGE_BUDGET
+) -> int:
+    """
+    Purge several channels concurrently, at most 'concurrency' at a time, under a shared request budget.
+
+    With on_error, an error in a channel stops that channel only: it is reported,
+    its cursor is left at the last page done and the other channels go on.
+    Without it, the error stops every channel and is raised.
+
+    Args:
+        channels (list[discord.abc.Messageable]): Channels to purge
+        check (Callable[[discord.Message], bool]): True for the messages to delete
+        cursors (dict[int, int | None] | None, optional): Cursor to resume from, by channel ID. Defaults to None
+        on_page (Callable[[int, int | None, int, int], Awaitable[None]] | None, optional): Called after each page
+            with the channel ID followed by the arguments of purge_channel's on_page. Defaults to None
+        on_error (Callable[[int, Exception], Awaitable[None]] | None, optional): Called with the channel ID
+            and the error when a channel fails. Defaults to None (the error is raised)
+        concurrency (int, optional): Channels purged at the same time. Defaults to PURGE_CONCURRENCY
+        budget (RateBudget, optional): Request budget. Defaults to PURGE_BUDGET
+
+    Returns:
+        int: Number of messages deleted
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+    async def purge(channel: discord.abc.Messageable) -> int:
+        # Counted page by page, so the pages done before an error are counted too
+        deleted: int = 0
+
+        async def report(before: int | None, read: int, page_deleted: int) -> None:
+            nonlocal deleted
+            deleted += page_deleted
+            if on_page is not None:
+                await on_page(channel.id, before, read, page_deleted)
+
+        async with semaphore:
+            try:
+                await purge_channel(channel, check, (cursors or {}).get(channel.id), report, budget)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                await on_error(channel.id, e)
+            return deleted
+
+    tasks: list[asyncio.Task] = [asyncio.create_task(purge(channel)) for channel in channels]
+    try:
+        return sum(await asyncio.gather(*tasks))
+    finally:
+        # Cancelled purge, or error without on_error: stop every channel
+        for task in tasks:
+            task.cancel()
+
+# ============================= Estimate =============================
+class PurgeEstimate(NamedTuple):
+    """Expected size and duration of the deletion of every message of a channel."""
+    messages: int
+    old: int
+    seconds: float
+    exact: bool
+
+async def estimate_channel_purge(channel: discord.abc.Messageable, budget: RateBudget = PURGE_BUDGET) -> PurgeEstimate:
+    """
+    Estimate the number of messages of a channel and the time needed to delete them, from its newest page of history.
+
+    A channel with less than 100 messages is counted exactly. Otherwise the rate of
+    messages of the newest page is extrapolated back to the creation of the channel,
+    so the estimate is rough and is larger for a channel whose activity dropped.
+
+    Args:
+        channel (discord.abc.Messageable): Channel to estimate
+        budget (RateBudget, optional): Request budget, also used for the duration. Defaults to PURGE_BUDGET
+
+    Returns:
+        PurgeEstimate: Messages, messages too old for the bulk delete, seconds and whether the count is exact
+    """
+    boundary: int = bulk_delete_boundary()
+    await budget.acquire()
+    page: list[discord.Message] = [message async for message in channel.history(limit=100)]
+    old: int = sum(1 for message in page if message.id <= boundary)
+    messages: int = len(page)
+    exact: bool = len(page) < 100
+    if not exact:
+        newest, oldest = page[0].created_at, page[-1].created_at
+        rate: float = len(page) / max((newest - oldest).total_seconds(), 1.0)
+        messages = max(messages, int(rate * (newest - channel.created_at).total_seconds()))
+        if oldest > discord.utils.snowflake_time(boundary):
+            # The page does not reach the bulk delete limit: the recent messages are extrapolated too
+            recent: int = min(messages, int(rate * (newest - discord.utils.snowflake_time(boundary)).total_seconds()))
+        else:
+            recent = len(page) - old
+        old = messages - recent
+    pages: int = messages // 100 + 1
+    seconds: float = (pages + (messages - old) / 100) / budget.rate + old / OLD_DELETES_PER_SECOND
+    return PurgeEstimate(messages, old, seconds, exact)
+
+# ============================= Clone Channel =============================
+async def clone_channel(channel: discord.abc.GuildChannel, reason: str) -> discord.abc.GuildChannel:
+    """
+    Replace a channel with an empty copy: same name, category, permissions and settings, at the same position.
+
+    The copy has a new ID, and the pins, webhooks and threads of the channel are lost.
+
+    Args:
+        channel (discord.abc.GuildChannel): Channel to replace, one of CLONEABLE_CHANNELS
+        reason (str): Reason shown in the audit log
+
+    Returns:
+        discord.abc.GuildChannel: The new channel
+    """
+    new_channel: discord.abc.GuildChannel = await channel.clone(reason=reason)
+    await new_channel.edit(position=channel.position, reason=reason)
+    await channel.delete(reason=reason)
+    return new_channel
@@ -0,0 +1,42 @@
+# ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+import time
+
+# ============================= Rate Budget =============================
+class RateBudget():
+    """
+    Token bucket limiting the requests of a bulk operation.
+
+    Every request takes a token, so the tasks working concurrently (and the
+    operations started by different commands) share the same budget instead
+    of each one hitting the Discord rate limits. The route buckets are still
+    honoured by discord.py, the budget keeps the bot below them.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Initialize the RateBudget.
+
+        Args:
+            rate (float): Requests per second
+            burst (int): Requests allowed at once after an idle period
+        """
+        self.rate: float = rate
+        self.burst: int = burst
+        self._tokens: float = float(burst)
+        self._updated: float = time.monotonic()
+        self._lock: asyncio.Lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Wait for a token.
+        """
+        async with self._lock:
+            now: float = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._tokens, self._updated = 1.0, time.monotonic()
+            self._tokens -= 1
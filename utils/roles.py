@@ -1,14 +1,25 @@
 
 # ----------------------------- Imported Libraries -----------------------------
+# Standard library imports
+import asyncio
+from typing import AsyncIterator
+
 # Third-party library imports
 import discord
 
 # ----------------------------- Custom Libraries -----------------------------
 from logger import Logger
 from config_manager import ConfigManager
+from utils.members import iter_members, low_memory_mode, resolve_member
+from utils.ratelimit import RateBudget
+
+# Role changes applied at the same time by apply_role_batch()
+ROLE_CONCURRENCY: int = 4
+# Budget shared by every bulk role change of the process (member role changes share a per-guild bucket)
+ROLE_BUDGET: RateBudget = RateBudget(rate=5.0, burst=5)
 
 # ============================= ADD_ROLE =============================
-async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: int, config: ConfigManager) -> None:
+async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: int, config: ConfigManager, member: discord.Member | None = None) -> None:
     """
     Add a role to a Discord member.
     
@@ -18,6 +29,7 @@ async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: i
         role_id (int): ID of the role to add
         member_id (int): ID of the member to add the role to
         config (ConfigManager): Configuration manager instance
+        member (discord.Member | None, optional): The member, if already available. Defaults to None
         
     Note:
         Logs errors to both database and communication channel if operation fails.
@@ -28,8 +40,14 @@ async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: i
     # Get the role
     role = guild.get_role(role_id)
     
-    # Get the member
-    member = guild.get_member(member_id)
+    # Get the member (from the cache or the API when the member cache is disabled)
+    fetch_error: str = ''
+    if member is None:
+        try:
+            member = await resolve_member(guild, member_id)
+        except discord.HTTPException as e:
+            # Reported below with the missing member
+            fetch_error = f'\n{e}'
     
     # Check if role_id is None or invalid
     if role_id is None or role_id == 0:
@@ -49,7 +67,7 @@ async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: i
     
     # Check if member exists
     if member is None:
-        error_message: str = f'Errore durante l\'aggiunta di un nuovo ruolo.\nMembro con ID {member_id} non trovato nel server per il ruolo {role.name} ({role.id})'
+        error_message: str = f'Errore durante l\'aggiunta di un nuovo ruolo.\nMembro con ID {member_id} non trovato nel server per il ruolo {role.name} ({role.id}){fetch_error}'
         await log.error(error_message, 'EVENT - ROLE ASSIGN AUTO')
         if communication_channel:
             await communication_channel.send(log.error_message(command='EVENT - ROLE ASSIGN AUTO', message=error_message))
@@ -72,7 +90,7 @@ async def add_role(log: Logger, guild: discord.Guild, role_id: int, member_id: i
             await communication_channel.send(log.error_message(command='EVENT - ROLE ASSIGN AUTO', message=error_message))
 
 # ============================= REMOVE_ROLE =============================
-async def remove_role(log: Logger, guild: discord.Guild, role_id: int, member_id: int, config: ConfigManager) -> None:
+async def remove_role(log: Logger, guild: discord.Guild, role_id: int, member_id: int, config: ConfigManager, member: discord.Member | None = None) -> None:
     """
     Remove a role from a Discord member.
     
@@ -82,6 +100,7 @@ async def remove_role(log: Logger, guild: discord.Guild, role_id: int, member_id
         role_id (int): ID of the role to remove
         member_id (int): ID of the member to remove the role from
         config (ConfigManager): Configuration manager instance
+        member (discord.Member | None, optional): The member, if already available. Defaults to None
         
     Note:
         Logs errors to both database and communication channel if operation fails.
@@ -92,8 +111,14 @@ async def remove_role(log: Logger, guild: discord.Guild, role_id: int, member_id
     # Get the role
     role = guild.get_role(role_id)
     
-    # Get the member
-    member = guild.get_member(member_id)
+    # Get the member (from the cache or the API when the member cache is disabled)
+    fetch_error: str = ''
+    if member is None:
+        try:
+            member = await resolve_member(guild, member_id)
+        except discord.HTTPException as e:
+            # Reported below with the missing member
+            fetch_error = f'\n{e}'
     
     # Check if role_id is None or invalid
     if role_id is None or role_id == 0:
@@ -113,7 +138,7 @@ async def remove_role(log: Logger, guild: discord.Guild, role_id: int, member_id
     
     # Check if member exists
     if member is None:
-        error_message: str = f'Errore durante la rimozione di un ruolo.\nMembro con ID {member_id} non trovato nel server per il ruolo {role.name} ({role.id})'
+        error_message: str = f'Errore durante la rimozione di un ruolo.\nMembro con ID {member_id} non trovato nel server per il ruolo {role.name} ({role.id}){fetch_error}'
         await log.error(error_message, 'EVENT - ROLE ASSIGN AUTO')
         if communication_channel:
             await communication_channel.send(log.error_message(command='EVENT - ROLE ASSIGN AUTO', message=error_message))
@@ -188,4 +213,77 @@ async def remove_role_event(log: Logger, guild: discord.Guild, config: ConfigMan
         return
     
     # Call to the function that remove the role
-    await remove_role(log, guild, int(role_id), member_id, config)
\ No newline at end of file
+    await remove_role(log, guild, int(role_id), member_id, config)
+
+# ============================= BULK_ROLE_TARGETS =============================
+async def iter_role_targets(guild: discord.Guild, role: discord.Role, add: bool, except_role_ids: set[int], after: int = 0) -> AsyncIterator[discord.Member]:
+    """
+    Iterate over the members a bulk role change applies to, in ascending ID order.
+    
+    With the member cache, the targets are computed once with set operations on the
+    members of the role and of the exception roles. Without it (LOW_MEMORY_MODE), the
+    members are streamed from the API and checked one by one.
+    
+    Args:
+        guild (discord.Guild): Discord guild instance
+        role (discord.Role): Role to add or remove
+        add (bool): True for the members without the role, False for the members with it
+        except_role_ids (set[int]): Members with one of these roles are skipped
+        after (int, optional): Only the members with a greater ID, to resume. Defaults to 0
+        
+    Yields:
+        discord.Member: The members to change
+    """
+    if not low_memory_mode() and guild.chunked:
+        holders: set[int] = {member.id for member in role.members}
+        excepted: set[int] = set()
+        for except_role_id in except_role_ids:
+            except_role: discord.Role | None = guild.get_role(except_role_id)
+            if except_role is not None:
+                excepted.update(member.id for member in except_role.members)
+        targets: set[int] = ({member.id for member in guild.members} - holders if add else holders) - excepted
+        for member_id in sorted(member_id for member_id in targets if member_id > after):
+            member: discord.Member | None = guild.get_member(member_id)
+            # Left the guild meanwhile
+            if member is not None:
+                yield member
+        return
+    
+    async for member in iter_members(guild, after=after):
+        if (member.get_role(role.id) is None) == add and not any(member.get_role(role_id) for role_id in except_role_ids):
+            yield member
+
+# ============================= APPLY_ROLE_BATCH =============================
+async def apply_role_batch(members: list[discord.Member], role: discord.Role, add: bool, reason: str, concurrency: int = ROLE_CONCURRENCY, budget: RateBudget = ROLE_BUDGET) -> tuple[list[discord.Member], list[tuple[discord.Member, str]]]:
+    """
+    Add (or remove) a role to a batch of members, at most 'concurrency' requests at a time under a shared budget.
+    
+    Args:
+        members (list[discord.Member]): Members to change
+        role (discord.Role): Role to add or remove
+        add (bool): True to add the role, False to remove it
+        reason (str): Reason shown in the audit log
+        concurrency (int, optional): Requests at the same time. Defaults to ROLE_CONCURRENCY
+        budget (RateBudget, optional): Request budget. Defaults to ROLE_BUDGET
+        
+    Returns:
+        tuple[list[discord.Member], list[tuple[discord.Member, str]]]: Members changed, members failed with the error
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+    changed: list[discord.Member] = []
+    failed: list[tuple[discord.Member, str]] = []
+    
+    async def apply(member: discord.Member) -> None:
+        async with semaphore:
+            await budget.acquire()
+            try:
+                if add:
+                    await member.add_roles(role, reason=reason)
+                else:
+                    await member.remove_roles(role, reason=reason)
+                changed.append(member)
+            except discord.HTTPException as e:
+                failed.append((member, str(e)))
+    
+    await asyncio.gather(*(apply(member) for member in members))
+    return changed, failed
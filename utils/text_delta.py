@@ -0,0 +1,46 @@
+# ----------------------------- Standard library -----------------------------
+import json
+from difflib import SequenceMatcher
+
+# ============================= Make Delta =============================
+def make_delta(old: str, new: str) -> str:
+    """
+    Encode the changes turning old into new as a compact JSON delta.
+
+    The delta is a list of [start, end, text] operations on old: the slice
+    old[start:end] is replaced with text. When the delta would be longer than
+    the new text itself, a single operation replacing the whole string is used.
+
+    Args:
+        old (str): Previous text
+        new (str): New text
+
+    Returns:
+        str: The JSON delta ('[]' if the texts are equal)
+    """
+    operations: list[list] = [
+        [i1, i2, new[j1:j2]]
+        for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+        if tag != 'equal'
+    ]
+    delta: str = json.dumps(operations, ensure_ascii=False, separators=(',', ':'))
+    full: str = json.dumps([[0, len(old), new]], ensure_ascii=False, separators=(',', ':'))
+    return delta if len(delta) <= len(full) else full
+
+# ============================= Apply Delta =============================
+def apply_delta(old: str, delta: str) -> str:
+    """
+    Apply a delta created by make_delta.
+
+    Args:
+        old (str): Text the delta was computed against
+        delta (str): The JSON delta
+
+    Returns:
+        str: The new text
+    """
+    text: str = old
+    # Apply from the end so the offsets of the earlier operations stay valid
+    for start, end, replacement in reversed(json.loads(delta)):
+        text = text[:start] + replacement + text[end:]
+    return text